@@ -1,6 +1,16 @@
 from peewee import *
 
-db = SqliteDatabase(":memory:")
+# opened by database.seeder.open_database, once the file it is kept in is known
+db = SqliteDatabase(None)
+
+
+def in_memory(model):
+    """Returns True if a model's database is in memory, where each thread's connection gets its own empty copy.
+
+    Args:
+        model -- model class.
+    """
+    return model._meta.database.database == ":memory:"
 
 
 class BaseModel(Model):
@@ -48,6 +58,8 @@ class HighScore(BaseModel):
 
     class Meta:
         table_name = "high_scores"
+        # the leaderboard reads each track's scores in time order
+        indexes = ((("track_id", "time"), False),)
 
 
 class Track(BaseModel):
@@ -73,3 +85,10 @@ class Profanity(BaseModel):
 
     class Meta:
         table_name = "profanity_words"
+
+
+class SeedVersion(BaseModel):
+    digest = TextField()
+
+    class Meta:
+        table_name = "seed_version"
@@ -0,0 +1,159 @@
+import hashlib
+import marshal
+import os
+
+import yaml
+from peewee import chunked
+
+from database import models
+
+DATABASE_FILE = "database/track_surf.db"
+SEED_DIRECTORY = "database"
+SNAPSHOT_FILE = "seed.snapshot"  # parsed seed rows, kept in the seed directory
+
+# parses with libyaml when PyYAML was built with it, which is many times faster
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# rows inserted per statement, keeping under SQLite's limit of 999 values for the widest table
+BATCH_SIZE = 80
+
+# bump whenever a model's fields change, so saved databases are rebuilt to match
+SCHEMA_VERSION = 1
+
+PRAGMAS = {
+    "journal_mode": "wal",  # readers never wait on the writer, and commits only append to the log
+    "synchronous": "normal",  # safe with WAL, and commits don't wait for the disk
+    "cache_size": -8192,  # 8 MiB of pages kept in memory
+    # reads the file through memory mapping instead of copying pages
+    "mmap_size": 64 * 1024 * 1024,
+}
+
+SEED_MODELS = {
+    "CAR": models.Car,
+    "TRACK": models.Track,
+    "HIGHSCORE": models.HighScore,
+    "PATH": models.Path,
+    "PROFILE": models.Profile,
+    "PROFANITY": models.Profanity,
+}
+
+# rows the player creates, which are only seeded when the database is first built
+PLAYER_MODELS = [models.HighScore, models.Profile]
+
+MODELS = list(SEED_MODELS.values()) + [models.SeedVersion]
+
+
+def seed_files(seed_directory=SEED_DIRECTORY):
+    """Returns the file paths of the *.yaml seed files, in order.
+
+    Args:
+        seed_directory -- directory the seed files are in.
+    """
+    return [
+        os.path.join(seed_directory, x)
+        for x in sorted(os.listdir(seed_directory))
+        if x.endswith(".yaml")
+    ]
+
+
+def seed_digest(seed_directory=SEED_DIRECTORY):
+    """Returns a hash of the seed files, which changes whenever any of them are edited.
+
+    Args:
+        seed_directory -- directory the seed files are in.
+    """
+    digest = hashlib.sha256()
+    for seed_file in seed_files(seed_directory):
+        digest.update(os.path.basename(seed_file).encode())
+        with open(seed_file, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def read_seed(seed_directory=SEED_DIRECTORY, digest=None):
+    """Returns the rows of the seed files as a dictionary of lists of rows, keyed by model name.
+
+    The rows are parsed from the YAML files once, and then kept in a snapshot file next to them that is read
+    instead for as long as the seed files don't change.
+
+    Args:
+        seed_directory -- directory the seed files are in.
+        digest -- hash of the seed files from seed_digest, worked out if not given.
+    """
+    if digest is None:
+        digest = seed_digest(seed_directory)
+    snapshot_file = os.path.join(seed_directory, SNAPSHOT_FILE)
+
+    try:
+        with open(snapshot_file, "rb") as f:
+            snapshot_digest, rows = marshal.load(f)
+        if snapshot_digest == digest:
+            return rows
+    except (OSError, EOFError, ValueError, TypeError):
+        # missing, or written by another version of Python
+        pass
+
+    rows = {}
+    for seed_file in seed_files(seed_directory):
+        with open(seed_file, "rb") as f:
+            for item in yaml.load(f, Loader=YAML_LOADER):
+                rows.setdefault(item.pop("model").upper(), []).append(item)
+
+    try:
+        with open(snapshot_file, "wb") as f:
+            marshal.dump((digest, rows), f)
+    except OSError:
+        # the seed directory is read only, so the files are parsed every time
+        pass
+    return rows
+
+
+def load_seed(database, seed_models, seed_directory=SEED_DIRECTORY, digest=None):
+    """Adds the rows of the seed files to the tables of the given models, in one transaction.
+
+    Args:
+        database -- database the models are bound to.
+        seed_models -- list of models the rows are added for, rows of other models are skipped.
+        seed_directory -- directory the seed files are in.
+        digest -- hash of the seed files from seed_digest, worked out if not given.
+    """
+    rows = read_seed(seed_directory, digest)
+    with database.atomic():
+        for name, model in SEED_MODELS.items():
+            if model in seed_models and name in rows:
+                for batch in chunked(rows[name], BATCH_SIZE):
+                    model.insert_many(batch).execute()
+
+
+def open_database(path=DATABASE_FILE, seed_directory=SEED_DIRECTORY):
+    """Opens the database file, building or reseeding it first if it is out of date.
+
+    A database made with another schema version is rebuilt from the seed files. Otherwise, if the seed files
+    have changed since it was seeded, the cars, tracks, paths and profanity words are reloaded, and the
+    player's high scores and profiles are kept.
+
+    Args:
+        path -- file path of the database, ":memory:" for one that isn't saved.
+        seed_directory -- directory the seed files are in.
+    """
+    models.db.init(path, pragmas=PRAGMAS)
+    models.db.connect(reuse_if_open=True)
+
+    digest = seed_digest(seed_directory)
+    if models.db.user_version != SCHEMA_VERSION:
+        with models.db.atomic():
+            models.db.drop_tables(MODELS)
+            models.db.create_tables(MODELS)
+            load_seed(models.db, SEED_MODELS.values(), seed_directory, digest)
+            models.SeedVersion.create(digest=digest)
+        models.db.user_version = SCHEMA_VERSION
+    elif models.SeedVersion.get().digest != digest:
+        seed_models = [x for x in SEED_MODELS.values() if x not in PLAYER_MODELS]
+        with models.db.atomic():
+            for model in seed_models:
+                model.delete().execute()
+            load_seed(models.db, seed_models, seed_directory, digest)
+            models.SeedVersion.update(digest=digest).execute()
+    # adds any indexes that are newer than the database, which only creates what is missing
+    models.db.create_tables(MODELS)
+    return models.db
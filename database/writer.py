@@ -0,0 +1,121 @@
+import atexit
+import threading
+
+from peewee import chunked
+
+from database.models import in_memory
+from database.seeder import BATCH_SIZE
+
+
+class DatabaseWriter:
+    """Writes new rows and updates on a background thread, so a frame never waits on the disk.
+
+    Updates to the same row that are still waiting are merged into one, and everything waiting is written
+    together in one transaction. Anything that reads rows written this way should call flush first.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.rows = []  # new model instances waiting to be inserted, in order
+        self.updates = {}  # (model, primary key) -> fields waiting to be updated
+        self.writing = False  # whether the thread is part way through writing a batch
+        self.error = None  # exception the thread hit, raised again by flush
+        self.thread = None
+
+    def add(self, row):
+        """Inserts a new row.
+
+        Args:
+            row -- unsaved model instance.
+        """
+        if self.inline(type(row)):
+            row.save(force_insert=True)
+            return
+        with self.condition:
+            self.rows.append(row)
+            self.start()
+            self.condition.notify_all()
+
+    def update(self, model, key, **fields):
+        """Updates the fields of a row, merged with any update to the same row that is still waiting.
+
+        Args:
+            model -- model of the row.
+            key -- primary key of the row.
+            fields -- new values of the fields, by field name.
+        """
+        if self.inline(model):
+            model.update(**fields).where(model._meta.primary_key == key).execute()
+            return
+        with self.condition:
+            self.updates.setdefault((model, key), {}).update(fields)
+            self.start()
+            self.condition.notify_all()
+
+    def flush(self):
+        """Waits until everything added or updated so far has been written."""
+        with self.condition:
+            while self.rows or self.updates or self.writing:
+                self.condition.wait()
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def inline(self, model):
+        """Returns True if a model's rows are written straight away rather than on the thread.
+
+        Args:
+            model -- model the rows are written to.
+        """
+        return in_memory(model)
+
+    def start(self):
+        """Starts the thread the first time anything is queued, and flushes it when the game exits."""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+            atexit.register(self.flush)
+
+    def run(self):
+        """Writes whatever is waiting, for as long as the game runs."""
+        while True:
+            with self.condition:
+                while not (self.rows or self.updates):
+                    self.condition.wait()
+                rows, self.rows = self.rows, []
+                updates, self.updates = self.updates, {}
+                self.writing = True
+
+            error = None
+            try:
+                self.write(rows, updates)
+            except Exception as exception:
+                error = exception
+            with self.condition:
+                self.writing = False
+                if error is not None:
+                    self.error = error
+                self.condition.notify_all()
+
+    def write(self, rows, updates):
+        """Writes a batch of new rows and updates in one transaction.
+
+        Args:
+            rows -- list of unsaved model instances.
+            updates -- dictionary of fields to update, keyed by (model, primary key).
+        """
+        database = (rows[0] if rows else next(iter(updates))[0])._meta.database
+        with database.atomic():
+            # rows are inserted first, as an update may be to a row added in the same batch
+            models = {}
+            for row in rows:
+                models.setdefault(type(row), []).append(row.__data__)
+            for model, data in models.items():
+                for batch in chunked(data, BATCH_SIZE):
+                    model.insert_many(batch).execute()
+
+            for (model, key), fields in updates.items():
+                model.update(**fields).where(model._meta.primary_key == key).execute()
+
+
+WRITER = DatabaseWriter()
@@ -0,0 +1,71 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pygame
+
+
+class AssetCache:
+    def __init__(self, max_size=64):
+        """
+        Args:
+              max_size -- maximum number of decoded images kept before the least recently used is evicted.
+        """
+        self.max_size = max_size
+        self.images = OrderedDict()
+        # tracks are also loaded on a background thread
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load_image(self, path):
+        """Returns the decoded surface for an image, only reading it from disk the first time it is requested.
+
+        Args:
+            path -- file path of the image.
+        """
+        # double slashes etc. would otherwise give the same file two cache entries
+        key = os.path.normpath(path)
+
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                # marks the image as most recently used
+                self.hits += 1
+                self.images.move_to_end(key)
+                return image
+            self.misses += 1
+
+        # decoded outside the lock, so one thread's decoding doesn't hold up another's cache hits
+        image = pygame.image.load(key)
+        if pygame.display.get_surface() is not None:
+            # converts to the display pixel format so blits don't need converting every frame
+            image = image.convert_alpha()
+
+        with self.lock:
+            self.images[key] = image
+            if len(self.images) > self.max_size:
+                # evicts the least recently used image
+                self.images.popitem(last=False)
+
+        return image
+
+    def clear(self):
+        """Empties the cache and resets the hit and miss counters."""
+        with self.lock:
+            self.images.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# process wide cache shared by buttons, tracks and cars
+ASSET_CACHE = AssetCache()
+
+
+def load_image(path):
+    """Loads an image through the shared asset cache.
+
+    Args:
+        path -- file path of the image.
+    """
+    return ASSET_CACHE.load_image(path)
@@ -0,0 +1,415 @@
+import copy
+
+import numpy as np
+
+from game.cars import LOOKAHEAD, ComputerCar
+from game.distance_field import mask_to_array
+from game.racing_line import SEARCH_ITERATIONS
+
+
+def bisect_right_slices(values, low, high, targets):
+    """Returns bisect_right of each target into its own sorted slice values[low:high], all at once.
+
+    Args:
+        values -- one dimensional array holding every sorted slice.
+        low -- array of the start index of each target's slice.
+        high -- array of the end index of each target's slice.
+        targets -- array of the values to find the insertion points of.
+    """
+    low = low.copy()
+    high = high.copy()
+    last = len(values) - 1
+    for _ in range(int((high - low).max(initial=0)).bit_length()):
+        middle = (low + high) // 2
+        searching = low < high
+        # goes right of equal values, in the same way as bisect.bisect_right
+        right = targets >= values[np.minimum(middle, last)]
+        low = np.where(searching & right, middle + 1, low)
+        high = np.where(searching & ~right, middle, high)
+    return low
+
+
+class MaskTable:
+    def __init__(self, mask, x=0, y=0):
+        """
+        Args:
+              mask -- pygame mask the cars collide with, e.g. a track's border mask.
+              x -- x co-ord of the mask.
+              y -- y co-ord of the mask.
+        """
+        self.array = mask_to_array(mask)
+        self.height, self.width = self.array.shape
+        self.x, self.y = x, y
+
+        # summed area table, so the set pixels in any rectangle are counted with four lookups
+        self.counts = np.zeros((self.height + 1, self.width + 1), dtype=np.int32)
+        self.counts[1:, 1:] = self.array.cumsum(axis=0).cumsum(axis=1)
+        # running count along each row, so the set pixels in a run are counted with two lookups
+        self.row_counts = self.counts[1:] - self.counts[:-1]
+
+    def count(self, left, top, right, bottom):
+        """Returns arrays of the number of set pixels in each rectangle, clipped to the mask.
+
+        Args:
+            left -- array of the left edge of each rectangle.
+            top -- array of the top edge of each rectangle.
+            right -- array of the right edge of each rectangle, exclusive.
+            bottom -- array of the bottom edge of each rectangle, exclusive.
+        """
+        left = np.clip(left, 0, self.width)
+        right = np.clip(right, 0, self.width)
+        top = np.clip(top, 0, self.height)
+        bottom = np.clip(bottom, 0, self.height)
+        counts = self.counts
+        return (
+            counts[bottom, right]
+            - counts[top, right]
+            - counts[bottom, left]
+            + counts[top, left]
+        )
+
+
+class AtlasRuns:
+    def __init__(self, atlas):
+        """
+        Args:
+              atlas -- RotationAtlas of the car sprite.
+        """
+        self.step = atlas.step
+        self.count = len(atlas.entries)
+        self.offsets = np.array([offset for _, offset, _ in atlas.entries], dtype=float)
+        self.sizes = np.array([image.get_size() for image, _, _ in atlas.entries])
+
+        # each rotated collision mask as horizontal runs of set pixels, (y, first x, last x + 1)
+        self.runs = []
+        for _, _, rotated_mask in atlas.entries:
+            pixels = mask_to_array(rotated_mask)
+            padded = np.pad(pixels, ((0, 0), (1, 1)))
+            changes = np.diff(padded.astype(np.int8), axis=1)
+            starts_y, starts_x = np.nonzero(changes == 1)
+            _, ends_x = np.nonzero(changes == -1)
+            self.runs.append(np.stack([starts_y, starts_x, ends_x], axis=1))
+
+
+# run tables shared between every batch using the same rotation atlas
+ATLAS_RUNS = {}
+
+
+def atlas_runs(atlas):
+    """Returns the shared run table of a rotation atlas, only building it the first time it is requested.
+
+    Args:
+        atlas -- RotationAtlas of the car sprite.
+    """
+    runs = ATLAS_RUNS.get(atlas)
+    if runs is None:
+        runs = AtlasRuns(atlas)
+        ATLAS_RUNS[atlas] = runs
+    return runs
+
+
+class CarBatch:
+    def __init__(self, cars):
+        """
+        Args:
+              cars -- list of Car objects to copy the poses and stats of, ComputerCars follow their racing lines.
+        """
+        self.count = len(cars)
+
+        def column(attribute):
+            return np.array([getattr(car, attribute) for car in cars], dtype=float)
+
+        self.x = column("x")
+        self.y = column("y")
+        self.angle = column("angle")
+        self.vel = column("vel")
+        self.max_vel = column("max_vel")
+        self.rotation_vel = column("rotation_vel")
+        self.acceleration = column("acceleration")
+        self.previous_x = column("previous_x")
+        self.previous_y = column("previous_y")
+        self.previous_angle = column("previous_angle")
+        self.half_width = np.array([car.car_image.get_width() / 2 for car in cars])
+        self.half_height = np.array([car.car_image.get_height() / 2 for car in cars])
+        self.computer = np.array([isinstance(car, ComputerCar) for car in cars])
+
+        self.load_shapes(cars)
+        self.load_racing_lines(cars)
+
+    @classmethod
+    def from_paths(cls, computer_car, paths):
+        """Returns a batch of copies of a computer car, each following its own path.
+
+        Args:
+            computer_car -- ComputerCar to copy.
+            paths -- list of computer paths as Waypoints, one per car.
+        """
+        cars = []
+        for path in paths:
+            car = copy.copy(computer_car)
+            car.follow(path)
+            cars.append(car)
+        return cls(cars)
+
+    def load_shapes(self, cars):
+        """Builds the padded collision run tables of every car sprite in the batch.
+
+        Args:
+            cars -- list of Car objects in the batch.
+        """
+        shapes = []
+        self.shape = np.zeros(self.count, dtype=np.intp)
+        for index, car in enumerate(cars):
+            runs = atlas_runs(car.rotation_atlas)
+            if runs not in shapes:
+                shapes.append(runs)
+            self.shape[index] = shapes.index(runs)
+
+        rotations = max(shape.count for shape in shapes)
+        most_runs = max(len(runs) for shape in shapes for runs in shape.runs)
+        self.steps = np.array([shape.step for shape in shapes], dtype=float)
+        self.rotations = np.array([shape.count for shape in shapes], dtype=np.intp)
+        self.offsets = np.zeros((len(shapes), rotations, 2))
+        self.sizes = np.zeros((len(shapes), rotations, 2), dtype=np.intp)
+        # padded with empty runs, which never overlap anything
+        self.runs = np.zeros((len(shapes), rotations, most_runs, 3), dtype=np.intp)
+        for shape_index, shape in enumerate(shapes):
+            self.offsets[shape_index, : shape.count] = shape.offsets
+            self.sizes[shape_index, : shape.count] = shape.sizes
+            for rotation, runs in enumerate(shape.runs):
+                self.runs[shape_index, rotation, : len(runs)] = runs
+
+    def load_racing_lines(self, cars):
+        """Joins the racing lines of every computer car in the batch into flat arrays.
+
+        Args:
+            cars -- list of Car objects in the batch.
+        """
+        lines = []
+        self.line = np.zeros(self.count, dtype=np.intp)
+        for index, car in enumerate(cars):
+            if isinstance(car, ComputerCar):
+                if car.racing_line not in lines:
+                    lines.append(car.racing_line)
+                self.line[index] = lines.index(car.racing_line)
+
+        if any(len(line.x) < 2 for line in lines):
+            raise ValueError("Every racing line in a batch needs at least two points.")
+
+        # each line is a slice of the flat arrays, starting at line_start
+        sizes = np.array([len(line.x) for line in lines], dtype=np.intp)
+        self.line_start = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+        self.line_size = sizes
+        self.line_length = np.array([line.length for line in lines])
+        self.line_x = np.concatenate([line.x for line in lines] or [[]])
+        self.line_y = np.concatenate([line.y for line in lines] or [[]])
+        self.line_distances = np.concatenate([line.distances for line in lines] or [[]])
+
+        self.progress = np.array(
+            [car.progress if isinstance(car, ComputerCar) else 0.0 for car in cars]
+        )
+
+    def segment_at(self, line, distance):
+        """Returns the flat index of the sample starting the stretch of each line a distance along it.
+
+        Args:
+            line -- array of the line index of each car.
+            distance -- array of distances along each car's line.
+        """
+        start = self.line_start[line]
+        index = bisect_right_slices(
+            self.line_distances, start, start + self.line_size[line], distance
+        )
+        return np.clip(index - 1, start, start + self.line_size[line] - 2)
+
+    def locate(self, line, distance):
+        """Returns arrays of the flat segment index and (x, y) point a distance along each line,
+        clamped to their ends.
+
+        Args:
+            line -- array of the line index of each car.
+            distance -- array of distances along each car's line.
+        """
+        distance = np.clip(distance, 0.0, self.line_length[line])
+        index = self.segment_at(line, distance)
+        segment_length = self.line_distances[index + 1] - self.line_distances[index]
+        fraction = np.divide(
+            distance - self.line_distances[index],
+            segment_length,
+            out=np.zeros(len(distance)),
+            where=segment_length > 0,
+        )
+        return (
+            index,
+            self.line_x[index]
+            + (self.line_x[index + 1] - self.line_x[index]) * fraction,
+            self.line_y[index]
+            + (self.line_y[index + 1] - self.line_y[index]) * fraction,
+        )
+
+    def position_at(self, line, distance):
+        """Returns arrays of the (x, y) points a distance along each line, clamped to their ends.
+
+        Args:
+            line -- array of the line index of each car.
+            distance -- array of distances along each car's line.
+        """
+        _, x, y = self.locate(line, distance)
+        return x, y
+
+    def nearest(self, line, x, y, start, search_distance):
+        """Returns the distance along each line of the point nearest to each (x, y), searching forwards from start.
+
+        Args:
+            line -- array of the line index of each car.
+            x -- array of x co-ordinates.
+            y -- array of y co-ordinates.
+            start -- array of distances along each line to search from.
+            search_distance -- array of how far past start each nearest point could be.
+        """
+
+        def past(distance):
+            # whether each line has already passed its point at this distance
+            index, line_x, line_y = self.locate(line, distance)
+            direction_x = self.line_x[index + 1] - self.line_x[index]
+            direction_y = self.line_y[index + 1] - self.line_y[index]
+            return (line_x - x) * direction_x + (line_y - y) * direction_y > 0
+
+        low = np.clip(start, 0.0, self.line_length[line])
+        high = np.minimum(low + search_distance, self.line_length[line])
+        past_low = past(low)
+        past_high = past(high)
+
+        # binary search over arc length, for every car at once
+        bisect_low, bisect_high = low, high
+        for _ in range(SEARCH_ITERATIONS):
+            middle = (bisect_low + bisect_high) / 2
+            past_middle = past(middle)
+            bisect_high = np.where(past_middle, middle, bisect_high)
+            bisect_low = np.where(past_middle, bisect_low, middle)
+
+        return np.where(past_low, low, np.where(past_high, bisect_low, high))
+
+    def save_previous_pose(self):
+        """Stores every car's current pose as its pose at the start of the tick."""
+        self.previous_x = self.x.copy()
+        self.previous_y = self.y.copy()
+        self.previous_angle = self.angle.copy()
+
+    def move(self, selected):
+        """Moves the selected cars using the horizontal and vertical components of their velocities.
+
+        Args:
+            selected -- boolean array of which cars to move.
+        """
+        radians = np.radians(self.angle)
+        self.y = np.where(selected, self.y - np.cos(radians) * self.vel, self.y)
+        self.x = np.where(selected, self.x - np.sin(radians) * self.vel, self.x)
+
+    def move_players(self, controls):
+        """Moves every player car according to its controls, in the same way as PlayerCar.move_player.
+
+        Args:
+            controls -- boolean array of shape (cars, 4), of which (left, right, up, down) keys each car is pressing.
+        """
+        controls = np.asarray(controls, dtype=bool) & ~self.computer[:, None]
+        left, right, up, down = controls.T
+        players = ~self.computer
+
+        self.angle = self.angle + np.where(left, self.rotation_vel, 0)
+        self.angle = self.angle - np.where(right, self.rotation_vel, 0)
+
+        # accelerates if max velocity not reached
+        accelerated = np.minimum(self.vel + self.acceleration, self.max_vel)
+        self.vel = np.where(up, accelerated, self.vel)
+        self.move(up)
+
+        # decelerates if half max velocity not reached
+        reversed_vel = np.maximum(self.vel - self.acceleration, -self.max_vel / 2)
+        self.vel = np.where(down, reversed_vel, self.vel)
+        self.move(down)
+
+        # slows down the cars pressing neither up nor down
+        idle = players & ~up & ~down
+        slowed = np.maximum(self.vel - self.acceleration / 2, 0)
+        self.vel = np.where(idle, slowed, self.vel)
+        self.move(idle)
+
+    def move_computers(self):
+        """Steers and moves every computer car that hasn't reached the end of its racing line,
+        in the same way as ComputerCar.move."""
+        if not self.computer.any():
+            return
+
+        line = self.line
+        active = self.computer & (self.progress < self.line_length[line])
+
+        # the cars rotate about their centres, so the centres are kept on the lines
+        centre_x = self.x + self.half_width
+        centre_y = self.y + self.half_height
+        progress = self.nearest(
+            line, centre_x, centre_y, self.progress, self.max_vel * 2
+        )
+        self.progress = np.where(active, progress, self.progress)
+
+        target_x, target_y = self.position_at(line, self.progress + LOOKAHEAD)
+        desired_angle = np.degrees(
+            np.arctan2(-(target_x - centre_x), -(target_y - centre_y))
+        )
+        # brings angle differences back between -180 and 180
+        difference_in_angle = (self.angle - desired_angle + 180) % 360 - 180
+
+        # rotates by the calculated angle or rotation vel, depending on which is smaller
+        turn = np.minimum(self.rotation_vel, np.abs(difference_in_angle))
+        steered = np.where(
+            difference_in_angle > 0, self.angle - turn, self.angle + turn
+        )
+        self.angle = np.where(active, steered, self.angle)
+        self.move(active)
+
+    def bounce(self, selected):
+        """Reverses the selected cars' directions, in the same way as PlayerCar.bounce without a contact point.
+
+        Args:
+            selected -- boolean array of which cars hit a wall.
+        """
+        self.vel = np.where(selected, -self.vel / 2, self.vel)
+        self.move(selected)
+
+    def collide(self, mask_table):
+        """Returns a boolean array of which cars overlap a mask, in the same way as Car.collide.
+
+        Args:
+            mask_table -- MaskTable of the mask to check for collision with.
+        """
+        # the pre-rotated mask for each car's angle, positioned the same way as Car.collide
+        rotation = np.round(self.angle / self.steps[self.shape]).astype(np.intp)
+        rotation %= self.rotations[self.shape]
+        offsets = self.offsets[self.shape, rotation]
+        offset_x = np.trunc(self.x + offsets[:, 0] - mask_table.x).astype(np.intp)
+        offset_y = np.trunc(self.y + offsets[:, 1] - mask_table.y).astype(np.intp)
+
+        # only cars with part of the mask inside their bounding box can overlap it
+        sizes = self.sizes[self.shape, rotation]
+        near = np.flatnonzero(
+            mask_table.count(
+                offset_x, offset_y, offset_x + sizes[:, 0], offset_y + sizes[:, 1]
+            )
+        )
+
+        # counts the mask pixels under every run of the cars that are near it
+        runs = self.runs[self.shape[near], rotation[near]]
+        run_y = runs[:, :, 0] + offset_y[near, None]
+        run_start = np.clip(runs[:, :, 1] + offset_x[near, None], 0, mask_table.width)
+        run_end = np.clip(runs[:, :, 2] + offset_x[near, None], 0, mask_table.width)
+        inside = (run_y >= 0) & (run_y < mask_table.height)
+        rows = mask_table.row_counts
+        overlap = np.zeros(run_y.shape, dtype=bool)
+        overlap[inside] = (
+            rows[run_y[inside], run_end[inside]]
+            > rows[run_y[inside], run_start[inside]]
+        )
+
+        collided = np.zeros(self.count, dtype=bool)
+        collided[near] = overlap.any(axis=1)
+        return collided
@@ -1,9 +1,12 @@
-from math import atan, cos, degrees, pi, radians, sin
+from math import atan2, cos, degrees, radians, sin
 
 import pygame
 
 from database import models
-from game.utilities import blit_rotate_center, scale_image
+from game.assets import load_image
+from game.sprites import rotation_atlas
+
+LOOKAHEAD = 20  # distance along the racing line ahead of the car that the computer car steers towards
 
 
 class Car:
@@ -21,22 +24,33 @@ class Car:
         self.rotation_vel = lookup_car.rotation_vel
         self.acceleration = lookup_car.acceleration / 10
 
-        self.car_image = pygame.image.load(self.car_path)
+        self.car_image = load_image(self.car_path)
+        # pre-rotated sprites shared by every car with the same id
+        self.rotation_atlas = rotation_atlas(self.car_id, self.car_image)
 
         self.vel = 0
         self.angle = 0
 
         self.start_position = start_position
         self.x, self.y = self.start_position
+        # pose at the start of the last tick, used to sweep for collisions and interpolate drawing
+        self.previous_x, self.previous_y = self.start_position
+        self.previous_angle = 0
 
-    def draw(self, win):
-        """Draws the car and rotates it around its centre point as appropriate.
+    def draw(self, win, alpha=1):
+        """Draws the car, rotated around its centre point, and returns the area drawn to.
 
         Args:
             win -- game window to draw on.
+            alpha -- how far between the previous and current tick to draw the car, from 0 to 1.
         """
-        # rotates the car to the appropriate angle around its centre point and draws it
-        blit_rotate_center(win, self.car_image, (self.x, self.y), self.angle)
+        # interpolates between ticks so movement is smooth whatever the frame rate
+        x = self.previous_x + (self.x - self.previous_x) * alpha
+        y = self.previous_y + (self.y - self.previous_y) * alpha
+        angle = self.previous_angle + (self.angle - self.previous_angle) * alpha
+
+        # draws the pre-rotated sprite for the car's angle around its centre point
+        return self.rotation_atlas.draw(win, (x, y), angle)
 
     def move(self):
         """Moves the car using the horizontal and vertical components of its velocity."""
@@ -55,45 +69,82 @@ class Car:
             x -- x co-ord of the mask.
             y -- y co-ord of the mask.
         """
-        # makes mask form car image
-        car_mask = pygame.mask.from_surface(self.car_image)
-        offset = (int(self.x - x), int(self.y - y))
+        # looks up the pre-built mask for the car's rotation, positioned the same way as the drawn sprite
+        _, (offset_x, offset_y), car_mask = self.rotation_atlas.lookup(self.angle)
+        offset = (int(self.x + offset_x - x), int(self.y + offset_y - y))
 
         # checks for overlap between car and track masks
         poi = mask.overlap(car_mask, offset)
         return poi
 
+    def save_previous_pose(self):
+        """Stores the car's current pose as the pose at the start of the tick."""
+        self.previous_x, self.previous_y = self.x, self.y
+        self.previous_angle = self.angle
+
+    def sweep(self, distance_field):
+        """Returns how far through its last movement the car first touched a wall, or None if it didn't.
+
+        Args:
+            distance_field -- DistanceField of the track border.
+        """
+        half_width = self.car_image.get_width() / 2
+        half_height = self.car_image.get_height() / 2
+        # circle that stays inside the car whichever way it is facing
+        radius = min(half_width, half_height) - 1
+
+        return distance_field.sweep(
+            (self.previous_x + half_width, self.previous_y + half_height),
+            (self.x + half_width, self.y + half_height),
+            radius,
+        )
+
     def reset(self):
         """Resets car to start position."""
         self.x, self.y = self.start_position
+        self.previous_x, self.previous_y = self.start_position
         self.angle = 0
+        self.previous_angle = 0
         self.vel = 0
 
 
 class PlayerCar(Car):
-    def bounce(self):
-        """Reverses direction if the car collides with the track."""
+    def bounce(self, contact=None):
+        """Reverses direction if the car collides with the track.
+
+        Args:
+            contact -- fraction of the last movement at which the car touched the wall, if known.
+        """
+        if contact is not None:
+            # moves the car back to where it first touched the wall so it can't end up beyond it
+            self.x = self.previous_x + (self.x - self.previous_x) * contact
+            self.y = self.previous_y + (self.y - self.previous_y) * contact
+
         self.vel = -self.vel / 2  # reverses velocity direction and halves
         self.move()  # moves car with new velocity
 
-    def move_player(self):
-        """Controls for player movement based on the key input."""
-        keys = pygame.key.get_pressed()
+    def move_player(self, controls):
+        """Controls for player movement based on the arrow key input.
+
+        Args:
+            controls -- (left, right, up, down) tuple of which arrow keys are pressed.
+        """
+        left, right, up, down = controls
         moved = False
 
-        if keys[pygame.K_LEFT]:
+        if left:
             # rotates car to the left if the left arrow key if pressed.
             self.angle += self.rotation_vel
-        if keys[pygame.K_RIGHT]:
+        if right:
             # rotates car to the right if the right arrow key if pressed.
             self.angle -= self.rotation_vel
-        if keys[pygame.K_UP]:
+        if up:
             # moves forward if the up arrow key is pressed
             moved = True
             # accelerates if max velocity not reached
             self.vel = min(self.vel + self.acceleration, self.max_vel)
             self.move()
-        if keys[pygame.K_DOWN]:
+        if down:
             # moves backwards if the down arrow key is pressed
             moved = True
             # decelerates if half max velocity not reached
@@ -113,15 +164,24 @@ class ComputerCar(Car):
         Args:
               car_id -- car id string for database look up.
               start_position -- current track's relevant start position.
-              path -- the current track's computer path.
+              path -- the current track's computer path as Waypoints.
               track_record -- the current track's record.
         """
         super().__init__(car_id, start_position)
-        self.path = path
-        self.current_point = 0
+        self.follow(path)
         self.track_record = track_record
         self.vel = self.max_vel // 1.25
 
+    def follow(self, path):
+        """Sets the path the computer car drives along, from its start.
+
+        Args:
+            path -- the computer path as Waypoints.
+        """
+        self.path = path
+        self.racing_line = path.racing_line()
+        self.progress = 0  # distance along the racing line of the point nearest the car
+
     def draw_points(self, win):
         """Draws the computer car's path as a series of red dots.
 
@@ -129,37 +189,26 @@ class ComputerCar(Car):
             win -- game window to draw on.
         """
         for point in self.path:
-            pygame.draw.circle(win, (255, 0, 0), (point.path_x, point.path_y), 5)
+            pygame.draw.circle(win, (255, 0, 0), point, 5)
 
     def calculate_angle(self):
-        """Calculates the angle between the car's current vector and the next point on the car's path,
-        and adjusts the car's rotation appropriately."""
-        target_x = list(self.path)[self.current_point].path_x
-        target_y = list(self.path)[self.current_point].path_y
-        x_delta = target_x - self.x  # horizontal distance to travel
-        y_delta = target_y - self.y  # vertical distance to travel
-
-        if y_delta == 0:
-            # if no vertical distance to travel then desired rotation is pi/2 rad
-            desired_angle = pi / 2
-        else:
-            # arc tangent finds
-            desired_angle = atan(x_delta / y_delta)
-
-        if target_y > self.y:
-            # if moving downwards, adding pi to desired angle is required as atan() range is -pi/2 < x < pi/2
-            desired_angle += pi
-
-        if desired_angle > 2 * pi:
-            # angle and (angle - 2pi) are equivalent.
-            desired_angle -= 2 * pi
+        """Finds the point on the racing line a lookahead distance ahead of the car,
+        and adjusts the car's rotation towards it."""
+        # the car rotates about its centre, so the centre is kept on the line
+        centre_x = self.x + self.car_image.get_width() / 2
+        centre_y = self.y + self.car_image.get_height() / 2
+        # the nearest point can only have moved as far as the car has travelled since last tick
+        self.progress = self.racing_line.nearest(
+            centre_x, centre_y, self.progress, self.max_vel * 2
+        )
+        target_x, target_y = self.racing_line.position_at(self.progress + LOOKAHEAD)
+        x_delta = target_x - centre_x  # horizontal distance to travel
+        y_delta = target_y - centre_y  # vertical distance to travel
+        desired_angle = degrees(atan2(-x_delta, -y_delta))
 
-        difference_in_angle = self.angle - degrees(desired_angle)
+        difference_in_angle = self.angle - desired_angle
         # brings angle back between -180 and 180
-        if difference_in_angle >= 180:
-            difference_in_angle -= 360
-        if difference_in_angle < -180:
-            difference_in_angle += 360
+        difference_in_angle = (difference_in_angle + 180) % 360 - 180
 
         # rotates by the calculated angle or rotation vel, depending on which is smaller
         # -= or += depending on direction
@@ -168,22 +217,8 @@ class ComputerCar(Car):
         else:
             self.angle += min(self.rotation_vel, abs(difference_in_angle))
 
-    def update_path_point(self):
-        """Increments the current point if the car collides with the current target point in the path."""
-        # next point in car path
-        target = list(self.path)[self.current_point]
-        # car rectangle
-        rect = pygame.Rect(
-            self.x, self.y, self.car_image.get_width(), self.car_image.get_height()
-        )
-
-        # changes target to next point in path by incrementing current_point if car collides with current target
-        if rect.collidepoint(target.path_x, target.path_y):
-            self.current_point += 1
-
     def move(self):
-        """Moves the computer car if the car hasn't reached the end of its path"""
-        if self.current_point < len(self.path):
+        """Moves the computer car if the car hasn't reached the end of its racing line"""
+        if self.progress < self.racing_line.length:
             self.calculate_angle()  # calculates angle and rotates car
-            self.update_path_point()  # updates path if necessary
             super().move()  # moves car using move method from Car
@@ -0,0 +1,141 @@
+import hashlib
+import os
+
+import numpy as np
+import pygame
+
+DISTANCE_LIMIT = 64  # distances further than this from a wall are stored as the limit
+SWEEP_REFINEMENTS = 6  # bisection steps used to find the exact contact time
+
+
+def mask_to_array(mask):
+    """Converts a pygame mask into a boolean array indexed [y, x].
+
+    Args:
+        mask -- the mask to convert.
+    """
+    surface = mask.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 255))
+    return pygame.surfarray.array_red(surface).T > 0
+
+
+def compute_distance_field(walls, limit=DISTANCE_LIMIT):
+    """Returns the euclidean distance from every pixel to the nearest wall pixel, capped at the limit.
+
+    Args:
+        walls -- boolean array indexed [y, x] that is True where there is a wall.
+        limit -- largest distance stored, must fit in a uint8.
+    """
+    height, width = walls.shape
+    far = height + width + limit
+
+    # distance to the nearest wall in the same column, found by scanning down and then up each column
+    rows = np.arange(height)[:, None]
+    last_wall_above = np.maximum.accumulate(np.where(walls, rows, -far), axis=0)
+    flipped_rows = np.where(walls, rows, far)[::-1]
+    next_wall_below = np.minimum.accumulate(flipped_rows, axis=0)[::-1]
+    column = np.minimum(rows - last_wall_above, next_wall_below - rows)
+    column = np.minimum(column, limit + 1).astype(np.int32) ** 2
+
+    # combines with neighbouring columns, a wall further than the limit sideways can't be nearer
+    squared = column.copy()
+    for dx in range(1, min(limit + 1, width)):
+        if dx * dx >= squared.max():
+            # every pixel already has a wall nearer than any column this far away
+            break
+        np.minimum(squared[:, dx:], column[:, :-dx] + dx * dx, out=squared[:, dx:])
+        np.minimum(squared[:, :-dx], column[:, dx:] + dx * dx, out=squared[:, :-dx])
+
+    # rounds down so the field never overestimates the space around a point
+    return np.minimum(np.floor(np.sqrt(squared)), limit).astype(np.uint8)
+
+
+def load_distance_field(image_path, mask, limit=DISTANCE_LIMIT):
+    """Loads the distance field for a border image from the disk cache next to it, computing it if needed.
+
+    Args:
+        image_path -- file path of the border image the mask was made from.
+        mask -- collision mask of the border image.
+        limit -- largest distance stored.
+    """
+    with open(image_path, "rb") as image_file:
+        digest = hashlib.sha1(image_file.read()).hexdigest()[:16]
+
+    # keyed by file hash so an edited border image never reuses a stale field
+    cache_path = f"{os.path.splitext(image_path)[0]}.{digest}.{limit}.distance.npy"
+    if os.path.exists(cache_path):
+        return DistanceField(np.load(cache_path))
+
+    field = compute_distance_field(mask_to_array(mask), limit)
+    try:
+        np.save(cache_path, field)
+    except OSError:
+        # a read only install still works, it just recomputes the field on each load
+        pass
+
+    return DistanceField(field)
+
+
+class DistanceField:
+    def __init__(self, field):
+        """
+        Args:
+              field -- uint8 array indexed [y, x] of distances to the nearest wall.
+        """
+        self.field = field
+        self.height, self.width = field.shape
+
+    def distance(self, x, y):
+        """Returns the distance from a point to the nearest wall, points off the track count as walls.
+
+        Args:
+            x -- x co-ordinate of the point.
+            y -- y co-ordinate of the point.
+        """
+        x, y = int(x), int(y)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return int(self.field[y, x])
+        return 0
+
+    def sweep(self, start, end, radius):
+        """Moves a circle from start to end and returns the fraction of the way along it first touches a wall.
+
+        Returns None if the whole movement is clear.
+
+        Args:
+            start -- (x, y) centre of the circle at the start of the movement.
+            end -- (x, y) centre of the circle at the end of the movement.
+            radius -- radius of the circle.
+        """
+        start_x, start_y = start
+        delta_x, delta_y = end[0] - start_x, end[1] - start_y
+        length = (delta_x * delta_x + delta_y * delta_y) ** 0.5
+
+        def distance_at(fraction):
+            return self.distance(
+                start_x + delta_x * fraction, start_y + delta_y * fraction
+            )
+
+        if distance_at(0.0) <= radius:
+            return 0.0
+        if length == 0:
+            return None
+
+        clear = 0.0
+        while clear < 1.0:
+            # steps by the free space around the circle, which can't jump over a wall
+            free = distance_at(clear) - radius
+            step = min(clear + max(free, 1.0) / length, 1.0)
+
+            if distance_at(step) <= radius:
+                # the wall is first touched between the two points, so bisects to find where
+                for _ in range(SWEEP_REFINEMENTS):
+                    middle = (clear + step) / 2
+                    if distance_at(middle) > radius:
+                        clear = middle
+                    else:
+                        step = middle
+                return step
+
+            clear = step
+
+        return None
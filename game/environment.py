@@ -0,0 +1,272 @@
+import copy
+import multiprocessing
+from math import cos, radians, sin
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from game.cars import PlayerCar
+from game.simulation import LOST, RACING, WON, Simulation
+from game.track import Track
+
+# directions, relative to the car, that distances to the walls are observed along
+RAY_ANGLES = (-90, -45, 0, 45, 90)
+RAY_LENGTH = 200  # furthest a wall is observed
+OBSERVATION_SIZE = 6 + len(RAY_ANGLES)
+MAX_TICKS = 3000  # episodes still racing after this many ticks are ended
+PROGRESS_REWARD = 0.01  # reward per pixel driven along the track
+WALL_PENALTY = 0.1  # reward lost each tick the car hits the wall
+FINISH_REWARD = 10  # reward for winning the race, or lost for losing it
+
+
+class RaceEnv:
+    def __init__(self, track_id, car_id="red_car", max_ticks=MAX_TICKS):
+        """
+        Args:
+              track_id -- id of the track to race on.
+              car_id -- id of the car the agent drives.
+              max_ticks -- the most ticks an episode lasts.
+        """
+        self.track = Track(track_id)
+        self.max_ticks = max_ticks
+        # cars at their start positions, copied at the start of every episode
+        self.player_start = PlayerCar(car_id, self.track.player_start_position)
+        self.computer_start = self.track.new_computer_car()
+        # progress is measured along the computer car's racing line
+        self.racing_line = self.track.computer_path.racing_line()
+
+        self.simulation = None
+        self.progress = 0.0
+
+    def reset(self):
+        """Starts a new race and returns the first observation."""
+        self.simulation = Simulation(
+            self.track, copy.copy(self.player_start), copy.copy(self.computer_start)
+        )
+        self.progress = self.nearest_progress(0.0)
+        return self.observation()
+
+    def step(self, action):
+        """Moves the race on by one tick and returns (observation, reward, done, info).
+
+        Args:
+            action -- (left, right, up, down) tuple of which arrow keys the agent is pressing.
+        """
+        simulation = self.simulation
+        outcome = simulation.step(tuple(bool(key) for key in action))
+
+        progress = self.nearest_progress(self.progress)
+        reward = (progress - self.progress) * PROGRESS_REWARD
+        self.progress = progress
+        if simulation.wall_contact:
+            reward -= WALL_PENALTY
+        if outcome == WON:
+            reward += FINISH_REWARD
+        elif outcome == LOST:
+            reward -= FINISH_REWARD
+
+        done = outcome != RACING or simulation.ticks >= self.max_ticks
+        info = {"outcome": outcome, "ticks": simulation.ticks}
+        return self.observation(), reward, done, info
+
+    def nearest_progress(self, start):
+        """Returns how far along the racing line the player car is, never going back from start.
+
+        Args:
+            start -- the car's progress on the last tick.
+        """
+        car = self.simulation.player_car
+        return self.racing_line.nearest(
+            car.x + car.car_image.get_width() / 2,
+            car.y + car.car_image.get_height() / 2,
+            start,
+            car.max_vel * 2,
+        )
+
+    def observation(self):
+        """Returns the player car's observation as a float32 array of OBSERVATION_SIZE values, all roughly
+        between -1 and 1."""
+        car = self.simulation.player_car
+        width, height = self.track.static_image.get_size()
+        centre_x = car.x + car.car_image.get_width() / 2
+        centre_y = car.y + car.car_image.get_height() / 2
+
+        observation = np.empty(OBSERVATION_SIZE, dtype=np.float32)
+        observation[0] = centre_x / width
+        observation[1] = centre_y / height
+        observation[2] = sin(radians(car.angle))
+        observation[3] = cos(radians(car.angle))
+        observation[4] = car.vel / car.max_vel
+        observation[5] = self.progress / self.racing_line.length
+        for index, ray_angle in enumerate(RAY_ANGLES):
+            observation[6 + index] = (
+                self.ray(centre_x, centre_y, car.angle + ray_angle) / RAY_LENGTH
+            )
+        return observation
+
+    def ray(self, x, y, angle):
+        """Returns the distance from a point to the nearest wall in a direction, up to RAY_LENGTH.
+
+        Args:
+            x -- x co-ordinate of the point.
+            y -- y co-ordinate of the point.
+            angle -- direction, in the same degrees as the car angle.
+        """
+        distance_field = self.track.distance_field
+        # the same direction a car facing this angle moves in
+        direction_x, direction_y = -sin(radians(angle)), -cos(radians(angle))
+
+        travelled = 0
+        while travelled < RAY_LENGTH:
+            # steps by the free space around the point, which can't jump over a wall
+            free = distance_field.distance(
+                x + direction_x * travelled, y + direction_y * travelled
+            )
+            if free == 0:
+                break
+            travelled += free
+        return min(travelled, RAY_LENGTH)
+
+
+def run_worker(vector_env, indices, connection):
+    """Steps a share of a VectorEnv's environments whenever the main process asks.
+
+    Args:
+        vector_env -- the VectorEnv, inherited from the main process.
+        indices -- indices of the environments this worker steps.
+        connection -- pipe the commands arrive on.
+    """
+    while True:
+        command = connection.recv()
+        if command == "close":
+            break
+        if command == "reset":
+            vector_env.reset_envs(indices)
+        else:
+            vector_env.step_envs(indices)
+        # the results are already in shared memory, this only says they are ready
+        connection.send(True)
+    connection.close()
+
+
+class VectorEnv:
+    def __init__(self, envs, processes=None):
+        """
+        Args:
+              envs -- list of RaceEnvs, which the worker processes inherit.
+              processes -- number of worker processes, every core if not given.
+        """
+        self.envs = envs
+        self.count = len(envs)
+
+        # every batch is exchanged through one block of shared memory instead of being pickled
+        layout = [
+            ("observations", np.float32, (self.count, OBSERVATION_SIZE)),
+            ("rewards", np.float32, (self.count,)),
+            ("dones", np.bool_, (self.count,)),
+            ("actions", np.bool_, (self.count, 4)),
+        ]
+        size = sum(
+            np.dtype(dtype).itemsize * np.prod(shape) for _, dtype, shape in layout
+        )
+        self.memory = shared_memory.SharedMemory(create=True, size=int(size))
+        offset = 0
+        for name, dtype, shape in layout:
+            array = np.ndarray(shape, dtype, buffer=self.memory.buf, offset=offset)
+            setattr(self, name, array)
+            offset += array.nbytes
+
+        processes = min(processes or multiprocessing.cpu_count(), self.count)
+        self.workers = []
+        if processes > 1 and "fork" in multiprocessing.get_all_start_methods():
+            # forked workers inherit the environments and the shared memory, nothing is pickled
+            context = multiprocessing.get_context("fork")
+            for indices in np.array_split(np.arange(self.count), processes):
+                connection, worker_connection = context.Pipe()
+                process = context.Process(
+                    target=run_worker,
+                    args=(self, indices, worker_connection),
+                    daemon=True,
+                )
+                process.start()
+                worker_connection.close()
+                self.workers.append((process, connection))
+
+    def reset_envs(self, indices):
+        """Resets some of the environments, writing their observations to shared memory.
+
+        Args:
+            indices -- indices of the environments to reset.
+        """
+        for index in indices:
+            self.observations[index] = self.envs[index].reset()
+
+    def step_envs(self, indices):
+        """Steps some of the environments with their shared actions, writing the results to shared memory.
+        Finished environments are reset, so their observation is the first of the next race.
+
+        Args:
+            indices -- indices of the environments to step.
+        """
+        for index in indices:
+            env = self.envs[index]
+            observation, reward, done, _ = env.step(self.actions[index])
+            if done:
+                observation = env.reset()
+            self.observations[index] = observation
+            self.rewards[index] = reward
+            self.dones[index] = done
+
+    def run(self, command):
+        """Runs a command on every environment, in the workers if there are any, and waits for it to finish.
+
+        Args:
+            command -- "reset" or "step".
+        """
+        if not self.workers:
+            indices = range(self.count)
+            if command == "reset":
+                self.reset_envs(indices)
+            else:
+                self.step_envs(indices)
+            return
+
+        for _, connection in self.workers:
+            connection.send(command)
+        for _, connection in self.workers:
+            connection.recv()
+
+    def reset(self):
+        """Starts a new race in every environment and returns the observations, one row per environment."""
+        self.run("reset")
+        return self.observations.copy()
+
+    def step(self, actions):
+        """Moves every race on by one tick and returns (observations, rewards, dones), one row per environment.
+
+        Args:
+            actions -- boolean array of shape (environments, 4), of the (left, right, up, down) keys pressed.
+        """
+        self.actions[:] = actions
+        self.run("step")
+        return self.observations.copy(), self.rewards.copy(), self.dones.copy()
+
+    def close(self):
+        """Stops the worker processes and frees the shared memory."""
+        for process, connection in self.workers:
+            connection.send("close")
+            connection.close()
+            process.join()
+        self.workers = []
+
+        # the arrays must be released before the memory can be closed
+        for name in ("observations", "rewards", "dones", "actions"):
+            setattr(self, name, None)
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
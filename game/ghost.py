@@ -0,0 +1,163 @@
+import mmap
+import os
+import struct
+
+import pygame
+
+from database import models
+from game.assets import load_image
+from game.replay import read_text, write_text
+from game.simulation import RACING, TICK_RATE
+from game.sprites import rotation_atlas
+
+GHOST_MAGIC = b"TSGH"
+GHOST_VERSION = 1
+GHOST_ALPHA = 110  # opacity the ghost car is drawn at, from 0 to 255
+GHOST_DIRECTORY = "ghosts"
+
+HEADER = struct.Struct("<4sBB")  # magic, version, tick rate
+POSE = struct.Struct("<3f")  # x, y, angle, one fixed width record per tick
+
+
+def ghost_path(track_id):
+    """Returns the file path of the record ghost for a track.
+
+    Args:
+        track_id -- id of the track.
+    """
+    return os.path.join(GHOST_DIRECTORY, f"{track_id}.ghost")
+
+
+def replay_poses(replay):
+    """Re-simulates a replay and yields the player car's (x, y, angle) before the race and after every tick.
+
+    Args:
+        replay -- the Replay of the race.
+    """
+    simulation = replay.simulation()
+    car = simulation.player_car
+
+    yield car.x, car.y, car.angle
+    while simulation.outcome == RACING and simulation.ticks < len(replay):
+        simulation.step(replay.controls_at(simulation.ticks))
+        yield car.x, car.y, car.angle
+
+
+class GhostTrace:
+    def __init__(self, path):
+        """
+        Args:
+              path -- file path of the ghost trace.
+        """
+        self.trace_file = open(path, "rb")
+        # maps the file into memory, so poses are only read from disk when they are needed
+        self.trace = mmap.mmap(self.trace_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.tick_rate = HEADER.unpack_from(self.trace, 0)
+        if magic != GHOST_MAGIC or version != GHOST_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {GHOST_VERSION} ghost trace.")
+
+        self.car_id, self.poses_start = read_text(self.trace, HEADER.size)
+        self.length = (len(self.trace) - self.poses_start) // POSE.size
+
+    def __len__(self):
+        return self.length
+
+    def pose(self, tick):
+        """Returns the (x, y, angle) pose at a tick, the ghost stays on its last pose after the race ends.
+
+        Args:
+            tick -- tick number, 0 being the start of the race.
+        """
+        tick = max(0, min(tick, self.length - 1))
+        # fixed width records, so any tick can be read directly
+        return POSE.unpack_from(self.trace, self.poses_start + tick * POSE.size)
+
+    def close(self):
+        """Unmaps and closes the trace file."""
+        self.trace.close()
+        self.trace_file.close()
+
+
+class GhostCar:
+    def __init__(self, trace):
+        """
+        Args:
+              trace -- GhostTrace of the record run.
+        """
+        self.trace = trace
+
+        car_path = models.Car.get(models.Car.car_id == trace.car_id).car_path
+        ghost_image = load_image(car_path).copy()
+        # scales the alpha of every pixel so the ghost is drawn translucently
+        ghost_image.fill(
+            (255, 255, 255, GHOST_ALPHA), special_flags=pygame.BLEND_RGBA_MULT
+        )
+        self.rotation_atlas = rotation_atlas(f"{trace.car_id}-ghost", ghost_image)
+
+    def draw(self, win, tick, alpha=1):
+        """Draws the ghost car where the record run was at a tick and returns the area drawn to.
+
+        Args:
+            win -- game window to draw on.
+            tick -- ticks since the start of the race.
+            alpha -- how far between the previous and current tick to draw the car, from 0 to 1.
+        """
+        previous_x, previous_y, previous_angle = self.trace.pose(tick - 1)
+        x, y, angle = self.trace.pose(tick)
+
+        # interpolates between ticks in the same way as the player car
+        x = previous_x + (x - previous_x) * alpha
+        y = previous_y + (y - previous_y) * alpha
+        angle = previous_angle + (angle - previous_angle) * alpha
+
+        return self.rotation_atlas.draw(win, (x, y), angle)
+
+
+# ghost traces currently mapped into memory, by track id
+OPEN_TRACES = {}
+
+
+def load_ghost(track_id):
+    """Returns the GhostCar for a track's record run, or None if the track has no ghost.
+
+    Args:
+        track_id -- id of the track.
+    """
+    trace = OPEN_TRACES.get(track_id)
+    if trace is None:
+        path = ghost_path(track_id)
+        if not os.path.exists(path):
+            return None
+        trace = GhostTrace(path)
+        OPEN_TRACES[track_id] = trace
+
+    return GhostCar(trace)
+
+
+def save_ghost(track_id, car_id, poses):
+    """Writes a new record ghost for a track, replacing any previous one.
+
+    Args:
+        track_id -- id of the track.
+        car_id -- id of the car the record was set in.
+        poses -- iterable of (x, y, angle) poses, one per tick from the start of the race.
+    """
+    os.makedirs(GHOST_DIRECTORY, exist_ok=True)
+    path = ghost_path(track_id)
+    temporary_path = f"{path}.tmp"
+
+    with open(temporary_path, "wb") as trace_file:
+        trace_file.write(HEADER.pack(GHOST_MAGIC, GHOST_VERSION, TICK_RATE))
+        write_text(trace_file, car_id)
+        for pose in poses:
+            trace_file.write(POSE.pack(*pose))
+
+    # the old trace must be unmapped before it can be replaced
+    trace = OPEN_TRACES.pop(track_id, None)
+    if trace is not None:
+        trace.close()
+
+    # swaps the finished file in, so a half written ghost is never loaded
+    os.replace(temporary_path, path)
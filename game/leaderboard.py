@@ -0,0 +1,173 @@
+import bisect
+from array import array
+from collections import namedtuple
+
+from peewee import Tuple, fn
+
+from database import models
+from database.writer import WRITER
+
+TOP_SIZE = 50  # fastest scores per track kept in memory
+
+Score = namedtuple("Score", ["time", "id", "name"])
+
+
+class Leaderboard:
+    def __init__(self, size=TOP_SIZE):
+        """
+        Args:
+              size -- number of the fastest scores on each track kept in memory.
+        """
+        self.size = size
+        # per track, the fastest scores and their (time, id) keys in the same order, loaded the first time
+        # the track is asked for and kept up to date as scores are added, rather than queried again
+        self.scores = {}
+        self.keys = {}
+        # per track, every time in order, so ranks are found by binary search instead of counting rows
+        self.times = {}
+        self.last_id = None  # id of the newest score, read from the database the first time one is added
+
+    def clear(self):
+        """Forgets every cached score, e.g. when the database has been replaced."""
+        self.scores.clear()
+        self.keys.clear()
+        self.times.clear()
+        self.last_id = None
+
+    def top_scores(self, track_id):
+        """Returns the fastest scores on a track, fastest first, at most size of them.
+
+        Args:
+            track_id -- id of the track.
+        """
+        if track_id not in self.scores:
+            scores = self.query(track_id, None, self.size)
+            self.scores[track_id] = scores
+            self.keys[track_id] = [x[:2] for x in scores]
+        return self.scores[track_id]
+
+    def record(self, track_id):
+        """Returns the fastest time on a track, or None if it has no scores yet.
+
+        Args:
+            track_id -- id of the track.
+        """
+        scores = self.top_scores(track_id)
+        if not scores:
+            return None
+        return scores[0].time
+
+    def add(self, name, time, track_id):
+        """Saves a new high score in the background and returns it as a Score.
+
+        Args:
+            name -- name entered by the player.
+            time -- race finish time.
+            track_id -- id of the track the race was on.
+        """
+        if self.last_id is None:
+            self.last_id = models.HighScore.select(fn.MAX(models.HighScore.id)).scalar()
+        # scores are only added here, so their ids are known without waiting for the insert
+        self.last_id = (self.last_id or 0) + 1
+        score = Score(time, self.last_id, name)
+        WRITER.add(
+            models.HighScore(id=score.id, name=name, time=time, track_id=track_id)
+        )
+
+        if track_id in self.times:
+            times = self.times[track_id]
+            times.insert(bisect.bisect(times, time), time)
+
+        scores = self.top_scores(track_id)
+        keys = self.keys[track_id]
+        key = score[:2]
+        index = bisect.bisect(keys, key)
+        if index < self.size:
+            keys.insert(index, key)
+            scores.insert(index, score)
+            del keys[self.size :]
+            del scores[self.size :]
+        return score
+
+    def all_times(self, track_id):
+        """Returns every time on a track in order, fastest first, read from the database the first time.
+
+        Args:
+            track_id -- id of the track.
+        """
+        if track_id not in self.times:
+            # scores still waiting to be written would be missed
+            WRITER.flush()
+            # reads only the index, which already has the times in order
+            query = (
+                models.HighScore.select(models.HighScore.time)
+                .where(models.HighScore.track_id == track_id)
+                .order_by(models.HighScore.time)
+            )
+            self.times[track_id] = array("d", (row[0] for row in query.tuples()))
+        return self.times[track_id]
+
+    def rank(self, track_id, time):
+        """Returns the position a time would take on a track's leaderboard, 1 being the fastest.
+
+        Args:
+            track_id -- id of the track.
+            time -- race finish time.
+        """
+        # a time equal to others is placed after them, as it was set later
+        return bisect.bisect(self.all_times(track_id), time) + 1
+
+    def percentile(self, track_id, time):
+        """Returns the percentage of a track's scores that a time is faster than.
+
+        Args:
+            track_id -- id of the track.
+            time -- race finish time.
+        """
+        times = self.all_times(track_id)
+        if not times:
+            return 100.0
+        return 100.0 * (len(times) - bisect.bisect(times, time)) / len(times)
+
+    def page(self, track_id, after=None, count=5):
+        """Returns a page of scores on a track, fastest first.
+
+        Pages are found by the last score of the page before rather than by offset, so later pages are read
+        straight from the (track_id, time) index instead of counting through every faster score.
+
+        Args:
+            track_id -- id of the track.
+            after -- (time, id) of the last score of the previous page, or None for the first page.
+            count -- the most scores on the page.
+        """
+        scores = self.top_scores(track_id)
+        start = 0
+        if after is not None:
+            start = bisect.bisect(self.keys[track_id], tuple(after))
+
+        # fewer than size scores in memory means they are all of them
+        if start + count <= len(scores) or len(scores) < self.size:
+            return scores[start : start + count]
+        return self.query(track_id, after, count)
+
+    def query(self, track_id, after, count):
+        """Returns scores on a track from the database, fastest first.
+
+        Args:
+            track_id -- id of the track.
+            after -- (time, id) the scores are slower than, or None to start from the fastest.
+            count -- the most scores returned.
+        """
+        # scores still waiting to be written would be missed
+        WRITER.flush()
+        high_score = models.HighScore
+        query = high_score.select(
+            high_score.time, high_score.id, high_score.name
+        ).where(high_score.track_id == track_id)
+        if after is not None:
+            query = query.where(Tuple(high_score.time, high_score.id) > tuple(after))
+        query = query.order_by(high_score.time, high_score.id).limit(count)
+        return [Score(*x) for x in query.tuples()]
+
+
+LEADERBOARD = Leaderboard()
@@ -1,11 +1,21 @@
-import time
+import os
 
 import pygame
 
 from database import models
-from game.cars import ComputerCar, PlayerCar
+from database.writer import WRITER
+from game.assets import load_image
+from game.cars import PlayerCar
+from game.ghost import load_ghost, replay_poses, save_ghost
+from game.leaderboard import LEADERBOARD
+from game.profanity import load_profanity_filter
 from game.profiles import PlayerProfile
-from game.track import Track
+from game.render import DirtyRectRenderer
+from game.replay import Replay, ReplayWriter
+from game.scenes import Scene, SceneStack
+from game.simulation import WON, FixedTimestep, Simulation, read_controls
+from game.text import GlyphAtlas, render_text
+from game.track import TRACK_LOADER
 from game.utilities import blit_text_center, censor_word, draw_computer_path
 
 pygame.font.init()
@@ -20,31 +30,30 @@ pygame.display.set_caption("Track-Surf")
 MAIN_FONT = pygame.font.SysFont("comicsans", 44)
 SMALL_FONT = pygame.font.SysFont("comicsans", 24)
 
+# pre-rendered digits for the race timer, which changes every frame
+TIMER_GLYPHS = GlyphAtlas(MAIN_FONT, (0, 0, 0))
+
+# only pushes the parts of the window that changed during a race to the display
+RENDERER = DirtyRectRenderer()
+
+# every race is recorded so it can be replayed, and kept if it sets a high score
+RACE_REPLAY_PATH = "replays/last-race.tsr"
+REPLAY_WRITER = ReplayWriter()
+
 FPS = 30
 
 
 class GameInfo:
     def __init__(self):
         self.started = False
-        self.race_start_time = 0
 
     def reset(self):
-        """Resets start time and started to false."""
+        """Resets started to false."""
         self.started = False
-        self.race_start_time = 0
 
     def start_race(self):
-        """Sets start to true and gets start time."""
+        """Sets start to true."""
         self.started = True
-        self.race_start_time = time.time()  # current time when game starts
-
-    def get_race_time(self):
-        """Returns race time if race is started."""
-        if not self.started:
-            return 0
-        return round(
-            time.time() - self.race_start_time, 2
-        )  # current time minus start time
 
 
 class Button:
@@ -54,10 +63,10 @@ class Button:
         self.x = x
         self.y = y
         self.button_position = (self.x, self.y)
-        self.render_text = MAIN_FONT.render(self.text, 1, self.text_colour)
+        self.render_text = render_text(MAIN_FONT, self.text, self.text_colour)
 
         self.image_path = f"assets/interface/{button_type}.png"
-        self.button_image = pygame.image.load(self.image_path)
+        self.button_image = load_image(self.image_path)
 
         self.width = self.button_image.get_width()
         self.height = self.button_image.get_height()
@@ -69,8 +78,6 @@ class Button:
             self.button_image.get_height(),
         )
 
-        self.draw_button()
-
     def button_text(self):
         """Draws button text onto the centre of the button rectangle."""
         WIN.blit(
@@ -90,6 +97,12 @@ class Button:
         WIN.blit(self.button_image, self.button_position)  # draws button
         self.button_text()  # draws text
 
+        if self.button_rect.collidepoint(pygame.mouse.get_pos()):
+            # hovered buttons may change when clicked, so are always pushed to the display
+            RENDERER.add(self.button_rect)
+        else:
+            RENDERER.add_overlay(self.button_rect)
+
 
 class TextBox:
     def __init__(self, text=""):
@@ -101,7 +114,7 @@ class TextBox:
         self.height = 50
         self.background_colour = (255, 255, 255)
 
-        self.render_text = MAIN_FONT.render(self.text.upper(), 1, self.text_colour)
+        self.render_text = render_text(MAIN_FONT, self.text.upper(), self.text_colour)
 
         self.textbox_rect = pygame.Rect(self.x, self.y, self.width, self.height)
 
@@ -138,7 +151,7 @@ class TextBox:
             self.text = self.text.lower()
 
         # draws updated text onto text box
-        self.render_text = MAIN_FONT.render(self.text.upper(), 1, self.text_colour)
+        self.render_text = render_text(MAIN_FONT, self.text.upper(), self.text_colour)
 
 
 def quit_game():
@@ -156,7 +169,7 @@ def menu_text(button_text, x, y):
         y -- y co-ordinate of top left corner of text.
     """
     #
-    text = MAIN_FONT.render(button_text.upper(), 1, (0, 0, 0))
+    text = render_text(MAIN_FONT, button_text.upper(), (0, 0, 0))
     WIN.blit(text, (x, y))
 
 
@@ -166,661 +179,490 @@ def menu_title(menu_name):
     Args:
         menu_name -- menu title text to be drawn.
     """
-    text = MAIN_FONT.render(menu_name.upper(), 1, (0, 0, 0))
+    text = render_text(MAIN_FONT, menu_name.upper(), (0, 0, 0))
     WIN.blit(text, (WIN.get_width() / 2 - text.get_width() / 2, 10))
 
 
-def menu_basic(
-    clock,
-    track,
-    player_car,
-    computer_car,
-    game_info,
-    player_profile,
-    menu_name,
-    previous_menu,
-    click,
-):
-    """Draws the basic menu screen, or game window, and navigation buttons as appropriate.
+def save_high_score(name, time, track):
+    """Saves a high score, keeps the replay of the race it was set in, and makes it the ghost if it's a new record.
 
     Args:
-        clock -- pygame clock.
+        name -- name entered by the player.
+        time -- race finish time.
         track -- current Track object.
-        player_car -- current PlayerCar object.
-        computer_car -- current ComputerCar object.
-        game_info -- GameInfo object.
-        player_profile -- current PlayerProfile object.
-        menu_name -- current menu title.
-        previous_menu -- previous menu name.
-        click -- boolean based on if the player has clicked their mouse.
     """
+    high_score = LEADERBOARD.add(name, time, track.track_id)
 
-    # draws track, computer car, and player car
-    track.draw_track(WIN)
-    computer_car.draw(WIN)
-    player_car.draw(WIN)
-
-    if menu_name != "game":
-        # draws menu title if the user is not playing the game
-        menu_title(menu_name)
-
-    # sets mute text as appropriate
-    mute = "sound-on"
-    if player_profile.mute:
-        mute = "sound-off"
-
-    # draws mute button and mutes/unmutes if clicked
-    mute_button = Button("", (0, 0, 0), WIDTH - 100, 10, mute)
-    if mute_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-        player_profile.update_mute()
-
-    # draws appropriate menu navigation buttons if not on the main menu
-    # performs appropriate action if button is clicked
-    if menu_name != "main menu":
-        main_menu_button = Button("", (0, 0, 0), 10, 10, "main-menu")
-        if main_menu_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-            game_info.reset()
-            player_car.reset()
-            computer_car = ComputerCar(
-                "black_car",
-                track.computer_start_position,
-                track.computer_path,
-                track.track_record,
-            )
-            main_menu(clock, track, player_car, computer_car, game_info, player_profile)
-
-        if menu_name != "game" and previous_menu in ["settings", "profiles"]:
-            back_button = Button("", (0, 0, 0), 10, 80, "back")
-            if back_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-                if previous_menu == "settings":
-                    settings_loop(
-                        clock,
-                        track,
-                        player_car,
-                        computer_car,
-                        game_info,
-                        player_profile,
-                    )
-                if previous_menu == "profiles":
-                    profiles_settings(
-                        clock,
-                        track,
-                        player_car,
-                        computer_car,
-                        game_info,
-                        player_profile,
-                    )
-
-    # draws track record and race time onto screen when game is being played
-    if menu_name == "game":
-        time_text = MAIN_FONT.render(
-            f"Time: {game_info.get_race_time()}s", 1, (0, 0, 0)
-        )
-        WIN.blit(time_text, (10, HEIGHT - time_text.get_height() - 40))
+    if os.path.exists(RACE_REPLAY_PATH):
+        if track.track_record is None or time < track.track_record:
+            # a new track record becomes the ghost car, re-simulated from the race's replay
+            replay = Replay(RACE_REPLAY_PATH)
+            save_ghost(track.track_id, replay.player_car_id, replay_poses(replay))
+            track.track_record = time
 
-        time_text = MAIN_FONT.render(f"Record: {track.track_record}s", 1, (0, 0, 0))
-        WIN.blit(time_text, (10, HEIGHT - time_text.get_height()))
+        # names the replay after the score so suspicious times can be audited
+        os.replace(RACE_REPLAY_PATH, f"replays/highscore-{high_score.id}.tsr")
 
-    # displays current user profile at bottom of screen
-    else:
-        profile_text = MAIN_FONT.render(
-            f"Profile: {player_profile.username.upper()}", 1, (0, 0, 0)
-        )
-        WIN.blit(
-            profile_text,
-            (
-                WIDTH // 2 - profile_text.get_width() // 2,
-                HEIGHT - profile_text.get_height() - 40,
-            ),
-        )
 
+def all_profiles():
+    """Returns a query of every profile, in username order."""
+    # a new profile may still be waiting to be written
+    WRITER.flush()
+    return models.Profile.select(models.Profile.username).order_by(
+        models.Profile.username
+    )
 
-def menu_bottom_nav_buttons(start_index, all_list, click):
-    """Displays the forward/back navigation buttons on menus when appropriate.
 
-    Args:
-        start_index -- index the data will begin being displayed from.
-        all_list -- list of all data being displayed.
-        click -- boolean based on if the player has clicked their mouse.
-    """
-    # draws next page arrow if there are more items left to display
-    if start_index + 5 < len(all_list):
-        next_button = Button(
-            "",
-            (0, 0, 0),
-            WIDTH - 100,
-            HEIGHT - 100,
-            "forward",
-        )
-        # move to next page if button is clicked
-        if next_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-            start_index += 5
+class GameState:
+    def __init__(self, player_profile):
+        """
+        Args:
+              player_profile -- PlayerProfile to start with, whose last track and car are loaded.
+        """
+        self.game_info = GameInfo()
+        # loaded once, rather than looking names up in the database every frame
+        self.profanity = load_profanity_filter()
+        self.load_profile(player_profile)
+
+    def load_profile(self, player_profile):
+        """Makes a profile the current one and loads its last track and car.
 
-    # draws previous page arrow if there are previous items to display
-    if start_index > 0:
-        previous_button = Button("", (0, 0, 0), 10, HEIGHT - 100, "back")
-        # move to previous page if button is clicked
-        if previous_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-            start_index -= 5
+        Args:
+            player_profile -- PlayerProfile object.
+        """
+        self.player_profile = player_profile
+        self.load_track(player_profile.last_track_id)
 
-    # returns start_index for drawing appropriate data
-    return start_index
+    def load_track(self, track_id):
+        """Loads a track, with the player's car and the computer car at its start positions.
 
+        Args:
+            track_id -- id of the track to load.
+        """
+        track = TRACK_LOADER.load(track_id)
+        player_car = PlayerCar(
+            self.player_profile.last_car_id, track.player_start_position
+        )
+        # swapped in together once everything is ready, so the track and cars never mismatch
+        self.track = track
+        self.player_car = player_car
+        self.computer_car = track.new_computer_car()
 
-def high_score_name_entry(
-    clock, track, player_car, computer_car, game_info, time, player_profile
-):
-    """Displays the name entry screen for the player to save their race time.
+    def reset_race(self):
+        """Puts both cars back at the start, ready for a new race."""
+        self.game_info.reset()
+        self.player_car.reset()
+        self.computer_car = self.track.new_computer_car()
 
-    Args:
-        clock -- pygame clock.
-        track -- current Track object.
-        player_car -- current PlayerCar object.
-        computer_car -- current ComputerCar object.
-        game_info -- GameInfo object.
-        time -- race finish time.
-        player_profile -- current PlayerProfile object.
-    """
-    if player_profile.username == "default":
-        # text box with no text in it
-        name_entry_box = TextBox()
-    else:
-        # text box with player's username already inserted
-        name_entry_box = TextBox(player_profile.username)
-
-    while True:
-        clock.tick(FPS)
-
-        click = False
-        for event in pygame.event.get():
+
+class MenuScene(Scene):
+    def __init__(self, state, title, back=False):
+        """
+        Args:
+              state -- GameState shared by every scene.
+              title -- menu title text.
+              back -- whether the menu has a back button to the menu it was opened from.
+        """
+        super().__init__()
+        self.state = state
+        self.title = title
+
+        # every screen but the main menu has a button back to the main menu
+        self.main_menu_button = None
+        if title != "main menu":
+            self.main_menu_button = Button("", (0, 0, 0), 10, 10, "main-menu")
+
+        self.back_button = None
+        if back:
+            self.back_button = Button("", (0, 0, 0), 10, 80, "back")
+
+    def mute_button(self):
+        """Returns the mute button for the current profile's mute setting."""
+        # sets mute text as appropriate
+        mute = "sound-on"
+        if self.state.player_profile.mute:
+            mute = "sound-off"
+        return Button("", (0, 0, 0), WIDTH - 100, 10, mute)
+
+    def handle_events(self, events):
+        """Responds to the input events since the last frame.
+
+        Args:
+            events -- list of pygame events.
+        """
+        for event in events:
             if event.type == pygame.QUIT:
                 quit_game()
-
             if event.type == pygame.MOUSEBUTTONDOWN:
-                # sets click to True if user clicks their mouse button
-                click = True
-
+                self.click(event.pos)
             if event.type == pygame.KEYDOWN:
-                name_entry_box.update_text(event)
-
-                if event.key == pygame.K_RETURN:
-                    if name_entry_box.text != "":
-                        models.HighScore.create(
-                            name=name_entry_box.text, time=time, track_id=track.track_id
-                        )
-                        game_loop(
-                            clock,
-                            track,
-                            player_car,
-                            computer_car,
-                            game_info,
-                            player_profile,
-                        )
-                    else:
-                        game_loop(
-                            clock,
-                            track,
-                            player_car,
-                            computer_car,
-                            game_info,
-                            player_profile,
-                        )
-
-        # draws game and appropriate menu buttons
-        menu_basic(
-            clock,
-            track,
-            player_car,
-            computer_car,
-            game_info,
-            player_profile,
-            "enter name",
-            "main menu",
-            click,
-        )
+                self.key_down(event)
 
-        menu_text(f"Time: {time}", 300, 200)
+            if self.stack.top() is not self:
+                # the rest of the events are left for the scene that was moved to
+                break
 
-        name_entry_box.draw_textbox()
+    def click(self, pos):
+        """Mutes/unmutes or moves to another menu if the player clicked a navigation button.
 
-        # draws done button and performs appropriate action when clicked
-        done_button = Button("done", (0, 0, 0), 300, 500, "menu-button")
-        if done_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-            if name_entry_box.text != "":
-                # adds high score into database with name if text is entered into text box
-                models.HighScore.create(
-                    name=name_entry_box.text, time=time, track_id=track.track_id
-                )
+        Args:
+            pos -- position of the mouse when it was clicked.
+        """
+        if self.mute_button().button_rect.collidepoint(pos):
+            self.state.player_profile.update_mute()
 
-            game_loop(clock, track, player_car, computer_car, game_info, player_profile)
+        if self.main_menu_button and self.main_menu_button.button_rect.collidepoint(
+            pos
+        ):
+            self.state.reset_race()
+            self.stack.pop_to_root()
+        elif self.back_button and self.back_button.button_rect.collidepoint(pos):
+            self.stack.pop()
 
-        pygame.display.update()
+    def key_down(self, event):
+        """Responds to the player pressing a key.
 
+        Args:
+            event -- a pygame KEYDOWN event.
+        """
 
-def handle_collision(clock, track, player_car, computer_car, game_info, player_profile):
-    """Handles collisions between the player car, track, and finish line. Also handles collisions
-    between the computer car and finish line.
+    def draw(self):
+        """Draws the track and cars behind the menu, the menu, and navigation buttons."""
+        state = self.state
 
-        Args:
-            clock -- pygame clock.
-            track -- current Track object.
-            player_car -- current PlayerCar object.
-            computer_car -- current ComputerCar object.
-            game_info -- GameInfo object.
-            player_profile -- current PlayerProfile object.
-    """
-    # bounces car is player car hits the track wall
-    if player_car.collide(track.border_mask) is not None:
-        player_car.bounce()
+        # menus redraw and update the whole window
+        RENDERER.invalidate()
+        state.track.draw_track(WIN)
+        state.computer_car.draw(WIN)
+        state.player_car.draw(WIN)
 
-    # checks if computer car has reached finish line
-    computer_finish_poi_collide = computer_car.collide(
-        track.finish_mask, track.finish_x, track.finish_y
-    )
+        menu_title(self.title)
+        self.draw_navigation()
 
-    # resets game if computer car reaches finish line
-    if computer_finish_poi_collide is not None:
-        blit_text_center(WIN, MAIN_FONT, "You lost!")
-        pygame.display.update()
-        pygame.time.wait(2000)
-        game_info.reset()
-        player_car.reset()
-        computer_car = ComputerCar(
-            "black_car",
-            track.computer_start_position,
-            track.computer_path,
-            track.track_record,
+        # displays current user profile at bottom of screen
+        profile_text = render_text(
+            MAIN_FONT, f"Profile: {state.player_profile.username.upper()}", (0, 0, 0)
+        )
+        WIN.blit(
+            profile_text,
+            (
+                WIDTH // 2 - profile_text.get_width() // 2,
+                HEIGHT - profile_text.get_height() - 40,
+            ),
         )
-        game_loop(clock, track, player_car, computer_car, game_info, player_profile)
-
-    # checks if player car has reached finish line
-    player_finish_poi_collide = player_car.collide(
-        track.finish_mask, track.finish_x, track.finish_y
-    )
 
-    if player_finish_poi_collide is not None:
-        # bounces player car off finish line if player tries to cross it from above
-        if player_finish_poi_collide[1] == 0:
-            player_car.bounce()
+        self.draw_menu()
 
-        # resets game and runs high score save screen
-        else:
-            blit_text_center(WIN, MAIN_FONT, "You Win!")
-            time = game_info.get_race_time()
-            pygame.display.update()
-            pygame.time.wait(2000)
-            game_info.reset()
-            player_car.reset()
-            computer_car = ComputerCar(
-                "black_car",
-                track.computer_start_position,
-                track.computer_path,
-                track.track_record,
-            )
-            high_score_name_entry(
-                clock, track, player_car, computer_car, game_info, time, player_profile
-            )
+        pygame.display.update()
 
+    def draw_navigation(self):
+        """Draws the mute button and whichever navigation buttons the menu has."""
+        self.mute_button().draw_button()
+        for button in (self.main_menu_button, self.back_button):
+            if button:
+                button.draw_button()
 
-def game_loop(clock, track, player_car, computer_car, game_info, player_profile):
-    """The main game loop that draws the race and handles car movement.
+    def draw_menu(self):
+        """Draws the text and buttons belonging to this menu."""
 
-    Args:
-        clock -- pygame clock.
-        track -- current Track object.
-        player_car -- current PlayerCar object.
-        computer_car -- current ComputerCar object.
-        game_info -- GameInfo object.
-        player_profile -- current PlayerProfile object.
-    """
-    while True:
-        clock.tick(FPS)
 
-        click = False
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # sets click to true if player clicks mouse
-                click = True
-
-        menu_basic(
-            clock,
-            track,
-            player_car,
-            computer_car,
-            game_info,
-            player_profile,
-            "game",
-            "main menu",
-            click,
-        )
+class ListMenuScene(MenuScene):
+    def __init__(self, state, title, items, back=False):
+        """
+        Args:
+              state -- GameState shared by every scene.
+              title -- menu title text.
+              items -- the database rows listed, five to a page.
+              back -- whether the menu has a back button to the menu it was opened from.
+        """
+        super().__init__(state, title, back)
+        self.next_button = Button("", (0, 0, 0), WIDTH - 100, HEIGHT - 100, "forward")
+        self.previous_button = Button("", (0, 0, 0), 10, HEIGHT - 100, "back")
+        self.show_items(items)
 
-        #####################################################
-        # for finding new track path
-        # draw_computer_path(click, computer_car, track, WIN)
-        #####################################################
+    def show_items(self, items):
+        """Lists a new set of rows, from the first page.
 
-        # loop for while game not playing
-        while not game_info.started:
-            click = False
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    quit_game()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    # click true if user clicks mouse
-                    click = True
-                if event.type == pygame.KEYDOWN:
-                    # starts race if user presses any key on keyboard
-                    game_info.start_race()
-
-            # appropriate mute text
-            mute = "sound-on"
-            if player_profile.mute:
-                mute = "sound-off"
-
-            # mute button that mutes/unmutes appropriately when clicked on by the user
-            mute_button = Button("", (0, 0, 0), WIDTH - 100, 10, mute)
-            if mute_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-                player_profile.update_mute()
-
-            #   main menu button that takes the user back to the main menu when clicked
-            main_menu_button = Button("", (0, 0, 0), 10, 10, "main-menu")
-            if (
-                main_menu_button.button_rect.collidepoint(pygame.mouse.get_pos())
-                and click
-            ):
-                game_info.reset()
-                player_car.reset()
-                computer_car = ComputerCar(
-                    "black_car",
-                    track.computer_start_position,
-                    track.computer_path,
-                    track.track_record,
-                )
-                main_menu(
-                    clock, track, player_car, computer_car, game_info, player_profile
-                )
+        Args:
+            items -- the database rows listed.
+        """
+        self.items = list(items)
+        self.start_index = 0
+        self.show_page()
+
+    def show_page(self):
+        """Creates the buttons for the rows on the current page."""
+        self.page = []  # (row, button) pairs
+        y = 200  # lowest y co-ord for buttons
+        for item in self.items[self.start_index : self.start_index + 5]:
+            self.page.append((item, self.item_button(item, y)))
+            y += 100
 
-            # press any key to start text
-            blit_text_center(WIN, MAIN_FONT, "Press any key to start!")
+    def item_button(self, item, y):
+        """Returns the button that selects a row, or None if rows can't be selected.
 
-            pygame.display.update()
+        Args:
+            item -- database row.
+            y -- y co-ordinate of the top of the button.
+        """
+        return None
 
-        player_car.move_player()  # moves player car according to user key presses
-        computer_car.move()  # moves computer car towards next point in path
+    def select(self, item):
+        """Responds to the player clicking on a row's button.
 
-        # collision detection between cars, track borders, and finish line
-        handle_collision(
-            clock, track, player_car, computer_car, game_info, player_profile
-        )
+        Args:
+            item -- database row.
+        """
 
-        pygame.display.update()
+    def click(self, pos):
+        """Selects a row or changes page if the player clicked its button.
 
+        Args:
+            pos -- position of the mouse when it was clicked.
+        """
+        super().click(pos)
+
+        for item, button in self.page:
+            if button and button.button_rect.collidepoint(pos):
+                self.select(item)
+
+        # move to next page or previous page if the arrows are shown and clicked
+        if self.has_next_page() and self.next_button.button_rect.collidepoint(pos):
+            self.start_index += 5
+            self.show_page()
+        elif self.start_index > 0 and self.previous_button.button_rect.collidepoint(
+            pos
+        ):
+            self.start_index -= 5
+            self.show_page()
 
-def settings_loop(clock, track, player_car, computer_car, game_info, player_profile):
-    """Displays the main settings menu.
+    def has_next_page(self):
+        """Returns True if there are more rows after the current page."""
+        return self.start_index + 5 < len(self.items)
 
-    Args:
-        clock -- pygame clock.
-        track -- current Track object.
-        player_car -- current PlayerCar object.
-        computer_car -- current ComputerCar object.
-        game_info -- GameInfo object.
-        player_profile -- current PlayerProfile object.
-    """
-    while True:
-        clock.tick(FPS)
+    def draw_menu(self):
+        """Draws the buttons for the rows on the current page, and the page arrows."""
+        for item, button in self.page:
+            button.draw_button()
+            self.draw_item(item, button)
+        self.draw_page_arrows()
 
-        click = False
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # click true is player clicks the mouse
-                click = True
-
-        menu_basic(
-            clock,
-            track,
-            player_car,
-            computer_car,
-            game_info,
-            player_profile,
-            "settings",
-            "main menu",
-            click,
-        )
+    def draw_item(self, item, button):
+        """Draws any details of a row next to its button.
 
-        # car button which takes user to the car selection menu if clicked on
-        car_button = Button("car", (0, 0, 0), 300, 200, "menu-button")
-        if car_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-            car_settings(
-                clock, track, player_car, computer_car, game_info, player_profile
-            )
+        Args:
+            item -- database row.
+            button -- the row's Button.
+        """
 
-        # track button which takes user to the track selection menu if clicked on
-        track_button = Button("track", (0, 0, 0), 300, 300, "menu-button")
-        if track_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-            track_settings(
-                clock, track, player_car, computer_car, game_info, player_profile
-            )
+    def draw_page_arrows(self):
+        """Draws the forward/back page arrows when there are more rows that way."""
+        if self.has_next_page():
+            self.next_button.draw_button()
+        if self.start_index > 0:
+            self.previous_button.draw_button()
 
-        pygame.display.update()
 
+class MainMenuScene(MenuScene):
+    def __init__(self, state):
+        """
+        Args:
+              state -- GameState shared by every scene.
+        """
+        super().__init__(state, "main menu")
+        self.play_button = Button("Play", (0, 0, 0), 250, 200, "menu-button-large")
+        self.settings_button = Button(
+            "Settings", (0, 0, 0), 250, 300, "menu-button-large"
+        )
+        self.high_scores_button = Button(
+            "records", (0, 0, 0), 250, 400, "menu-button-large"
+        )
+        self.profiles_button = Button(
+            "profiles", (0, 0, 0), 250, 500, "menu-button-large"
+        )
 
-def car_settings(clock, track, player_car, computer_car, game_info, player_profile):
-    """Displays the car selection menu.
+    def click(self, pos):
+        """Opens the game or menu whose button the player clicked.
 
-    Args:
-        clock -- pygame clock.
-        track -- current Track object.
-        player_car -- current PlayerCar object.
-        computer_car -- current ComputerCar object.
-        game_info -- GameInfo object.
-        player_profile -- current PlayerProfile object.
-    """
-    # list of all cars from database
-    all_cars = (
-        models.Car.select(
-            models.Car.car_id,
-            models.Car.car_name,
-            models.Car.max_vel,
-            models.Car.rotation_vel,
-            models.Car.acceleration,
-        )
-        .where(models.Car.car_id != "black_car")
-        .order_by(models.Car.car_name)
-    )
+        Args:
+            pos -- position of the mouse when it was clicked.
+        """
+        super().click(pos)
+
+        if self.play_button.button_rect.collidepoint(pos):
+            self.stack.push(GameScene(self.state))
+        elif self.settings_button.button_rect.collidepoint(pos):
+            self.stack.push(SettingsScene(self.state))
+        elif self.high_scores_button.button_rect.collidepoint(pos):
+            self.stack.push(HighScoresScene(self.state))
+        elif self.profiles_button.button_rect.collidepoint(pos):
+            self.stack.push(ProfilesScene(self.state))
+
+    def draw_menu(self):
+        """Draws the play, settings, records, and profiles buttons."""
+        self.play_button.draw_button()
+        self.settings_button.draw_button()
+        self.high_scores_button.draw_button()
+        self.profiles_button.draw_button()
+
+
+class SettingsScene(MenuScene):
+    def __init__(self, state):
+        """
+        Args:
+              state -- GameState shared by every scene.
+        """
+        super().__init__(state, "settings")
+        self.car_button = Button("car", (0, 0, 0), 300, 200, "menu-button")
+        self.track_button = Button("track", (0, 0, 0), 300, 300, "menu-button")
 
-    start_index = 0
+    def click(self, pos):
+        """Opens the car or track selection menu if its button was clicked.
 
-    while True:
-        clock.tick(FPS)
+        Args:
+            pos -- position of the mouse when it was clicked.
+        """
+        super().click(pos)
 
-        click = False
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # click true if player clicks  mouse
-                click = True
-
-        menu_basic(
-            clock,
-            track,
-            player_car,
-            computer_car,
-            game_info,
-            player_profile,
-            "cars",
-            "settings",
-            click,
-        )
+        if self.car_button.button_rect.collidepoint(pos):
+            self.stack.push(CarsScene(self.state))
+        elif self.track_button.button_rect.collidepoint(pos):
+            self.stack.push(TracksScene(self.state))
 
-        # button and id lists
-        car_buttons = []
-        car_ids = []
-        # lowest y co-ord for buttons
-        y = 200
-
-        # draws car buttons and car stats
-        for item in all_cars[start_index : min(start_index + 5, len(all_cars))]:
-            car_ids.append(item.car_id)
-            button = Button(item.car_name, (0, 0, 0), 10, y, "menu-button")
-            car_buttons.append(button)
-            stats_y = button.y + button.height / 2 - button.render_text.get_height() / 2
-            menu_text(
-                f"Speed:{item.max_vel}    Hand:{item.rotation_vel}    Acc:{item.acceleration}",
-                200,
-                stats_y,
-            )
-            y += 100
+    def draw_menu(self):
+        """Draws the car and track buttons."""
+        self.car_button.draw_button()
+        self.track_button.draw_button()
 
-        # sets car to the selected car and updates the user's preference when a button is clicked
-        for button in car_buttons:
-            if button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-                id = car_ids[car_buttons.index(button)]
-                player_car = PlayerCar(id, track.player_start_position)
-                player_profile.update_last_car_id(player_car.car_id)
 
-        # draws appropriate nav buttons and updates start index
-        start_index = menu_bottom_nav_buttons(start_index, all_cars, click)
+class CarsScene(ListMenuScene):
+    def __init__(self, state):
+        """
+        Args:
+              state -- GameState shared by every scene.
+        """
+        # list of all cars from database
+        all_cars = (
+            models.Car.select(
+                models.Car.car_id,
+                models.Car.car_name,
+                models.Car.max_vel,
+                models.Car.rotation_vel,
+                models.Car.acceleration,
+            )
+            .where(models.Car.car_id != "black_car")
+            .order_by(models.Car.car_name)
+        )
+        super().__init__(state, "cars", all_cars, back=True)
 
-        pygame.display.update()
+    def item_button(self, item, y):
+        """Returns the button that selects a car.
 
+        Args:
+            item -- Car row.
+            y -- y co-ordinate of the top of the button.
+        """
+        return Button(item.car_name, (0, 0, 0), 10, y, "menu-button")
 
-def track_settings(clock, track, player_car, computer_car, game_info, player_profile):
-    """Displays the track selection menu.
+    def select(self, item):
+        """Sets the player's car to the selected car and updates the user's preference.
 
-    Args:
-        clock -- pygame clock.
-        track -- current Track object.
-        player_car -- current PlayerCar object.
-        computer_car -- current ComputerCar object.
-        game_info -- GameInfo object.
-        player_profile -- current PlayerProfile object.
-    """
-    # list of all tracks from database
-    all_tracks = models.Track.select(
-        models.Track.track_id, models.Track.track_name
-    ).order_by(models.Track.track_name)
-    start_index = 0
+        Args:
+            item -- Car row.
+        """
+        state = self.state
+        state.player_car = PlayerCar(item.car_id, state.track.player_start_position)
+        state.player_profile.update_last_car_id(state.player_car.car_id)
 
-    while True:
-        clock.tick(FPS)
+    def draw_item(self, item, button):
+        """Draws a car's stats next to its button.
 
-        click = False
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # click true if user  clicks mouse
-                click = True
-
-        menu_basic(
-            clock,
-            track,
-            player_car,
-            computer_car,
-            game_info,
-            player_profile,
-            "tracks",
-            "settings",
-            click,
+        Args:
+            item -- Car row.
+            button -- the car's Button.
+        """
+        stats_y = button.y + button.height / 2 - button.render_text.get_height() / 2
+        menu_text(
+            f"Speed:{item.max_vel}    Hand:{item.rotation_vel}    Acc:{item.acceleration}",
+            200,
+            stats_y,
         )
 
-        # list of buttons and ids
-        track_buttons = []
-        track_ids = []
-        # lowest y co-ord for buttons
-        y = 200
-
-        # draws track buttons
-        for item in all_tracks[start_index : min(start_index + 5, len(all_tracks))]:
-            track_ids.append(item.track_id)
-            button = Button(item.track_name, (0, 0, 0), 300, y, "menu-button")
-            track_buttons.append(button)
-            y += 100
 
-        # sets selected track and updates player preference appropriately
-        for button in track_buttons:
-            if button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-                id = track_ids[track_buttons.index(button)]
-                track = Track(id)
-                player_car = PlayerCar(
-                    player_profile.last_car_id, track.player_start_position
-                )
-                computer_car = ComputerCar(
-                    "black_car",
-                    track.computer_start_position,
-                    track.computer_path,
-                    track.track_record,
-                )
-                player_profile.update_last_track_id(track.track_id)
-
-        # draws the bottom nav buttons if appropriate and updates the start index
-        start_index = menu_bottom_nav_buttons(start_index, all_tracks, click)
+class TracksScene(ListMenuScene):
+    def __init__(self, state):
+        """
+        Args:
+              state -- GameState shared by every scene.
+        """
+        # list of all tracks from database
+        all_tracks = models.Track.select(
+            models.Track.track_id, models.Track.track_name
+        ).order_by(models.Track.track_name)
+        super().__init__(state, "tracks", all_tracks, back=True)
 
-        pygame.display.update()
+    def item_button(self, item, y):
+        """Returns the button that selects a track.
 
+        Args:
+            item -- Track row.
+            y -- y co-ordinate of the top of the button.
+        """
+        return Button(item.track_name, (0, 0, 0), 300, y, "menu-button")
 
-def high_scores(clock, track, player_car, computer_car, game_info, player_profile):
-    """Displays the high scores screen for the current track.
+    def show_page(self):
+        """Creates the buttons for the tracks on the current page, and starts loading them in the background."""
+        super().show_page()
+        # by the time the player picks one it is usually ready, so the switch is instant
+        for item, _ in self.page:
+            TRACK_LOADER.prefetch(item.track_id)
 
-    Args:
-        clock -- pygame clock.
-        track -- current Track object.
-        player_car -- current PlayerCar object.
-        computer_car -- current ComputerCar object.
-        game_info -- GameInfo object.
-        player_profile -- current PlayerProfile object.
-    """
-    # list of top scores from the database
-    top_scores = (
-        models.HighScore.select(models.HighScore.name, models.HighScore.time)
-        .where(models.HighScore.track_id == track.track_id)
-        .order_by(models.HighScore.time)
-        .limit(50)
-    )
-    start_index = 0
+    def select(self, item):
+        """Loads the selected track and updates the user's preference.
 
-    while True:
-        clock.tick(FPS)
+        Args:
+            item -- Track row.
+        """
+        self.state.load_track(item.track_id)
+        self.state.player_profile.update_last_track_id(item.track_id)
 
-        click = False
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # click true if user clicks their mouse
-                click = True
-
-        menu_basic(
-            clock,
-            track,
-            player_car,
-            computer_car,
-            game_info,
-            player_profile,
-            "high scores",
-            "main menu",
-            click,
-        )
 
+class HighScoresScene(ListMenuScene):
+    def __init__(self, state):
+        """
+        Args:
+              state -- GameState shared by every scene.
+        """
+        # the (time, id) of the score each page starts after, so pages are read from the leaderboard's index
+        self.page_starts = {0: None}
+        self.more = False  # whether there are more scores after the current page
+        super().__init__(state, "high scores", [])
+
+    def show_page(self):
+        """Reads the scores on the current page from the leaderboard."""
+        track_id = self.state.track.track_id
+        # one extra score shows whether there is a next page
+        scores = LEADERBOARD.page(track_id, self.page_starts[self.start_index], 6)
+        self.more = len(scores) > 5
+        self.page = [(x, None) for x in scores[:5]]
+        if self.more:
+            self.page_starts[self.start_index + 5] = scores[4][:2]
+
+    def has_next_page(self):
+        """Returns True if there are more scores after the current page."""
+        return self.more
+
+    def draw_menu(self):
+        """Draws the scores and positions on the current page."""
         # top x, y co-ords for text
         x, y = 150, 200
         score_pos = 1
 
         # draws the appropriate scores and positions
-        for item in top_scores[start_index : min(start_index + 5, len(top_scores))]:
-            menu_text(f"{start_index + score_pos}.", x - 50, y)
+        for item, _ in self.page:
+            menu_text(f"{self.start_index + score_pos}.", x - 50, y)
             # censors name if in profanity list
-            if (
-                models.Profanity.select()
-                .where(models.Profanity.word == item.name.lower())
-                .exists()
-            ):
+            if self.state.profanity.contains(item.name):
                 menu_text(censor_word(item.name), x, y)
             else:
                 menu_text(item.name, x, y)
@@ -830,310 +672,325 @@ def high_scores(clock, track, player_car, computer_car, game_info, player_profil
             y += 100
             score_pos += 1
 
-        # draws bottom nav buttons  if needed and updates start_index
-        start_index = menu_bottom_nav_buttons(start_index, top_scores, click)
+        self.draw_page_arrows()
 
-        pygame.display.update()
 
+class ProfilesScene(ListMenuScene):
+    def __init__(self, state):
+        """
+        Args:
+              state -- GameState shared by every scene.
+        """
+        super().__init__(state, "profiles", all_profiles())
+        self.create_profile_button = Button(
+            "new profile", (0, 0, 0), 250, 100, "menu-button-large"
+        )
 
-def profiles_settings(
-    clock, track, player_car, computer_car, game_info, player_profile
-):
-    """Displays the profile selection menu.
+    def resume(self):
+        """Lists the profiles again, in case one was created."""
+        self.show_items(all_profiles())
 
-    Args:
-        clock -- pygame clock.
-        track -- current Track object.
-        player_car -- current PlayerCar object.
-        computer_car -- current ComputerCar object.
-        game_info -- GameInfo object.
-        player_profile -- current PlayerProfile object.
-    """
-    # all profiles list from database
-    all_profiles = models.Profile.select(models.Profile.username).order_by(
-        models.Profile.username
-    )
+    def item_button(self, item, y):
+        """Returns the button that selects a profile.
 
-    start_index = 0
+        Args:
+            item -- Profile row.
+            y -- y co-ordinate of the top of the button.
+        """
+        return Button(item.username, (0, 0, 0), 250, y, "menu-button-large")
 
-    while True:
-        clock.tick(FPS)
+    def select(self, item):
+        """Changes user profile to the selected profile, with its last track and car.
 
-        click = False
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # click true if player clicks their mouse button
-                click = True
-
-        menu_basic(
-            clock,
-            track,
-            player_car,
-            computer_car,
-            game_info,
-            player_profile,
-            "profiles",
-            "main menu",
-            click,
-        )
+        Args:
+            item -- Profile row.
+        """
+        self.state.load_profile(PlayerProfile(item.username))
 
-        # new profile button that takes player to the profile creation screen when clicked
-        create_profile_button = Button(
-            "new profile", (0, 0, 0), 250, 100, "menu-button-large"
-        )
-        if (
-            create_profile_button.button_rect.collidepoint(pygame.mouse.get_pos())
-            and click
-        ):
-            create_profile(
-                clock, track, player_car, computer_car, game_info, player_profile
-            )
+    def click(self, pos):
+        """Opens the profile creation screen if the new profile button was clicked.
 
-        profile_buttons = []  # profile button list
-        y = 200  # lowest y co-ord for profile buttons on screen
+        Args:
+            pos -- position of the mouse when it was clicked.
+        """
+        super().click(pos)
 
-        # draws up to five buttons on the screen
-        for profile in all_profiles[
-            start_index : min(start_index + 5, len(all_profiles))
-        ]:
-            profile_buttons.append(
-                Button(profile.username, (0, 0, 0), 250, y, "menu-button-large")
-            )
-            y += 100
+        if self.create_profile_button.button_rect.collidepoint(pos):
+            self.stack.push(CreateProfileScene(self.state))
 
-        # changes user profile to to the corresponding profile if a button is clicked
-        for button in profile_buttons:
-            if button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-                player_profile = PlayerProfile(button.text.lower())
-                track = Track(player_profile.last_track_id)
-                player_car = PlayerCar(
-                    player_profile.last_car_id, track.player_start_position
-                )
-                computer_car = ComputerCar(
-                    "black_car",
-                    track.computer_start_position,
-                    track.computer_path,
-                    track.track_record,
-                )
-
-        # draws bottom nav buttons if required and updates start_index
-        start_index = menu_bottom_nav_buttons(start_index, all_profiles, click)
+    def draw_menu(self):
+        """Draws the new profile button and the profile buttons on the current page."""
+        self.create_profile_button.draw_button()
+        super().draw_menu()
 
-        pygame.display.update()
 
+class CreateProfileScene(MenuScene):
+    def __init__(self, state):
+        """
+        Args:
+              state -- GameState shared by every scene.
+        """
+        super().__init__(state, "create profile", back=True)
+        self.name_entry_box = TextBox()
+        self.done_button = Button("done", (0, 0, 0), 300, 500, "menu-button")
 
-def create_profile(clock, track, player_car, computer_car, game_info, player_profile):
-    """Displays profile creation menu.
+    def key_down(self, event):
+        """Types into the text box, or saves the profile when enter is pressed.
 
-    Args:
-        clock -- pygame clock.
-        track -- current Track object.
-        player_car -- current PlayerCar object.
-        computer_car -- current ComputerCar object.
-        game_info -- GameInfo object.
-        player_profile -- current PlayerProfile object.
-    """
-    # instantiate text box
-    name_entry_box = TextBox()
-    while True:
-        clock.tick(FPS)
+        Args:
+            event -- a pygame KEYDOWN event.
+        """
+        if event.key == pygame.K_RETURN:
+            self.save_profile()
+        else:
+            self.name_entry_box.update_text(event)
 
-        click = False
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # click true if user clicks their mouse
-                click = True
+    def click(self, pos):
+        """Saves the profile if the done button was clicked.
 
-            if event.type == pygame.KEYDOWN:
+        Args:
+            pos -- position of the mouse when it was clicked.
+        """
+        super().click(pos)
 
-                # updates text in text box when user types
-                if event.key != pygame.K_RETURN:
-                    name_entry_box.update_text(event)
-
-                if (
-                    event.key == pygame.K_RETURN
-                    and len(name_entry_box.text) != 0
-                    and not models.Profile.select()
-                    .where(models.Profile.username == name_entry_box.text)
-                    .exists()
-                    and not models.Profanity.select()
-                    .where(models.Profanity.word == name_entry_box.text.lower())
-                    .exists()
-                ):
-                    # creates new profile with current preferences if the entered name is not already in the database
-                    # and not profanity when user presses enter
-                    models.Profile.create(
-                        username=name_entry_box.text,
-                        mute=player_profile.mute,
-                        last_car_id=player_car.car_id,
-                        last_track_id=track.track_id,
-                    )
-                    # loads newly created profile as current profile and returns to profile selection screen
-                    player_profile = PlayerProfile(name_entry_box.text)
-                    profiles_settings(
-                        clock,
-                        track,
-                        player_car,
-                        computer_car,
-                        game_info,
-                        player_profile,
-                    )
-
-                # profanity check
-                # does not allow profanity to be saved as username
-                elif (
-                    event.key == pygame.K_RETURN
-                    and models.Profanity.select()
-                    .where(models.Profanity.word == name_entry_box.text.lower())
-                    .exists()
-                ):
-                    blit_text_center(WIN, MAIN_FONT, "Username cannot be profanity!")
-                    pygame.display.update()
-                    pygame.time.wait(2000)
-                    name_entry_box.text = ""
-
-        menu_basic(
-            clock,
-            track,
-            player_car,
-            computer_car,
-            game_info,
-            player_profile,
-            "create profile",
-            "profiles",
-            click,
-        )
+        if self.done_button.button_rect.collidepoint(pos):
+            self.save_profile()
+
+    def save_profile(self):
+        """Creates a new profile with the current preferences and returns to the profile selection screen,
+        if the entered name is not already taken and not profanity."""
+        username = self.name_entry_box.text
+        # a profile with the same name may still be waiting to be written
+        WRITER.flush()
 
+        if self.state.profanity.contains(username):
+            # does not allow profanity to be saved as username
+            blit_text_center(WIN, MAIN_FONT, "Username cannot be profanity!")
+            pygame.display.update()
+            pygame.time.wait(2000)
+            self.name_entry_box = TextBox()
+
+        elif (
+            username != ""
+            and not models.Profile.select()
+            .where(models.Profile.username == username)
+            .exists()
+        ):
+            state = self.state
+            profile = models.Profile(
+                username=username,
+                mute=state.player_profile.mute,
+                last_car_id=state.player_car.car_id,
+                last_track_id=state.track.track_id,
+            )
+            # saved in the background, so the screen doesn't wait on the disk
+            WRITER.add(profile)
+            # makes new profile the current profile in use
+            state.player_profile = PlayerProfile(username, profile)
+            self.stack.pop()
+
+    def draw_menu(self):
+        """Draws the text box and done button."""
         menu_text("enter new username", 150, 200)
+        self.name_entry_box.draw_textbox()
+        self.done_button.draw_button()
 
-        # draws text box with appropriate text in it
-        name_entry_box.draw_textbox()
-
-        # done button that adds new profile to database with current preferences saved
-        # if the name isn't already taken
-        done_button = Button("done", (0, 0, 0), 300, 500, "menu-button")
-        if done_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-            if (
-                name_entry_box.text != ""
-                and not models.Profile.select()
-                .where(models.Profile.username == name_entry_box.text)
-                .exists()
-                and not models.Profanity.select()
-                .where(models.Profanity.word == name_entry_box.text.lower())
-                .exists()
-            ):
-                models.Profile.create(
-                    username=name_entry_box.text,
-                    mute=player_profile.mute,
-                    last_car_id=player_car.car_id,
-                    last_track_id=track.track_id,
-                )
-                # makes new profile the current profile in use and returns to profile selection screen
-                player_profile = PlayerProfile(name_entry_box.text)
-                profiles_settings(
-                    clock, track, player_car, computer_car, game_info, player_profile
-                )
-
-            elif (
-                models.Profanity.select()
-                .where(models.Profanity.word == name_entry_box.text.lower())
-                .exists()
-            ):
-                blit_text_center(WIN, MAIN_FONT, "Username cannot contain profanity!")
-                pygame.display.update()
-                pygame.time.wait(2000)
-                name_entry_box.text = ""
 
-        pygame.display.update()
+class HighScoreEntryScene(MenuScene):
+    def __init__(self, state, time):
+        """
+        Args:
+              state -- GameState shared by every scene.
+              time -- race finish time.
+        """
+        super().__init__(state, "enter name")
+        self.time = time
+        # where the time would be placed, worked out once rather than every frame
+        track_id = state.track.track_id
+        self.rank = LEADERBOARD.rank(track_id, time)
+        self.percentile = LEADERBOARD.percentile(track_id, time)
+
+        if state.player_profile.username == "default":
+            # text box with no text in it
+            self.name_entry_box = TextBox()
+        else:
+            # text box with player's username already inserted
+            self.name_entry_box = TextBox(state.player_profile.username)
 
+        self.done_button = Button("done", (0, 0, 0), 300, 500, "menu-button")
 
-def main_menu(clock, track, player_car, computer_car, game_info, player_profile):
-    """Displays the main menu.
+    def key_down(self, event):
+        """Types into the text box, or saves the score when enter is pressed.
 
-    Args:
-        clock -- pygame clock.
-        track -- current Track object.
-        player_car -- current PlayerCar object.
-        computer_car -- current ComputerCar object.
-        game_info -- GameInfo object.
-        player_profile -- current PlayerProfile object.
-    """
-    while True:
-        clock.tick(FPS)
+        Args:
+            event -- a pygame KEYDOWN event.
+        """
+        if event.key == pygame.K_RETURN:
+            self.save_score()
+        else:
+            self.name_entry_box.update_text(event)
 
-        click = False
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # click true if user clicks mouse
-                click = True
-
-        menu_basic(
-            clock,
-            track,
-            player_car,
-            computer_car,
-            game_info,
-            player_profile,
-            "main menu",
-            "main menu",
-            click,
-        )
+    def click(self, pos):
+        """Saves the score if the done button was clicked.
 
-        # play button that runs the game if clicked
-        play_button = Button("Play", (0, 0, 0), 250, 200, "menu-button-large")
-        if play_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-            game_loop(clock, track, player_car, computer_car, game_info, player_profile)
+        Args:
+            pos -- position of the mouse when it was clicked.
+        """
+        super().click(pos)
 
-        # settings button that takes the user to the settings menu when clicked
-        settings_button = Button("Settings", (0, 0, 0), 250, 300, "menu-button-large")
-        if settings_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-            settings_loop(
-                clock, track, player_car, computer_car, game_info, player_profile
-            )
+        if self.done_button.button_rect.collidepoint(pos):
+            self.save_score()
 
-        # high score button that takes the user to the high scores screen when clicked
-        high_scores_button = Button("records", (0, 0, 0), 250, 400, "menu-button-large")
-        if (
-            high_scores_button.button_rect.collidepoint(pygame.mouse.get_pos())
-            and click
-        ):
-            high_scores(
-                clock, track, player_car, computer_car, game_info, player_profile
-            )
+    def save_score(self):
+        """Adds the high score to the database if a name was entered, and starts the next race,
+        unless the name is profanity."""
+        name = self.name_entry_box.text
 
-        # profiles button that takes users to the profile selection menu when clicked
-        profiles_button = Button("profiles", (0, 0, 0), 250, 500, "menu-button-large")
-        if profiles_button.button_rect.collidepoint(pygame.mouse.get_pos()) and click:
-            profiles_settings(
-                clock, track, player_car, computer_car, game_info, player_profile
-            )
+        if self.state.profanity.contains(name):
+            # does not allow profanity to be saved as a name
+            blit_text_center(WIN, MAIN_FONT, "Name cannot be profanity!")
+            pygame.display.update()
+            pygame.time.wait(2000)
+            self.name_entry_box = TextBox()
+            return
+
+        if name != "":
+            save_high_score(name, self.time, self.state.track)
+        self.stack.replace(GameScene(self.state))
+
+    def draw_menu(self):
+        """Draws the race time and its rank, text box, and done button."""
+        menu_text(f"Time: {self.time}", 300, 200)
+        menu_text(f"Rank {self.rank}, faster than {self.percentile:.0f}%", 150, 400)
+        self.name_entry_box.draw_textbox()
+        self.done_button.draw_button()
+
+
+class GameScene(MenuScene):
+    def __init__(self, state):
+        """
+        Args:
+              state -- GameState shared by every scene.
+        """
+        super().__init__(state, "game")
+        # the first frame of a race redraws over whatever screen came before it
+        RENDERER.invalidate()
 
+        # car movement and collisions, independent of drawing
+        self.simulation = Simulation(state.track, state.player_car, state.computer_car)
+        # runs physics at a fixed rate however fast frames are drawn
+        self.timestep = FixedTimestep()
+        # translucent car following the track record run, if one has been recorded
+        self.ghost = load_ghost(state.track.track_id)
+
+    def animating(self):
+        """Returns True once the race has started, until then the start screen only changes on input."""
+        return self.state.game_info.started
+
+    def key_down(self, event):
+        """Starts the race if it hasn't started yet.
+
+        Args:
+            event -- a pygame KEYDOWN event.
+        """
+        game_info = self.state.game_info
+        if not game_info.started:
+            # starts race if user presses any key on keyboard
+            game_info.start_race()
+            # time spent waiting to start isn't simulated
+            self.timestep.reset()
+            REPLAY_WRITER.start(RACE_REPLAY_PATH, self.simulation)
+
+    def update(self):
+        """Moves both cars according to user key presses and detects collisions, once for every physics tick
+        due since the last frame, and ends the race once either car has reached the finish line.
+        """
+        if self.simulation.finished():
+            self.finish_race()
+            return
+
+        if self.state.game_info.started:
+            controls = read_controls()
+            for _ in range(self.timestep.advance()):
+                REPLAY_WRITER.record(controls)
+                self.simulation.step(controls)
+                if self.simulation.finished():
+                    break
+
+    def finish_race(self):
+        """Shows who won, then starts a new race, or the high score save screen if the player won."""
+        # writes the rest of the race's replay to disk
+        REPLAY_WRITER.finish()
+
+        outcome = self.simulation.outcome
+        if outcome == WON:
+            blit_text_center(WIN, MAIN_FONT, "You Win!")
+        else:
+            blit_text_center(WIN, MAIN_FONT, "You lost!")
         pygame.display.update()
+        pygame.time.wait(2000)
 
+        self.state.reset_race()
+        if outcome == WON:
+            # simulated time, so frame rate hiccups can't change the result
+            self.stack.replace(
+                HighScoreEntryScene(self.state, self.simulation.race_time())
+            )
+        else:
+            self.stack.replace(GameScene(self.state))
+
+    def draw(self):
+        """Draws the race, only updating the parts of the window that changed once it has started."""
+        state = self.state
+        alpha = self.timestep.alpha()
+
+        # only redraws the track under last frame's cars and text during a race
+        RENDERER.begin(WIN, state.track.static_image)
+        RENDERER.add(state.computer_car.draw(WIN, alpha))
+        RENDERER.add(state.player_car.draw(WIN, alpha))
+
+        self.draw_navigation()
+
+        # race timer is drawn from pre-rendered glyphs as its digits change every frame,
+        # from the simulated time so it always matches the time that is saved
+        timer_rect = TIMER_GLYPHS.draw(
+            WIN,
+            f"Time: {self.simulation.race_time()}s",
+            (10, HEIGHT - TIMER_GLYPHS.height - 40),
+        )
+        RENDERER.add(timer_rect)
 
-def main_game_loop():
-    """Creates the game clock and initial required objects, and then runs main menu loop."""
-    clock = pygame.time.Clock()
+        time_text = render_text(
+            MAIN_FONT, f"Record: {state.track.track_record}s", (0, 0, 0)
+        )
+        RENDERER.add_overlay(WIN.blit(time_text, (10, HEIGHT - time_text.get_height())))
 
-    player_profile = PlayerProfile("default")
+        if self.ghost is not None:
+            RENDERER.add(self.ghost.draw(WIN, self.simulation.ticks, alpha))
 
-    track = Track(player_profile.last_track_id)
+        #####################################################
+        # for finding new track path
+        # draw_computer_path(click, state.computer_car, state.track, WIN)
+        #####################################################
 
-    player_car = PlayerCar(player_profile.last_car_id, track.player_start_position)
+        if not state.game_info.started:
+            # press any key to start text
+            blit_text_center(WIN, MAIN_FONT, "Press any key to start!")
+            # the start text covers the track, so the first race frame redraws the whole window
+            RENDERER.invalidate()
+            pygame.display.update()
+        else:
+            # pushes only the regions that changed this frame to the display
+            RENDERER.present()
 
-    computer_car = ComputerCar(
-        "black_car",
-        track.computer_start_position,
-        track.computer_path,
-        track.track_record,
-    )
 
-    game_info = GameInfo()
+def main_game_loop():
+    """Creates the game clock and initial required objects, and then runs the scenes, starting at the main menu."""
+    clock = pygame.time.Clock()
+
+    state = GameState(PlayerProfile("default"))
 
-    main_menu(clock, track, player_car, computer_car, game_info, player_profile)
+    # every screen is a scene, so moving between screens doesn't nest function calls
+    scenes = SceneStack()
+    scenes.push(MainMenuScene(state))
+    scenes.run(clock, FPS)
@@ -0,0 +1,257 @@
+import argparse
+import os
+import sys
+import time
+from math import hypot
+
+# keeps pygame's welcome message out of the printed path rows
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+import yaml
+
+from game.assets import load_image
+from game.distance_field import compute_distance_field, mask_to_array
+
+RIDGE_LIMIT = 128  # widest half track width the centreline can be found in, at most 255
+MARCH_STEP = 8  # distance travelled along the track between centreline samples
+SCAN_WIDTH = 128  # how far either side the centre of the track is searched for
+TOLERANCE = 3  # furthest the emitted path may stray from the traced centreline
+START_HEADING = (0.0, -1.0)  # every car starts the race facing up the screen
+FINISH_IMAGE_PATH = "assets/images//tracks/finish.png"
+PATH_FILE = "database/path.yaml"
+TRACK_FILE = "database/track.yaml"
+
+
+def drivable_area(track_image, border_mask):
+    """Returns a boolean array indexed [y, x] that is True where a car can drive.
+
+    Args:
+        track_image -- image of the track surface, transparent off the track.
+        border_mask -- collision mask of the track border.
+    """
+    surface = mask_to_array(pygame.mask.from_surface(track_image))
+    return surface & ~mask_to_array(border_mask)
+
+
+def centre_across(field, x, y, heading):
+    """Returns the point on the distance field ridge across the track from (x, y), i.e. the centre of the track.
+
+    Args:
+        field -- distance from every drivable pixel to the edge of the track, indexed [y, x].
+        x -- x co-ordinate of a point on the track.
+        y -- y co-ordinate of a point on the track.
+        heading -- (x, y) unit vector of the direction along the track.
+    """
+    height, width = field.shape
+    offsets = np.arange(-SCAN_WIDTH, SCAN_WIDTH + 1)
+    # samples a line of pixels at right angles to the heading, all at once
+    scan_x = x - heading[1] * offsets
+    scan_y = y + heading[0] * offsets
+    columns = np.rint(scan_x).astype(np.intp)
+    rows = np.rint(scan_y).astype(np.intp)
+    inside = (columns >= 0) & (columns < width) & (rows >= 0) & (rows < height)
+    values = np.zeros(len(offsets), field.dtype)
+    values[inside] = field[rows[inside], columns[inside]]
+
+    centre = SCAN_WIDTH
+    if values[centre] == 0:
+        raise ValueError(f"The centreline ran off the track at ({x:.0f}, {y:.0f}).")
+
+    # only searches the stretch of track the point is on, not a neighbouring one past a wall
+    walls = np.flatnonzero(values == 0)
+    left = walls[walls < centre].max(initial=-1) + 1
+    right = walls[walls > centre].min(initial=len(values))
+    across = values[left:right]
+    peaks = np.flatnonzero(across == across.max())
+    # the ridge can be a few pixels wide, so takes the middle of it
+    best = left + peaks[len(peaks) // 2]
+
+    return float(scan_x[best]), float(scan_y[best])
+
+
+def trace_centreline(field, start, heading=START_HEADING, step=MARCH_STEP):
+    """Follows the centre of the track from start, once round the lap and back to start.
+
+    Args:
+        field -- distance from every drivable pixel to the edge of the track, indexed [y, x].
+        start -- (x, y) point on the track to start from.
+        heading -- (x, y) unit vector of the direction of the race at start.
+        step -- distance travelled between points.
+    """
+    x, y = centre_across(field, *start, heading)
+    points = [(x, y)]
+    travelled = 0
+    # a lap can't be longer than visiting every pixel of the track
+    most_points = int(np.count_nonzero(field)) // step + 1
+
+    while len(points) < most_points:
+        ahead_x, ahead_y = centre_across(
+            field, x + heading[0] * step, y + heading[1] * step, heading
+        )
+        moved = hypot(ahead_x - x, ahead_y - y)
+        if moved == 0:
+            raise ValueError(f"The centreline stopped at ({x:.0f}, {y:.0f}).")
+        heading = ((ahead_x - x) / moved, (ahead_y - y) / moved)
+        x, y = ahead_x, ahead_y
+        points.append((x, y))
+        travelled += moved
+
+        # finished once back at the start, after getting well away from it
+        if (
+            travelled > SCAN_WIDTH * 2
+            and hypot(x - points[0][0], y - points[0][1]) <= step
+        ):
+            return points
+
+    raise ValueError("The centreline never got back to its start.")
+
+
+def simplify(points, tolerance=TOLERANCE):
+    """Returns the fewest of the points that keep the path within the tolerance of all of them.
+
+    Uses the Ramer-Douglas-Peucker algorithm.
+
+    Args:
+        points -- list of (x, y) co-ordinates of the path.
+        tolerance -- furthest the simplified path may be from any of the points.
+    """
+    points = np.asarray(points, dtype=float)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        # distance of every point in between from the straight line joining the two ends
+        segment_x, segment_y = points[last] - points[first]
+        offsets = points[first + 1 : last] - points[first]
+        length = hypot(segment_x, segment_y)
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            cross = segment_x * offsets[:, 1] - segment_y * offsets[:, 0]
+            distances = np.abs(cross) / length
+
+        furthest = int(np.argmax(distances))
+        if distances[furthest] > tolerance:
+            middle = first + 1 + furthest
+            keep[middle] = True
+            stack += [(first, middle), (middle, last)]
+
+    return [(x, y) for x, y in points[keep]]
+
+
+def extract_path(track_image, border_mask, finish_rect, computer_start):
+    """Returns the computer car path for a track, following the centre of the track from the finish line.
+
+    The path starts just ahead of the computer car and ends just past the finish line.
+
+    Args:
+        track_image -- image of the track surface, transparent off the track.
+        border_mask -- collision mask of the track border.
+        finish_rect -- rect of the finish line.
+        computer_start -- (x, y) start position of the computer car.
+    """
+    field = compute_distance_field(
+        ~drivable_area(track_image, border_mask), RIDGE_LIMIT
+    )
+    centreline = trace_centreline(field, finish_rect.center)
+
+    # carries on one step over the finish line, so the car crosses it before its path runs out
+    centreline.append(centreline[1])
+
+    # drops the stretch between the finish line and the computer car, which the car starts past
+    start_x, start_y = computer_start
+    heading_x, heading_y = START_HEADING
+
+    def behind_start(point):
+        # distance along the starting heading, negative behind the computer car
+        return (point[0] - start_x) * heading_x + (point[1] - start_y) * heading_y < 0
+
+    first = 0
+    while behind_start(centreline[first]):
+        first += 1
+
+    return [(round(x), round(y)) for x, y in simplify(centreline[first:])]
+
+
+def path_rows(track_id, points):
+    """Returns path rows formatted such that they can be copied directly into the path.yaml database file.
+
+    Args:
+        track_id -- id of the track the path is for.
+        points -- list of (x, y) co-ordinates of the path, in order.
+    """
+    return "".join(
+        f"- model: path\n  track_id: {track_id}\n  path_x: {path_x}\n  path_y: {path_y}\n\n"
+        for path_x, path_y in points
+    )
+
+
+def replace_track_path(track_id, points, path_file=PATH_FILE):
+    """Rewrites the path.yaml database file with a track's path replaced, leaving other tracks' paths in order.
+
+    Args:
+        track_id -- id of the track the path is for.
+        points -- list of (x, y) co-ordinates of the new path, in order.
+        path_file -- file path of the path.yaml database file.
+    """
+    with open(path_file) as f:
+        # rows are separated by blank lines, and other tracks' rows are kept exactly as they were
+        rows = [row for row in f.read().split("\n\n") if row.strip()]
+
+    kept = [row for row in rows if yaml.safe_load(row)[0]["track_id"] != track_id]
+    with open(path_file, "w") as f:
+        f.write("".join(f"{row.strip()}\n\n" for row in kept))
+        f.write(path_rows(track_id, points))
+
+
+def main(arguments=None):
+    """Extracts the computer car path for a track in track.yaml and prints it as path rows."""
+    parser = argparse.ArgumentParser(
+        description="Extracts a computer car path from a track's images."
+    )
+    parser.add_argument("track_id", help="id of the track in track.yaml")
+    parser.add_argument(
+        "--write",
+        action="store_true",
+        help="replace the track's path in path.yaml instead of printing it",
+    )
+    arguments = parser.parse_args(arguments)
+
+    with open(TRACK_FILE) as f:
+        tracks = [
+            item for item in yaml.safe_load(f) if item.get("model").upper() == "TRACK"
+        ]
+    track = next(
+        (item for item in tracks if item["track_id"] == arguments.track_id), None
+    )
+    if track is None:
+        parser.error(f"there is no track {arguments.track_id} in {TRACK_FILE}")
+
+    started = time.perf_counter()
+    finish_rect = load_image(FINISH_IMAGE_PATH).get_rect(
+        topleft=(track["finish_x"], track["finish_y"])
+    )
+    points = extract_path(
+        load_image(track["track_path"]),
+        pygame.mask.from_surface(load_image(track["border_path"])),
+        finish_rect,
+        (track["computer_x"], track["computer_y"]),
+    )
+    elapsed = time.perf_counter() - started
+
+    if arguments.write:
+        replace_track_path(arguments.track_id, points)
+    else:
+        print(path_rows(arguments.track_id, points), end="")
+    print(f"{len(points)} path points extracted in {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
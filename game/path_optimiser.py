@@ -0,0 +1,227 @@
+import argparse
+import copy
+import multiprocessing
+import os
+import sys
+
+# keeps pygame's welcome message out of the printed path rows
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from database import seeder
+from game.path_extraction import path_rows, replace_track_path
+from game.track import Track
+from game.waypoints import Waypoints
+
+MAX_TICKS = 5000  # races still going after this many ticks count as unfinished
+WALL_PENALTY = 100  # ticks added to a path's score per tick touching a wall
+GENERATIONS = 20
+POPULATION = 32  # candidate paths raced each generation
+ELITE_FRACTION = 0.25  # fraction of each generation the next one is bred from
+SIGMA = 6.0  # starting standard deviation of waypoint moves, in pixels
+SIGMA_DECAY = 0.93  # waypoint moves shrink by this each generation as the path settles
+
+# the RaceEvaluator used by score_path, set before the worker processes are forked so they share it
+EVALUATOR = None
+
+
+class RaceEvaluator:
+    def __init__(self, track, computer_car, max_ticks=MAX_TICKS):
+        """
+        Args:
+              track -- Track the races are on.
+              computer_car -- ComputerCar at its start position, copied for every race.
+              max_ticks -- the most ticks a race is simulated for.
+        """
+        self.track = track
+        self.computer_car = computer_car
+        self.max_ticks = max_ticks
+
+    def race(self, points):
+        """Races the computer car along a path and returns (ticks, wall_ticks, finished).
+
+        Args:
+            points -- list of (x, y) co-ordinates of the path, in order.
+        """
+        track = self.track
+        computer_car = copy.copy(self.computer_car)
+        computer_car.follow(Waypoints(points))
+
+        wall_ticks = 0
+        for tick in range(1, self.max_ticks + 1):
+            computer_car.move()
+            if computer_car.collide(track.border_mask) is not None:
+                wall_ticks += 1
+            if (
+                computer_car.collide(track.finish_mask, track.finish_x, track.finish_y)
+                is not None
+            ):
+                return tick, wall_ticks, True
+
+        return self.max_ticks, wall_ticks, False
+
+    def score(self, points):
+        """Returns the score of a path, lower is better.
+
+        Args:
+            points -- list of (x, y) co-ordinates of the path, in order.
+        """
+        ticks, wall_ticks, finished = self.race(points)
+        score = ticks + WALL_PENALTY * wall_ticks
+        if not finished:
+            # any path that finishes beats one that doesn't
+            score += self.max_ticks * (WALL_PENALTY + 1)
+        return score
+
+
+def score_path(points):
+    """Scores a path with the shared RaceEvaluator, run in the worker processes.
+
+    Args:
+        points -- list of (x, y) co-ordinates of the path, in order.
+    """
+    return EVALUATOR.score(points)
+
+
+def worker_pool(processes):
+    """Returns a process pool that inherits EVALUATOR, or None if races should run in this process.
+
+    Args:
+        processes -- number of worker processes.
+    """
+    if processes < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        # without fork every worker would have to load the track again
+        return None
+    # forked workers share the parent's decoded track masks read only, nothing is re-loaded per race
+    return multiprocessing.get_context("fork").Pool(processes)
+
+
+def optimise_path(
+    evaluator,
+    points,
+    generations=GENERATIONS,
+    population=POPULATION,
+    processes=None,
+    seed=None,
+    report=None,
+):
+    """Evolves a computer car path to finish in the fewest ticks without touching a wall,
+    and returns (points, score) of the best path found.
+
+    Each generation races a population of random variations of the mean path, then moves the mean to the
+    average of the best of them, in the manner of the cross-entropy method. The first and last points are
+    kept where they are, so the path still starts at the computer car and ends over the finish line.
+
+    Args:
+        evaluator -- RaceEvaluator for the track.
+        points -- list of (x, y) co-ordinates of the starting path, in order.
+        generations -- number of generations to evolve.
+        population -- candidate paths raced each generation.
+        processes -- number of worker processes, every core if not given.
+        seed -- random seed, so a run can be repeated.
+        report -- function called with the generation number and best score after each generation.
+    """
+    global EVALUATOR
+    EVALUATOR = evaluator
+
+    random = np.random.default_rng(seed)
+    first, last = tuple(points[0]), tuple(points[-1])
+    mean = np.array(points[1:-1], dtype=float)
+    elites = max(1, round(population * ELITE_FRACTION))
+    sigma = SIGMA
+
+    best_points = [tuple(point) for point in points]
+    best_score = evaluator.score(best_points)
+
+    pool = worker_pool(processes or os.cpu_count() or 1)
+    try:
+        for generation in range(generations):
+            moves = random.normal(0, sigma, (population,) + mean.shape)
+            # paths are stored as whole pixels, so the rounded path is the one raced
+            candidates = np.rint(mean + moves).astype(int)
+            paths = [
+                [first] + [tuple(point) for point in candidate.tolist()] + [last]
+                for candidate in candidates
+            ]
+
+            if pool is None:
+                scores = [evaluator.score(path) for path in paths]
+            else:
+                scores = pool.map(score_path, paths)
+
+            ranking = np.argsort(scores, kind="stable")
+            mean = candidates[ranking[:elites]].mean(axis=0)
+            if scores[ranking[0]] < best_score:
+                best_points, best_score = paths[ranking[0]], scores[ranking[0]]
+            sigma *= SIGMA_DECAY
+
+            if report is not None:
+                report(generation, best_score)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return best_points, best_score
+
+
+def main(arguments=None):
+    """Optimises the computer car path of a track and prints it as path rows."""
+    parser = argparse.ArgumentParser(
+        description="Optimises a track's computer car path by racing variations of it."
+    )
+    parser.add_argument("track_id", help="id of the track in track.yaml")
+    parser.add_argument("--generations", type=int, default=GENERATIONS)
+    parser.add_argument("--population", type=int, default=POPULATION)
+    parser.add_argument(
+        "--processes", type=int, help="worker processes, every core by default"
+    )
+    parser.add_argument("--seed", type=int, help="random seed, for repeatable runs")
+    parser.add_argument(
+        "--write",
+        action="store_true",
+        help="replace the track's path in path.yaml instead of printing it",
+    )
+    arguments = parser.parse_args(arguments)
+
+    # the optimiser only reads the seed data, so it never opens the player's saved database
+    seeder.open_database(":memory:")
+    track = Track(arguments.track_id)
+    evaluator = RaceEvaluator(track, track.new_computer_car())
+
+    start_points = list(track.computer_path)
+    ticks, wall_ticks, finished = evaluator.race(start_points)
+    print(
+        f"current path: {ticks} ticks, {wall_ticks} wall ticks, finished {finished}",
+        file=sys.stderr,
+    )
+
+    def report(generation, best_score):
+        print(f"generation {generation + 1}: best score {best_score}", file=sys.stderr)
+
+    points, _ = optimise_path(
+        evaluator,
+        start_points,
+        arguments.generations,
+        arguments.population,
+        arguments.processes,
+        arguments.seed,
+        report,
+    )
+    points = [(round(x), round(y)) for x, y in points]
+
+    ticks, wall_ticks, finished = evaluator.race(points)
+    print(
+        f"optimised path: {ticks} ticks, {wall_ticks} wall ticks, finished {finished}",
+        file=sys.stderr,
+    )
+
+    if arguments.write:
+        replace_track_path(arguments.track_id, points)
+    else:
+        print(path_rows(arguments.track_id, points), end="")
+
+
+if __name__ == "__main__":
+    main()
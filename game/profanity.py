@@ -0,0 +1,98 @@
+import re
+
+from database import models
+
+# characters commonly swapped in for letters to get words past a filter
+LEETSPEAK = str.maketrans(
+    {
+        "0": "o",
+        "1": "i",
+        "3": "e",
+        "4": "a",
+        "5": "s",
+        "7": "t",
+        "8": "b",
+        "9": "g",
+        "@": "a",
+        "$": "s",
+        "!": "i",
+        "|": "l",
+        "+": "t",
+    }
+)
+
+# words this short are in too many ordinary names, e.g. "ass" in "cassie", so only match a whole name
+WHOLE_NAME_LENGTH = 3
+
+
+def normalise(text):
+    """Returns the text in lower case letters only, with leetspeak swapped back to the letters it stands for.
+
+    Args:
+        text -- text to normalise.
+    """
+    return re.sub("[^a-z]", "", text.lower().translate(LEETSPEAK))
+
+
+class ProfanityFilter:
+    def __init__(self, words):
+        """
+        Args:
+              words -- iterable of profane words.
+        """
+        # an Aho-Corasick automaton, finding every word in a name in one pass over its letters
+        # for each node of the word trie, the next node for each letter
+        self.children = [{}]
+        # for each node, the node of its longest suffix that is also in the trie
+        self.fail = [0]
+        # for each node, the lengths of the words ending there, including through its fail nodes
+        self.ends = [()]
+
+        for word in words:
+            word = normalise(word)
+            if not word:
+                continue
+            node = 0
+            for letter in word:
+                if letter not in self.children[node]:
+                    self.children.append({})
+                    self.fail.append(0)
+                    self.ends.append(())
+                    self.children[node][letter] = len(self.children) - 1
+                node = self.children[node][letter]
+            self.ends[node] += (len(word),)
+
+        # fail nodes are shallower, so working breadth first sets them before they're needed
+        queue = list(self.children[0].values())
+        for node in queue:
+            for letter, child in self.children[node].items():
+                fail = self.fail[node]
+                while fail and letter not in self.children[fail]:
+                    fail = self.fail[fail]
+                self.fail[child] = self.children[fail].get(letter, 0)
+                self.ends[child] += self.ends[self.fail[child]]
+                queue.append(child)
+
+    def contains(self, text):
+        """Returns True if the text has a profane word in it, ignoring case, spacing and leetspeak.
+
+        Args:
+            text -- text to check, e.g. a username.
+        """
+        text = normalise(text)
+        node = 0
+        for letter in text:
+            while node and letter not in self.children[node]:
+                node = self.fail[node]
+            node = self.children[node].get(letter, 0)
+            for length in self.ends[node]:
+                if length > WHOLE_NAME_LENGTH or length == len(text):
+                    return True
+        return False
+
+
+def load_profanity_filter():
+    """Returns a ProfanityFilter of every word in the profanity list."""
+    return ProfanityFilter(
+        x.word for x in models.Profanity.select(models.Profanity.word)
+    )
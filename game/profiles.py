@@ -1,12 +1,21 @@
 import pygame
 
 from database import models
+from database.writer import WRITER
 
 
 class PlayerProfile:
-    def __init__(self, username):
+    def __init__(self, username, lookup_profile=None):
+        """
+        Args:
+              username -- username of the profile.
+              lookup_profile -- the profile's Profile row, looked up by username if not given.
+        """
         self.username = username
-        lookup_profile = models.Profile.get(models.Profile.username == username)
+        if lookup_profile is None:
+            # changes to the profile may still be waiting to be written
+            WRITER.flush()
+            lookup_profile = models.Profile.get(models.Profile.username == username)
         self.mute = lookup_profile.mute
         self.last_car_id = lookup_profile.last_car_id
         self.last_track_id = lookup_profile.last_track_id
@@ -22,9 +31,7 @@ class PlayerProfile:
 
         if self.username != "default":
             # updates the players mute preference in the database if the player is not using the default profile.
-            models.Profile.update(mute=self.mute).where(
-                models.Profile.username == self.username
-            )
+            WRITER.update(models.Profile, self.username, mute=self.mute)
 
     def update_last_car_id(self, car_id):
         """Updates the player's last used car, providing that the player isn't using the default profile.
@@ -36,9 +43,7 @@ class PlayerProfile:
 
         if self.username != "default":
             # updates the player's car prerference in the database when if the player is not using the default profile.
-            models.Profile.update(last_car_id=car_id).where(
-                models.Profile.username == self.username
-            )
+            WRITER.update(models.Profile, self.username, last_car_id=car_id)
 
     def update_last_track_id(self, track_id):
         """Updates the player's last chosen track, providing that the player isn't using the default profile.
@@ -50,6 +55,4 @@ class PlayerProfile:
 
         if self.username != "default":
             # updates the player's track preference in the database when if the player is not using the default profile.
-            models.Profile.update(last_track_id=track_id).where(
-                models.Profile.username == self.username
-            )
+            WRITER.update(models.Profile, self.username, last_track_id=track_id)
@@ -0,0 +1,196 @@
+from array import array
+from bisect import bisect_right
+from math import ceil, hypot
+
+SAMPLES_PER_SEGMENT = (
+    16  # points sampled along the spline between each pair of waypoints
+)
+MAX_SPACING = 60  # longest gap between points the spline is fitted through
+SPLINE_ALPHA = (
+    0.5  # knot spacing exponent, 0.5 gives the centripetal Catmull-Rom spline
+)
+SEARCH_ITERATIONS = 16  # binary search steps used to find the nearest point on the line
+
+
+def catmull_rom_segment(p0, p1, p2, p3, samples):
+    """Returns points along the centripetal Catmull-Rom spline from p1 to p2, excluding p2.
+
+    Args:
+        p0 -- (x, y) waypoint before the segment.
+        p1 -- (x, y) waypoint the segment starts at.
+        p2 -- (x, y) waypoint the segment ends at.
+        p3 -- (x, y) waypoint after the segment.
+        samples -- number of points to return.
+    """
+
+    def knot(knot_value, start, end):
+        # centripetal parameterisation spaces knots by the square root of the distance,
+        # which stops the curve forming loops or cusps at tight corners
+        return (
+            knot_value
+            + max(hypot(end[0] - start[0], end[1] - start[1]), 1e-6) ** SPLINE_ALPHA
+        )
+
+    def blend(start, end, start_knot, end_knot, knot_value):
+        start_weight = (end_knot - knot_value) / (end_knot - start_knot)
+        end_weight = (knot_value - start_knot) / (end_knot - start_knot)
+        return (
+            start_weight * start[0] + end_weight * end[0],
+            start_weight * start[1] + end_weight * end[1],
+        )
+
+    t0 = 0.0
+    t1 = knot(t0, p0, p1)
+    t2 = knot(t1, p1, p2)
+    t3 = knot(t2, p2, p3)
+
+    points = []
+    for sample in range(samples):
+        t = t1 + (t2 - t1) * sample / samples
+        a1 = blend(p0, p1, t0, t1, t)
+        a2 = blend(p1, p2, t1, t2, t)
+        a3 = blend(p2, p3, t2, t3, t)
+        b1 = blend(a1, a2, t0, t2, t)
+        b2 = blend(a2, a3, t1, t3, t)
+        points.append(blend(b1, b2, t1, t2, t))
+    return points
+
+
+class RacingLine:
+    def __init__(self, waypoints, samples_per_segment=SAMPLES_PER_SEGMENT):
+        """
+        Args:
+              waypoints -- iterable of (x, y) co-ordinates the line passes through, in order.
+              samples_per_segment -- points sampled along the spline between each pair of waypoints.
+        """
+        points = []
+        for point in waypoints:
+            # repeated points would give a segment with no direction
+            if points and tuple(point) == points[-1]:
+                continue
+            if points:
+                # splits long straights, so the curve only rounds off corners
+                # instead of bowing out along the whole length of a straight
+                last_x, last_y = points[-1]
+                gaps = ceil(hypot(point[0] - last_x, point[1] - last_y) / MAX_SPACING)
+                for gap in range(1, gaps):
+                    points.append(
+                        (
+                            last_x + (point[0] - last_x) * gap / gaps,
+                            last_y + (point[1] - last_y) * gap / gaps,
+                        )
+                    )
+            points.append(tuple(point))
+
+        # a path with no points, e.g. a track whose path hasn't been generated yet, gives a line of no length
+        samples = points[:1]
+        if len(points) > 1:
+            # extends the path by one point at each end so the first and last segments are curved too
+            first = (2 * points[0][0] - points[1][0], 2 * points[0][1] - points[1][1])
+            last = (
+                2 * points[-1][0] - points[-2][0],
+                2 * points[-1][1] - points[-2][1],
+            )
+            extended = [first] + points + [last]
+            samples = []
+            for index in range(1, len(extended) - 2):
+                samples += catmull_rom_segment(
+                    *extended[index - 1 : index + 3], samples_per_segment
+                )
+            samples.append(points[-1])
+
+        self.x = array("d", (x for x, _ in samples))
+        self.y = array("d", (y for _, y in samples))
+
+        # arc length table, the distance along the line to each sample
+        self.distances = array("d", [0.0] * len(samples[:1]))
+        for index in range(1, len(samples)):
+            self.distances.append(
+                self.distances[-1]
+                + hypot(
+                    self.x[index] - self.x[index - 1], self.y[index] - self.y[index - 1]
+                )
+            )
+        self.length = self.distances[-1] if samples else 0.0
+        self.last_segment = max(0, len(self.x) - 2)
+
+    def segment_at(self, distance):
+        """Returns the index of the sample starting the stretch of line a distance along it.
+
+        Args:
+            distance -- distance along the line.
+        """
+        # binary search of the arc length table
+        return max(
+            0, min(bisect_right(self.distances, distance) - 1, self.last_segment)
+        )
+
+    def locate(self, distance):
+        """Returns the index of the sample starting the stretch of line a distance along it, and the (x, y)
+        point at that distance, clamped to the ends of the line.
+
+        Args:
+            distance -- distance along the line.
+        """
+        distance = max(0.0, min(distance, self.length))
+        index = self.segment_at(distance)
+        distances = self.distances
+        segment_length = distances[index + 1] - distances[index]
+        fraction = 0.0
+        if segment_length > 0:
+            fraction = (distance - distances[index]) / segment_length
+
+        return (
+            index,
+            self.x[index] + (self.x[index + 1] - self.x[index]) * fraction,
+            self.y[index] + (self.y[index + 1] - self.y[index]) * fraction,
+        )
+
+    def position_at(self, distance):
+        """Returns the (x, y) point a distance along the line, clamped to its ends.
+
+        Args:
+            distance -- distance along the line.
+        """
+        if len(self.x) == 1:
+            return self.x[0], self.y[0]
+
+        _, x, y = self.locate(distance)
+        return x, y
+
+    def nearest(self, x, y, start, search_distance):
+        """Returns the distance along the line of the point nearest to (x, y), searching forwards from start.
+
+        Args:
+            x -- x co-ordinate of the point.
+            y -- y co-ordinate of the point.
+            start -- distance along the line to search from, e.g. where the car was last tick.
+            search_distance -- how far past start the nearest point could be.
+        """
+        if len(self.x) < 2:
+            return 0.0
+
+        line_xs, line_ys = self.x, self.y
+
+        def past(distance):
+            # whether the line has already passed the point at this distance, i.e. is heading away from it
+            index, line_x, line_y = self.locate(distance)
+            direction_x = line_xs[index + 1] - line_xs[index]
+            direction_y = line_ys[index + 1] - line_ys[index]
+            return (line_x - x) * direction_x + (line_y - y) * direction_y > 0
+
+        low = max(0.0, min(start, self.length))
+        high = min(low + search_distance, self.length)
+        if past(low):
+            return low
+        if not past(high):
+            return high
+
+        # binary search over arc length for where the line stops approaching the point
+        for _ in range(SEARCH_ITERATIONS):
+            middle = (low + high) / 2
+            if past(middle):
+                high = middle
+            else:
+                low = middle
+        return low
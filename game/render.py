@@ -0,0 +1,73 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    def __init__(self):
+        self.background = None
+        self.previous_rects = []
+        self.rects = []
+        self.previous_overlay_rects = []
+        self.overlay_rects = []
+        self.full_update = True
+
+    def invalidate(self):
+        """Redraws and updates the whole window on the next frame, e.g. after a menu or message was drawn."""
+        self.full_update = True
+        self.previous_rects = []
+        self.rects = []
+        self.previous_overlay_rects = []
+        self.overlay_rects = []
+
+    def begin(self, win, background):
+        """Restores the background under everything that was drawn last frame.
+
+        Args:
+            win -- window, or surface, being drawn on.
+            background -- static surface drawn behind everything else.
+        """
+        if background is not self.background:
+            # a new background, e.g. after a track change, needs the whole window redrawing
+            self.background = background
+            self.invalidate()
+
+        if self.full_update:
+            win.blit(background, (0, 0))
+        else:
+            # only restores the background where sprites and overlays were drawn last frame
+            for rect in self.previous_rects + self.previous_overlay_rects:
+                win.blit(background, rect, rect)
+
+    def add(self, rect):
+        """Marks a region of the window as changed this frame.
+
+        Args:
+            rect -- rectangle that was drawn to.
+        """
+        if rect:
+            self.rects.append(pygame.Rect(rect))
+
+    def add_overlay(self, rect):
+        """Marks a region that is redrawn identically every frame, e.g. a button or label.
+
+        The background under it is restored each frame so translucent edges don't build up,
+        but it is only pushed to the display when it overlaps a changed region.
+
+        Args:
+            rect -- rectangle that was drawn to.
+        """
+        if rect:
+            self.overlay_rects.append(pygame.Rect(rect))
+
+    def present(self):
+        """Pushes the changed regions of the window to the display."""
+        if self.full_update:
+            pygame.display.update()
+        else:
+            # old regions are included so the background restored over them is shown
+            pygame.display.update(self.previous_rects + self.rects)
+
+        self.previous_rects = self.rects
+        self.rects = []
+        self.previous_overlay_rects = self.overlay_rects
+        self.overlay_rects = []
+        self.full_update = False
@@ -0,0 +1,231 @@
+import os
+import struct
+
+from game.cars import ComputerCar, PlayerCar
+from game.simulation import RACING, TICK_RATE, Simulation
+from game.track import Track
+from game.waypoints import Waypoints
+
+REPLAY_MAGIC = b"TSRP"
+REPLAY_VERSION = 2
+# version 1 replays don't store the track layout, so are played back on the track as it is now
+READABLE_VERSIONS = (1, 2)
+BUFFER_SIZE = 64 * 1024  # bytes buffered before a replay is written to disk
+
+HEADER = struct.Struct("<4sBB")  # magic, version, tick rate
+STATS = struct.Struct("<3d")  # max_vel, rotation_vel, acceleration
+# player start x/y, computer start x/y, finish line x/y
+POSITIONS = struct.Struct("<6d")
+POINT_COUNT = struct.Struct("<I")  # number of computer path waypoints
+POINT = struct.Struct("<2d")  # x, y of one waypoint
+
+# one byte per tick with a bit for each arrow key
+LEFT, RIGHT, UP, DOWN = 1, 2, 4, 8
+CONTROL_BYTES = [bytes([value]) for value in range(16)]
+DECODED_CONTROLS = [
+    (bool(value & LEFT), bool(value & RIGHT), bool(value & UP), bool(value & DOWN))
+    for value in range(16)
+]
+
+
+def encode_controls(controls):
+    """Packs a (left, right, up, down) controls tuple into a single value.
+
+    Args:
+        controls -- (left, right, up, down) tuple of which arrow keys are pressed.
+    """
+    left, right, up, down = controls
+    return (
+        (LEFT if left else 0)
+        | (RIGHT if right else 0)
+        | (UP if up else 0)
+        | (DOWN if down else 0)
+    )
+
+
+def write_text(replay_file, text):
+    """Writes a length prefixed utf-8 string.
+
+    Args:
+        replay_file -- binary file being written.
+        text -- string to write.
+    """
+    encoded = text.encode("utf-8")
+    replay_file.write(bytes([len(encoded)]) + encoded)
+
+
+def read_text(data, offset):
+    """Reads a length prefixed utf-8 string and returns it with the offset of the next field.
+
+    Args:
+        data -- replay file contents.
+        offset -- position of the string's length byte.
+    """
+    length = data[offset]
+    start = offset + 1
+    return data[start : start + length].decode("utf-8"), start + length
+
+
+class ReplayWriter:
+    def __init__(self):
+        self.replay_file = None
+
+    def start(self, path, simulation):
+        """Starts recording a new race, closing any race that was still being recorded.
+
+        Args:
+            path -- file path the replay is written to.
+            simulation -- Simulation of the race being recorded.
+        """
+        self.finish()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.replay_file = open(path, "wb", buffering=BUFFER_SIZE)
+        self.replay_file.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, TICK_RATE))
+        track = simulation.track
+        write_text(self.replay_file, track.track_id)
+        for car in [simulation.player_car, simulation.computer_car]:
+            # the car stats are stored so a replay plays back the same if the database changes
+            write_text(self.replay_file, car.car_id)
+            self.replay_file.write(
+                STATS.pack(car.max_vel, car.rotation_vel, car.acceleration)
+            )
+
+        # so is the track layout, which the path tools rewrite
+        self.replay_file.write(
+            POSITIONS.pack(
+                *simulation.player_car.start_position,
+                *simulation.computer_car.start_position,
+                track.finish_x,
+                track.finish_y,
+            )
+        )
+        path = simulation.computer_car.path
+        self.replay_file.write(POINT_COUNT.pack(len(path)))
+        for point in path:
+            self.replay_file.write(POINT.pack(*point))
+
+    def record(self, controls):
+        """Records the controls for one tick.
+
+        Args:
+            controls -- (left, right, up, down) tuple of which arrow keys are pressed.
+        """
+        if self.replay_file is not None:
+            # appends to the file buffer, so is only written to disk every few thousand ticks
+            self.replay_file.write(CONTROL_BYTES[encode_controls(controls)])
+
+    def finish(self):
+        """Flushes and closes the current replay."""
+        if self.replay_file is not None:
+            self.replay_file.close()
+            self.replay_file = None
+
+
+class Replay:
+    def __init__(self, path):
+        """
+        Args:
+              path -- file path of the replay to load.
+        """
+        with open(path, "rb") as replay_file:
+            data = replay_file.read()
+
+        magic, version, self.tick_rate = HEADER.unpack_from(data, 0)
+        if magic != REPLAY_MAGIC or version not in READABLE_VERSIONS:
+            raise ValueError(f"{path} is not a version {REPLAY_VERSION} replay.")
+
+        self.track_id, offset = read_text(data, HEADER.size)
+        self.player_car_id, offset = read_text(data, offset)
+        self.player_stats = STATS.unpack_from(data, offset)
+        self.computer_car_id, offset = read_text(data, offset + STATS.size)
+        self.computer_stats = STATS.unpack_from(data, offset)
+        offset += STATS.size
+
+        # the track layout the race was recorded on, None if it wasn't stored
+        self.positions = None
+        self.computer_path = None
+        if version >= 2:
+            self.positions = POSITIONS.unpack_from(data, offset)
+            offset += POSITIONS.size
+            (point_count,) = POINT_COUNT.unpack_from(data, offset)
+            offset += POINT_COUNT.size
+            end = offset + point_count * POINT.size
+            self.computer_path = list(POINT.iter_unpack(data[offset:end]))
+            offset = end
+
+        # the rest of the file is one byte of controls per tick
+        self.controls = data[offset:]
+
+    def __len__(self):
+        return len(self.controls)
+
+    def controls_at(self, tick):
+        """Returns the (left, right, up, down) controls recorded for a tick, or no controls after the end.
+
+        Args:
+            tick -- tick number, starting from 0.
+        """
+        if tick < len(self.controls):
+            return DECODED_CONTROLS[self.controls[tick]]
+        return DECODED_CONTROLS[0]
+
+    def simulation(self):
+        """Returns a new Simulation set up exactly as the recorded race started."""
+        track = Track(self.track_id)
+        player_start = track.player_start_position
+        computer_start = track.computer_start_position
+        computer_path = track.computer_path
+        if self.positions is not None:
+            # races on the layout that was recorded, even if the track has been changed since
+            player_x, player_y, computer_x, computer_y, finish_x, finish_y = (
+                self.positions
+            )
+            player_start = (player_x, player_y)
+            computer_start = (computer_x, computer_y)
+            track.finish_x, track.finish_y = finish_x, finish_y
+            track.finish_position = (finish_x, finish_y)
+            computer_path = Waypoints(self.computer_path)
+
+        player_car = PlayerCar(self.player_car_id, player_start)
+        player_car.max_vel, player_car.rotation_vel, player_car.acceleration = (
+            self.player_stats
+        )
+
+        computer_car = ComputerCar(
+            self.computer_car_id, computer_start, computer_path, track.track_record
+        )
+        computer_car.max_vel, computer_car.rotation_vel, computer_car.acceleration = (
+            self.computer_stats
+        )
+        # the computer car's speed is set from its stats when it is created
+        computer_car.vel = computer_car.max_vel // 1.25
+
+        return Simulation(track, player_car, computer_car)
+
+
+def play_replay(replay, simulation=None, ticks=None):
+    """Re-simulates a recorded race as fast as possible and returns the simulation.
+
+    Calling again with the returned simulation continues the playback, so it can be
+    shown at any speed by choosing how many ticks to play each frame.
+
+    Args:
+        replay -- the Replay to play back.
+        simulation -- simulation to continue, a new one is started if not given.
+        ticks -- the most ticks to play, plays to the end of the race if not given.
+    """
+    if simulation is None:
+        simulation = replay.simulation()
+
+    end_tick = len(replay)
+    if ticks is not None:
+        end_tick = min(end_tick, simulation.ticks + ticks)
+
+    while simulation.outcome == RACING and simulation.ticks < end_tick:
+        simulation.step(replay.controls_at(simulation.ticks))
+
+    return simulation
@@ -0,0 +1,137 @@
+import pygame
+
+IDLE_TIMEOUT = 1000  # longest a static scene waits for input, in milliseconds
+
+
+class Scene:
+    """A screen of the game, e.g. a menu or a race, run by a SceneStack one frame at a time."""
+
+    def __init__(self):
+        self.stack = None  # the SceneStack running this scene, set when it is pushed
+
+    def animating(self):
+        """Returns True if the scene changes every frame, rather than only on input or timer events."""
+        return False
+
+    def handle_events(self, events):
+        """Responds to the input events since the last frame.
+
+        Args:
+            events -- list of pygame events.
+        """
+
+    def update(self):
+        """Moves the scene on by one frame."""
+
+    def draw(self):
+        """Draws the scene and pushes it to the display."""
+
+    def resume(self):
+        """Called when the scene is back on top of the stack after the scene above it was popped."""
+
+
+class SceneStack:
+    def __init__(self, idle_timeout=IDLE_TIMEOUT):
+        """
+        Args:
+              idle_timeout -- longest a static scene waits for input, in milliseconds.
+        """
+        self.scenes = []
+        self.idle_timeout = idle_timeout
+        self.active_frames = 0  # frames that were drawn
+        self.idle_frames = 0  # waits for input that timed out without anything to draw
+        self.changed = False  # whether the scenes changed during the last frame
+
+    def top(self):
+        """Returns the scene currently being run, or None if the stack is empty."""
+        if not self.scenes:
+            return None
+        return self.scenes[-1]
+
+    def push(self, scene):
+        """Runs a scene on top of the current one, which carries on when it is popped.
+
+        Args:
+            scene -- Scene to run.
+        """
+        scene.stack = self
+        self.scenes.append(scene)
+        self.changed = True
+
+    def pop(self):
+        """Ends the current scene and goes back to the one below it."""
+        self.scenes.pop()
+        self.changed = True
+        if self.scenes:
+            self.scenes[-1].resume()
+
+    def replace(self, scene):
+        """Ends the current scene and runs another in its place.
+
+        Args:
+            scene -- Scene to run.
+        """
+        self.scenes.pop()
+        self.push(scene)
+
+    def pop_to_root(self):
+        """Ends every scene above the first one, e.g. to go back to the main menu."""
+        del self.scenes[1:]
+        self.changed = True
+        self.scenes[0].resume()
+
+    def step(self, events):
+        """Runs one frame of the current scene.
+
+        Args:
+            events -- list of pygame events since the last frame.
+        """
+        self.changed = False
+        self.top().handle_events(events)
+        # the events may have moved to another scene, which then runs the rest of the frame
+        if self.scenes:
+            self.top().update()
+        if self.scenes:
+            self.top().draw()
+
+    def run(self, clock, fps):
+        """Runs the current scene until the stack is empty.
+
+        Scenes change by pushing, popping, or replacing scenes on the stack rather than calling each other,
+        so however many times the player moves between screens the call stack stays the same depth.
+
+        Animating scenes are run every frame. Static scenes look the same until something happens, so once
+        the scenes have stopped changing the loop sleeps until there is input or a pygame timer event, and
+        only then runs and redraws them.
+
+        Args:
+            clock -- pygame clock.
+            fps -- most frames per second to run at.
+        """
+        # the first scene has to be drawn before there is any input
+        events = pygame.event.get()
+
+        while self.scenes:
+            self.step(events)
+            self.active_frames += 1
+            if not self.scenes:
+                break
+
+            if self.changed or self.top().animating():
+                # a scene that was just moved to is run again straight away, as it may move on by itself
+                clock.tick(fps)
+                events = pygame.event.get()
+            else:
+                event = self.wait_for_event()
+                # input can arrive faster than it's worth drawing frames for it
+                clock.tick(fps)
+                events = [event] + pygame.event.get()
+
+    def wait_for_event(self):
+        """Sleeps until there is an input or timer event, and returns it."""
+        # blocks instead of drawing the same frame again, so a menu left open uses next to no CPU
+        event = pygame.event.wait(self.idle_timeout)
+        while event.type == pygame.NOEVENT:
+            self.idle_frames += 1
+            event = pygame.event.wait(self.idle_timeout)
+        return event
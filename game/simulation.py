@@ -0,0 +1,164 @@
+import os
+import time
+
+import pygame
+
+TICK_RATE = 30  # physics ticks per second of race time
+MAX_FRAME_TIME = (
+    0.25  # longest frame caught up on at once, so a long stall can't freeze the game
+)
+
+# race outcomes returned by each simulation step
+RACING = "racing"
+WON = "won"
+LOST = "lost"
+
+NO_CONTROLS = (False, False, False, False)
+
+
+def init_headless():
+    """Initialises pygame without a window or audio, so races can be simulated without a display."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.display.init()
+
+
+def read_controls():
+    """Returns the (left, right, up, down) tuple of which arrow keys are currently pressed."""
+    keys = pygame.key.get_pressed()
+    return (
+        keys[pygame.K_LEFT],
+        keys[pygame.K_RIGHT],
+        keys[pygame.K_UP],
+        keys[pygame.K_DOWN],
+    )
+
+
+class FixedTimestep:
+    def __init__(self, tick_rate=TICK_RATE):
+        """
+        Args:
+              tick_rate -- physics ticks per second, independent of the frame rate.
+        """
+        self.tick_length = 1 / tick_rate
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def reset(self):
+        """Discards any time waiting to be simulated, e.g. when a race starts."""
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+
+    def advance(self, frame_time=None):
+        """Adds the time since the last frame and returns how many physics ticks are now due.
+
+        Args:
+            frame_time -- seconds since the last frame, measured with the monotonic clock if not given.
+        """
+        if frame_time is None:
+            now = time.perf_counter()
+            if self.last_time is None:
+                self.last_time = now
+            frame_time = now - self.last_time
+            self.last_time = now
+
+        self.accumulator += min(frame_time, MAX_FRAME_TIME)
+        ticks = int(self.accumulator / self.tick_length)
+        self.accumulator -= ticks * self.tick_length
+        return ticks
+
+    def alpha(self):
+        """Returns how far, from 0 to 1, the current frame is between the last tick and the next."""
+        return self.accumulator / self.tick_length
+
+
+class Simulation:
+    def __init__(self, track, player_car, computer_car):
+        """
+        Args:
+              track -- current Track object.
+              player_car -- current PlayerCar object.
+              computer_car -- current ComputerCar object.
+        """
+        self.track = track
+        self.player_car = player_car
+        self.computer_car = computer_car
+        self.ticks = 0
+        self.outcome = RACING
+        self.wall_contact = (
+            False  # whether the player car hit the track wall on the last tick
+        )
+
+    def step(self, controls):
+        """Moves both cars by one tick and returns the race outcome.
+
+        Args:
+            controls -- (left, right, up, down) tuple of which arrow keys the player is pressing.
+        """
+        # keeps the poses from the start of the tick for collision sweeps and drawing
+        self.player_car.save_previous_pose()
+        self.computer_car.save_previous_pose()
+
+        # moves player car according to the controls
+        self.player_car.move_player(controls)
+        self.computer_car.move()  # moves computer car towards next point in path
+        self.ticks += 1
+
+        self.outcome = self.resolve_collisions()
+        return self.outcome
+
+    def resolve_collisions(self):
+        """Handles collisions between the player car, track, and finish line, and between the computer car
+        and finish line, and returns the race outcome."""
+        track = self.track
+        player_car = self.player_car
+
+        # sweeps the player's movement through the distance field so fast cars can't tunnel through thin walls
+        contact = player_car.sweep(track.distance_field)
+
+        # bounces car is player car hits the track wall
+        self.wall_contact = (
+            contact is not None or player_car.collide(track.border_mask) is not None
+        )
+        if self.wall_contact:
+            player_car.bounce(contact)
+
+        # the race is lost if the computer car reaches the finish line
+        if (
+            self.computer_car.collide(track.finish_mask, track.finish_x, track.finish_y)
+            is not None
+        ):
+            return LOST
+
+        # checks if player car has reached finish line
+        player_finish_poi_collide = player_car.collide(
+            track.finish_mask, track.finish_x, track.finish_y
+        )
+
+        if player_finish_poi_collide is not None:
+            # bounces player car off finish line if player tries to cross it from above
+            if player_finish_poi_collide[1] == 0:
+                player_car.bounce()
+            else:
+                return WON
+
+        return RACING
+
+    def finished(self):
+        """Returns True once the race has been won or lost."""
+        return self.outcome != RACING
+
+    def race_time(self):
+        """Returns the simulated race time in seconds."""
+        return round(self.ticks / TICK_RATE, 2)
+
+    def run(self, driver, max_ticks):
+        """Steps the race as fast as possible until it is won or lost, or max_ticks is reached.
+
+        Args:
+            driver -- function taking this simulation and returning the controls for the next tick.
+            max_ticks -- the most ticks to simulate.
+        """
+        while self.outcome == RACING and self.ticks < max_ticks:
+            self.step(driver(self))
+        return self.outcome
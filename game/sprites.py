@@ -0,0 +1,72 @@
+import pygame
+
+ROTATION_STEP = 1  # degrees between each pre-rotated sprite
+
+
+class RotationAtlas:
+    def __init__(self, image, step=ROTATION_STEP):
+        """
+        Args:
+              image -- unrotated image to build the atlas from.
+              step -- angular resolution of the atlas in degrees, must divide 360.
+        """
+        if 360 % step:
+            raise ValueError(f"Rotation step {step} does not divide 360 degrees.")
+
+        self.step = step
+        self.entries = []
+
+        centre = image.get_rect().center
+        for index in range(int(360 // step)):
+            rotated_image = pygame.transform.rotate(image, index * step)
+            # offset from the unrotated top left corner that keeps the rotated image centred
+            offset = rotated_image.get_rect(center=centre).topleft
+            # collision mask matching the rotated image, so hitboxes match what is drawn
+            rotated_mask = pygame.mask.from_surface(rotated_image)
+            self.entries.append((rotated_image, offset, rotated_mask))
+
+    def index(self, angle):
+        """Returns the index of the pre-rotated sprite closest to the angle.
+
+        Args:
+            angle -- rotation angle in degrees.
+        """
+        return round(angle / self.step) % len(self.entries)
+
+    def lookup(self, angle):
+        """Returns the (image, offset, mask) entry for the pre-rotated sprite closest to the angle.
+
+        Args:
+            angle -- rotation angle in degrees.
+        """
+        return self.entries[self.index(angle)]
+
+    def draw(self, win, top_left, angle):
+        """Draws the sprite rotated around its centre point and returns the area drawn to.
+
+        Args:
+            win -- window, or surface, the sprite will be drawn on.
+            top_left -- (x, y) co-ordinate of the unrotated top left corner.
+            angle -- rotation angle in degrees.
+        """
+        rotated_image, (offset_x, offset_y), _ = self.lookup(angle)
+        return win.blit(rotated_image, (top_left[0] + offset_x, top_left[1] + offset_y))
+
+
+# atlases shared between every car using the same sprite
+ROTATION_ATLASES = {}
+
+
+def rotation_atlas(key, image, step=ROTATION_STEP):
+    """Returns the shared rotation atlas for a sprite, only building it the first time it is requested.
+
+    Args:
+        key -- identifier of the sprite, e.g. a car id.
+        image -- unrotated image to build the atlas from.
+        step -- angular resolution of the atlas in degrees.
+    """
+    atlas = ROTATION_ATLASES.get((key, step))
+    if atlas is None:
+        atlas = RotationAtlas(image, step)
+        ROTATION_ATLASES[(key, step)] = atlas
+    return atlas
@@ -0,0 +1,122 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    def __init__(self, max_bytes=4 * 1024 * 1024):
+        """
+        Args:
+              max_bytes -- maximum pixel memory, in bytes, used by cached text before the least recently used is evicted.
+        """
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, colour, antialias=1):
+        """Returns the rendered surface for the text, only rasterising it the first time it is requested.
+
+        Args:
+            font -- pygame font the text is rendered in.
+            text -- the text to be rendered.
+            colour -- text colour.
+            antialias -- whether the text is antialiased.
+        """
+        key = (font, text, tuple(colour), bool(antialias))
+
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            # marks the text as most recently used
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, colour)
+        self.surfaces[key] = surface
+        self.size += surface.get_pitch() * surface.get_height()
+
+        # evicts least recently used text until the cache is back under its memory limit
+        while self.size > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.size -= evicted.get_pitch() * evicted.get_height()
+
+        return surface
+
+    def clear(self):
+        """Empties the cache and resets the hit and miss counters."""
+        self.surfaces.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+
+class GlyphAtlas:
+    def __init__(self, font, colour, characters="0123456789.:s "):
+        """
+        Args:
+              font -- pygame font the glyphs are rendered in.
+              colour -- glyph colour.
+              characters -- characters rendered up front, others are added the first time they are drawn.
+        """
+        self.font = font
+        self.colour = colour
+        self.height = font.get_height()
+        self.glyphs = {}
+
+        for character in characters:
+            self.glyph(character)
+
+    def glyph(self, character):
+        """Returns the rendered surface for a single character.
+
+        Args:
+            character -- the character to look up.
+        """
+        surface = self.glyphs.get(character)
+        if surface is None:
+            surface = self.font.render(character, 1, self.colour)
+            self.glyphs[character] = surface
+        return surface
+
+    def size(self, text):
+        """Returns the (width, height) the text takes up when drawn from the atlas.
+
+        Args:
+            text -- the text to be measured.
+        """
+        return sum(self.glyph(character).get_width() for character in text), self.height
+
+    def draw(self, win, text, position):
+        """Draws text glyph by glyph and returns the rectangle it covers.
+
+        Args:
+            win -- window, or surface, the text will be drawn on.
+            text -- the text to be drawn.
+            position -- (x, y) co-ordinate of the top left corner of the text.
+        """
+        x, y = position
+        for character in text:
+            glyph = self.glyph(character)
+            win.blit(glyph, (x, y))
+            x += glyph.get_width()
+
+        return pygame.Rect(position[0], y, x - position[0], self.height)
+
+
+# process wide cache for menu titles, labels and button captions
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, colour, antialias=1):
+    """Renders text through the shared text cache.
+
+    Args:
+        font -- pygame font the text is rendered in.
+        text -- the text to be rendered.
+        colour -- text colour.
+        antialias -- whether the text is antialiased.
+    """
+    return TEXT_CACHE.render(font, text, colour, antialias)
@@ -1,7 +1,20 @@
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
 import pygame
 
 from database import models
+from game.assets import load_image
+from game.cars import ComputerCar
+from game.distance_field import load_distance_field
+from game.leaderboard import LEADERBOARD
 from game.utilities import scale_image
+from game.waypoints import Waypoints
+
+COMPUTER_CAR_ID = "black_car"  # the car the computer always races in
+TRACK_CACHE_SIZE = 5  # loaded tracks kept ready, a page of the tracks screen
 
 
 class Track:
@@ -19,40 +32,135 @@ class Track:
         self.finish_x = lookup_track.finish_x
         self.finish_y = lookup_track.finish_y
 
-        self.track_record = (
-            models.HighScore.select()
-            .where(models.HighScore.track_id == self.track_id)
-            .order_by(models.HighScore.time.asc())
-            .get()
-            .time
-        )
-        self.computer_path = (
+        self.track_record = LEADERBOARD.record(self.track_id)
+        # loaded once, so the computer car never re-runs the path query during a race
+        self.computer_path = Waypoints.from_query(
             models.Path.select(models.Path.path_x, models.Path.path_y)
             .where(models.Path.track_id == self.track_id)
             .order_by(models.Path.path_order)
         )
 
-        self.track_image = pygame.image.load(self.track_path)
-        self.border_image = pygame.image.load(self.border_path)
+        self.track_image = load_image(self.track_path)
+        self.border_image = load_image(self.border_path)
         self.border_mask = pygame.mask.from_surface(self.border_image)
-        self.background_image = pygame.image.load(self.background_path)
+        # distance from every pixel to the nearest wall, cached on disk next to the border image
+        self.distance_field = load_distance_field(self.border_path, self.border_mask)
+        self.background_image = load_image(self.background_path)
 
-        self.finish_image = pygame.image.load("assets/images//tracks/finish.png")
+        self.finish_image = load_image("assets/images//tracks/finish.png")
         self.finish_mask = pygame.mask.from_surface(self.finish_image)
         self.finish_position = (self.finish_x, self.finish_y)
 
         self.player_start_position = (self.player_x, self.player_y)
         self.computer_start_position = (self.computer_x, self.computer_y)
 
+        self.static_image = self.bake_layers()
+
+    def new_computer_car(self, path=None):
+        """Returns a computer car at its start position on the track, ready to race.
+
+        Args:
+            path -- Waypoints for the car to follow, the track's computer path if not given.
+        """
+        if path is None:
+            path = self.computer_path
+        return ComputerCar(
+            COMPUTER_CAR_ID, self.computer_start_position, path, self.track_record
+        )
+
+    def bake_layers(self):
+        """Composites the track layers, which never change during a race, into a single surface."""
+        static_image = pygame.Surface(self.background_image.get_size())
+        static_image.blit(self.background_image, (0, 0))  # draws track background
+        static_image.blit(self.track_image, (0, 0))  # draws track
+        static_image.blit(self.finish_image, self.finish_position)  # draws finish line
+        static_image.blit(
+            self.border_image, (0, 0)
+        )  # draws track border for collision detection
+
+        if pygame.display.get_surface() is not None:
+            # converts to the display pixel format so the layer blits without conversion
+            static_image = static_image.convert()
+
+        return static_image
+
     def draw_track(self, win):
         """Draws the track in the game window.
 
         Args:
             win -- window, or surface, the track will be drawn on.
         """
-        win.blit(self.background_image, (0, 0))  # draws track background
-        win.blit(self.track_image, (0, 0))  # draws track
-        win.blit(self.finish_image, self.finish_position)  # draws finish line
-        win.blit(
-            self.border_image, (0, 0)
-        )  # draws track border for collision detection
+        win.blit(self.static_image, (0, 0))  # draws all track layers at once
+
+
+class TrackLoader:
+    def __init__(self, max_size=TRACK_CACHE_SIZE):
+        """
+        Args:
+              max_size -- maximum number of loaded tracks kept before the least recently used is evicted.
+        """
+        self.max_size = max_size
+        self.tracks = OrderedDict()  # track id -> Future of the Track
+        self.queue = queue.Queue()  # (track id, Future) pairs waiting to be loaded
+        self.thread = None
+
+    def prefetch(self, track_id):
+        """Starts loading a track on the loader thread, unless it is already loaded or loading, and returns the
+        Future of the Track.
+
+        Args:
+            track_id -- id of the track.
+        """
+        future = self.tracks.get(track_id)
+        if future is not None:
+            # marks the track as most recently used
+            self.tracks.move_to_end(track_id)
+            return future
+
+        future = Future()
+        if models.in_memory(models.Track):
+            # the loader thread's connection would have its own empty copy of the database
+            future.set_running_or_notify_cancel()
+            future.set_result(Track(track_id))
+        else:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.queue.put((track_id, future))
+
+        self.tracks[track_id] = future
+        if len(self.tracks) > self.max_size:
+            # evicts the least recently used track, and skips loading it if it hasn't started yet
+            _, evicted = self.tracks.popitem(last=False)
+            evicted.cancel()
+        return future
+
+    def load(self, track_id):
+        """Returns a track, waiting for it if it is still loading, or loading it now if it was never prefetched.
+
+        Args:
+            track_id -- id of the track.
+        """
+        future = self.prefetch(track_id)
+        try:
+            return future.result()
+        except Exception:
+            # lets the track be loaded again, rather than failing the same way every time
+            self.tracks.pop(track_id, None)
+            raise
+
+    def run(self):
+        """Loads the tracks that were prefetched, in order, for as long as the game runs."""
+        while True:
+            track_id, future = self.queue.get()
+            if not future.set_running_or_notify_cancel():
+                # evicted before it was loaded
+                continue
+            try:
+                future.set_result(Track(track_id))
+            except Exception as exception:
+                future.set_exception(exception)
+
+
+# loads tracks ahead of the player choosing them, so switching track is instant
+TRACK_LOADER = TrackLoader()
@@ -1,5 +1,7 @@
 import pygame
 
+from game.text import render_text
+
 
 def scale_image(image, factor):
     """Scales an image by the passed in scale factor.
@@ -15,7 +17,7 @@ def scale_image(image, factor):
 
 
 def blit_rotate_center(win, image, top_left, angle):
-    """Rotates an image around its centre point, rather than around the top left corner.
+    """Rotates an image around its centre point, rather than around the top left corner, and returns the area drawn to.
 
     Args:
         win -- window, or surface, the image will be drawn on.
@@ -27,8 +29,8 @@ def blit_rotate_center(win, image, top_left, angle):
     rotated_image = pygame.transform.rotate(image, angle)
     # new rect adjusting centre  to the centre of the image before rotation
     new_rect = rotated_image.get_rect(center=image.get_rect(topleft=top_left).center)
-    # draws image onto new rect
-    win.blit(rotated_image, new_rect.topleft)
+    # draws image onto new rect and returns the area drawn to
+    return win.blit(rotated_image, new_rect.topleft)
 
 
 def blit_text_center(win, font, text):
@@ -40,7 +42,7 @@ def blit_text_center(win, font, text):
         text -- the text to be printed on the window.
     """
     # renders grey text  in passed in font
-    render = font.render(text, 1, (0, 0, 0))
+    render = render_text(font, text, (0, 0, 0))
     # draws text onto the centre of the game window
     win.blit(
         render,
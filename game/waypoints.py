@@ -0,0 +1,37 @@
+from array import array
+
+from game.racing_line import RacingLine
+
+
+class Waypoints:
+    def __init__(self, points):
+        """
+        Args:
+              points -- list of (x, y) co-ordinates of the path, in order.
+        """
+        # contiguous arrays, so the path is read without touching the database
+        self.x = array("d", (x for x, _ in points))
+        self.y = array("d", (y for _, y in points))
+
+        self.smoothed = None
+
+    @classmethod
+    def from_query(cls, query):
+        """Loads the waypoints from a query of Path rows.
+
+        Args:
+            query -- ordered query of models.Path rows.
+        """
+        return cls([(point.path_x, point.path_y) for point in query])
+
+    def __len__(self):
+        return len(self.x)
+
+    def __iter__(self):
+        return zip(self.x, self.y)
+
+    def racing_line(self):
+        """Returns the spline smoothed RacingLine through the waypoints, building it the first time."""
+        if self.smoothed is None:
+            self.smoothed = RacingLine(self)
+        return self.smoothed
@@ -1,12 +1,12 @@
-import os
 import unittest
 
-import yaml
 from peewee import *
 
-from database.models import Car, HighScore, Path, Profile, Track
+from database import seeder
+from database.models import Car, HighScore, Path, Profanity, Profile, Track
+from game.leaderboard import LEADERBOARD
 
-MODELS = [Car, HighScore, Path, Profile, Track]
+MODELS = [Car, HighScore, Path, Profanity, Profile, Track]
 
 
 class BaseTestCase(unittest.TestCase):
@@ -18,21 +18,6 @@ class BaseTestCase(unittest.TestCase):
         #
         test_db.connect()
         test_db.create_tables(MODELS)
-        for import_file in (x for x in os.listdir("database") if x.endswith(".yaml")):
-            with open(f"database/{import_file}") as f:
-                for item in yaml.safe_load(f):
-                    if item.get("model").upper() == "CAR":
-                        item.pop("model")
-                        Car.create(**item)
-                    elif item.get("model").upper() == "TRACK":
-                        item.pop("model")
-                        Track.create(**item)
-                    elif item.get("model").upper() == "HIGHSCORE":
-                        item.pop("model")
-                        HighScore.create(**item)
-                    elif item.get("model").upper() == "PATH":
-                        item.pop("model")
-                        Path.create(**item)
-                    elif item.get("model").upper() == "PROFILE":
-                        item.pop("model")
-                        Profile.create(**item)
+        seeder.load_seed(test_db, MODELS)
+        # scores cached from the last test's database
+        LEADERBOARD.clear()
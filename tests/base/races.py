@@ -0,0 +1,15 @@
+from game.cars import PlayerCar
+from game.simulation import Simulation
+from game.track import Track
+
+
+def new_simulation(track_id, car_id="red_car"):
+    """Creates a simulation of a fresh race on the given track.
+
+    Args:
+        track_id -- id of the track to race on.
+        car_id -- id of the player's car.
+    """
+    track = Track(track_id)
+    player_car = PlayerCar(car_id, track.player_start_position)
+    return Simulation(track, player_car, track.new_computer_car())
@@ -0,0 +1,31 @@
+from game.assets import AssetCache
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class TestAssetCache(BaseTestCase):
+    """Checks the shared image cache only decodes each image once."""
+
+    def test_if_images_are_only_loaded_once(self):
+        """Test that repeated loads of an image return the same cached surface."""
+        cache = AssetCache()
+        first = cache.load_image("assets/interface/back.png")
+        second = cache.load_image("assets/interface//back.png")
+        self.assertIs(first, second, "The cached surface was not reused.")
+        self.assertEqual(1, cache.misses, "The image was decoded more than once.")
+        self.assertEqual(1, cache.hits, "The second load was not counted as a hit.")
+
+    def test_if_lru_image_is_evicted(self):
+        """Test that the cache evicts the least recently used image when full."""
+        cache = AssetCache(max_size=2)
+        cache.load_image("assets/interface/back.png")
+        cache.load_image("assets/interface/forward.png")
+        cache.load_image("assets/interface/back.png")
+        cache.load_image("assets/interface/main-menu.png")
+        self.assertEqual(
+            2, len(cache.images), "The cache grew beyond its maximum size."
+        )
+        self.assertNotIn(
+            "assets/interface/forward.png",
+            cache.images,
+            "The least recently used image was not evicted.",
+        )
@@ -0,0 +1,90 @@
+import copy
+import random
+
+from game.batch import CarBatch, MaskTable
+from game.cars import PlayerCar
+from game.track import Track
+from game.waypoints import Waypoints
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class TestCarBatch(BaseTestCase):
+    """Checks batches of cars move and collide in the same way as single cars."""
+
+    def setUp(self):
+        super().setUp()
+        self.track = Track("track_2")
+        self.border = MaskTable(self.track.border_mask)
+        self.finish = MaskTable(
+            self.track.finish_mask, self.track.finish_x, self.track.finish_y
+        )
+
+    def test_if_batch_matches_computer_cars(self):
+        """Test that a batch steers computer cars along their paths exactly like ComputerCar."""
+        track = self.track
+        computer_car = track.new_computer_car()
+        shifted = Waypoints([(x + 3, y - 2) for x, y in track.computer_path])
+        cars = [copy.copy(computer_car) for _ in range(2)]
+        cars[1].follow(shifted)
+        batch = CarBatch(cars)
+
+        for tick in range(700):
+            batch.move_computers()
+            border_hits = batch.collide(self.border)
+            finish_hits = batch.collide(self.finish)
+            for index, car in enumerate(cars):
+                car.move()
+                self.assertAlmostEqual(
+                    car.x, batch.x[index], 6, f"x differs at {tick}."
+                )
+                self.assertAlmostEqual(
+                    car.y, batch.y[index], 6, f"y differs at {tick}."
+                )
+                self.assertAlmostEqual(
+                    car.angle, batch.angle[index], 6, f"Angle differs at {tick}."
+                )
+                self.assertEqual(
+                    car.collide(track.border_mask) is not None,
+                    border_hits[index],
+                    f"Wall test differs at {tick}.",
+                )
+                self.assertEqual(
+                    car.collide(track.finish_mask, track.finish_x, track.finish_y)
+                    is not None,
+                    finish_hits[index],
+                    f"Finish test differs at {tick}.",
+                )
+
+    def test_if_batch_matches_player_cars(self):
+        """Test that a batch drives and bounces player cars exactly like PlayerCar."""
+        cars = [
+            PlayerCar(car_id, self.track.player_start_position)
+            for car_id in ["red_car", "blue_car", "green_car"]
+        ]
+        batch = CarBatch(cars)
+        controls = random.Random(0)
+
+        for tick in range(400):
+            pressed = [
+                tuple(controls.random() < chance for chance in (0.2, 0.2, 0.7, 0.1))
+                for _ in cars
+            ]
+            batch.move_players(pressed)
+            hits = batch.collide(self.border)
+            batch.bounce(hits)
+            for index, car in enumerate(cars):
+                car.move_player(pressed[index])
+                hit = car.collide(self.track.border_mask) is not None
+                self.assertEqual(hit, hits[index], f"Wall test differs at {tick}.")
+                if hit:
+                    car.bounce()
+                self.assertEqual(
+                    (car.x, car.y, car.angle, car.vel),
+                    (
+                        batch.x[index],
+                        batch.y[index],
+                        batch.angle[index],
+                        batch.vel[index],
+                    ),
+                    f"Car {index} differs at tick {tick}.",
+                )
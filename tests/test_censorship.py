@@ -1,3 +1,5 @@
+from database import models
+from game.profanity import ProfanityFilter, load_profanity_filter
 from game.utilities import censor_word
 from tests.base.BaseTestCase import BaseTestCase
 
@@ -16,3 +18,25 @@ class TestCensorship(BaseTestCase):
         self.assertEqual(
             "if", censor_word("if"), "A 2 character string has been incorrectly mutated"
         )
+
+    def test_if_profanity_is_found_in_names(self):
+        """Test if profanity is found anywhere in a name, through case, spacing and leetspeak."""
+        profanity = ProfanityFilter(["fuck", "shit", "ass"])
+        for name in ["fuck", "xfuckx", "FuCk", "f.u.c.k", "5h1t", "ass", "A$$"]:
+            self.assertTrue(profanity.contains(name), f"{name} is not profanity.")
+        for name in ["", "lewis", "classic", "fuc"]:
+            self.assertFalse(profanity.contains(name), f"{name} is profanity.")
+
+        # none of the names that come with the game are profanity
+        profanity = load_profanity_filter()
+        self.assertTrue(
+            profanity.contains("shithead99"), "shithead99 is not profanity."
+        )
+        for item in models.HighScore.select():
+            self.assertFalse(
+                profanity.contains(item.name), f"{item.name} is profanity."
+            )
+        for item in models.Profile.select():
+            self.assertFalse(
+                profanity.contains(item.username), f"{item.username} is profanity."
+            )
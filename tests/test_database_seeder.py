@@ -1,7 +1,12 @@
 import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
 
 import yaml
 
+from database import models, seeder
 from tests.base.BaseTestCase import BaseTestCase
 
 
@@ -23,3 +28,65 @@ class TestDatabaseSeeder(BaseTestCase):
                         allowed_models,
                         f"{item.get('model')} is not a valid model type in the {import_file} seeder.",
                     )
+
+
+class TestSavedDatabase(unittest.TestCase):
+    """Test the database is kept between launches and only reseeded when it is out of date"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "track_surf.db")
+        self.seed_directory = os.path.join(self.directory.name, "seed")
+        shutil.copytree("database", self.seed_directory)
+        # the other tests bind the models to their own databases
+        models.db.bind(seeder.MODELS)
+
+    def tearDown(self):
+        models.db.close()
+        self.directory.cleanup()
+
+    def open(self):
+        return seeder.open_database(self.path, self.seed_directory)
+
+    def test_if_saved_scores_are_kept(self):
+        """Test that high scores are still there when the database is opened again, without it being reseeded."""
+        self.open()
+        self.assertEqual(models.db.pragma("journal_mode"), "wal")
+        words = models.Profanity.select().count()
+        models.HighScore.create(name="SAVED", time=1234, track_id="track_1")
+
+        self.open()
+        self.assertTrue(models.HighScore.get_or_none(name="SAVED"))
+        self.assertEqual(models.Profanity.select().count(), words)
+
+    def test_if_changed_seed_is_reloaded(self):
+        """Test that edited seed files are reloaded into the database while the player's high scores are kept."""
+        self.open()
+        cars = models.Car.select().count()
+        models.HighScore.create(name="SAVED", time=1234, track_id="track_1")
+        with open(os.path.join(self.seed_directory, "car.yaml"), "a") as f:
+            f.write(
+                "\n- model: Car\n  car_id: white_car\n  car_name: WHITE\n"
+                "  car_path: assets/images/cars/white-car.png\n"
+                "  max_vel: 4\n  rotation_vel: 4\n  acceleration: 1\n"
+            )
+
+        self.open()
+        self.assertEqual(models.Car.select().count(), cars + 1)
+        self.assertTrue(models.HighScore.get_or_none(name="SAVED"))
+
+        # a new schema version rebuilds everything from the seed files
+        models.db.user_version = seeder.SCHEMA_VERSION - 1
+        self.open()
+        self.assertIsNone(models.HighScore.get_or_none(name="SAVED"))
+
+    def test_if_seed_snapshot_is_reused(self):
+        """Test that parsed seed rows are read back from the snapshot file until a seed file changes."""
+        rows = seeder.read_seed(self.seed_directory)
+        with mock.patch.object(seeder.yaml, "load", side_effect=AssertionError):
+            self.assertEqual(seeder.read_seed(self.seed_directory), rows)
+
+        with open(os.path.join(self.seed_directory, "car.yaml"), "a") as f:
+            f.write("\n- model: Car\n  car_id: white_car\n")
+        cars = seeder.read_seed(self.seed_directory)["CAR"]
+        self.assertEqual(len(cars), len(rows["CAR"]) + 1)
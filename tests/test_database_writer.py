@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from database import models, seeder
+from database.writer import WRITER, DatabaseWriter
+from game.profiles import PlayerProfile
+
+
+class TestDatabaseWriter(unittest.TestCase):
+    """Checks rows are written on the writer thread when the database is a file"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # the other tests bind the models to their own databases
+        models.db.bind(seeder.MODELS)
+        seeder.open_database(os.path.join(self.directory.name, "track_surf.db"))
+
+    def tearDown(self):
+        WRITER.flush()
+        models.db.close()
+        self.directory.cleanup()
+
+    def test_if_queued_writes_are_merged(self):
+        """Test that queued updates to the same row are merged, and everything queued is written by flush."""
+        writer = DatabaseWriter()
+        # holding the lock keeps the thread from writing anything until everything is queued
+        with writer.condition:
+            writer.update(models.Profile, "max", mute=1)
+            writer.update(models.Profile, "max", last_car_id="blue_car")
+            for i in range(3):
+                writer.add(
+                    models.HighScore(name=f"racer {i}", time=99, track_id="track_1")
+                )
+            self.assertEqual(
+                writer.updates,
+                {(models.Profile, "max"): {"mute": 1, "last_car_id": "blue_car"}},
+            )
+        writer.flush()
+
+        self.assertTrue(
+            writer.thread.is_alive(), "The writes were not made on the thread."
+        )
+        profile = models.Profile.get(models.Profile.username == "max")
+        self.assertEqual((profile.mute, profile.last_car_id), (1, "blue_car"))
+        self.assertEqual(
+            models.HighScore.select().where(models.HighScore.time == 99).count(), 3
+        )
+
+    def test_if_profile_preferences_are_saved(self):
+        """Test that a profile's chosen car and track are saved, and read back when it is next loaded."""
+        player_profile = PlayerProfile("max")
+        player_profile.update_last_car_id("blue_car")
+        player_profile.update_last_track_id("track_2")
+
+        player_profile = PlayerProfile("max")
+        self.assertEqual(player_profile.last_car_id, "blue_car")
+        self.assertEqual(player_profile.last_track_id, "track_2")
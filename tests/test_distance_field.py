@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pygame
+
+from game import distance_field
+from game.distance_field import DistanceField, compute_distance_field
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class TestDistanceField(BaseTestCase):
+    """Checks the distance to wall field and continuous collision detection."""
+
+    def test_if_distance_field_is_correct(self):
+        """Test that the distance field matches the distance to the nearest wall pixel."""
+        walls = np.zeros((60, 80), dtype=bool)
+        walls[10, 5:70] = True
+        walls[20:50, 40] = True
+        field = compute_distance_field(walls, limit=30)
+
+        wall_y, wall_x = np.nonzero(walls)
+        for y in range(60):
+            for x in range(80):
+                nearest = np.sqrt((wall_y - y) ** 2 + (wall_x - x) ** 2).min()
+                self.assertEqual(
+                    min(int(nearest), 30),
+                    field[y, x],
+                    f"Incorrect distance at ({x}, {y}).",
+                )
+
+    def test_if_sweep_stops_tunnelling(self):
+        """Test that a fast movement straight through a thin wall reports where it first touches it."""
+        walls = np.zeros((50, 100), dtype=bool)
+        walls[:, 50] = True
+        field = DistanceField(compute_distance_field(walls))
+
+        contact = field.sweep((10, 25), (90, 25), 5)
+        self.assertIsNotNone(contact, "The movement tunnelled through the wall.")
+        self.assertAlmostEqual(
+            45, 10 + 80 * contact, delta=1, msg="The contact point is incorrect."
+        )
+        self.assertIsNone(
+            field.sweep((10, 25), (30, 25), 5), "A clear movement reported a contact."
+        )
+
+    def test_if_distance_field_is_cached(self):
+        """Test that the distance field is written next to the border image and reused."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        border_path = os.path.join(directory, "border.png")
+        shutil.copy("assets/images/tracks/track-2/track-2-border.png", border_path)
+        mask = pygame.mask.from_surface(pygame.image.load(border_path))
+
+        first = distance_field.load_distance_field(border_path, mask)
+        cached = [name for name in os.listdir(directory) if name.endswith(".npy")]
+        self.assertEqual(1, len(cached), "The distance field was not cached on disk.")
+
+        second = distance_field.load_distance_field(border_path, mask)
+        self.assertTrue(
+            np.array_equal(first.field, second.field),
+            "The cached distance field does not match.",
+        )
@@ -0,0 +1,58 @@
+import numpy as np
+
+from game.environment import OBSERVATION_SIZE, RaceEnv, VectorEnv
+from tests.base.BaseTestCase import BaseTestCase
+from tests.base.races import new_simulation
+
+FORWARD = (False, False, True, False)
+
+
+class TestRaceEnv(BaseTestCase):
+    """Checks races can be driven through the reinforcement learning environments."""
+
+    def test_if_env_drives_like_simulation(self):
+        """Test that the environment moves the car like the game and rewards driving along the track."""
+        env = RaceEnv("track_1")
+        observation = env.reset()
+        self.assertEqual(
+            (OBSERVATION_SIZE,), observation.shape, "The observation is the wrong size."
+        )
+
+        simulation = new_simulation("track_1")
+        total_reward = 0
+        for _ in range(40):
+            observation, reward, done, info = env.step(FORWARD)
+            simulation.step(FORWARD)
+            total_reward += reward
+        self.assertEqual(
+            (simulation.player_car.x, simulation.player_car.y),
+            (env.simulation.player_car.x, env.simulation.player_car.y),
+            "The car moved differently to the game.",
+        )
+        self.assertGreater(total_reward, 0, "Driving along the track wasn't rewarded.")
+        self.assertFalse(done, "The race ended early.")
+        self.assertEqual(40, info["ticks"], "The tick count is wrong.")
+
+    def test_if_vector_env_workers_match(self):
+        """Test that environments stepped in worker processes match ones stepped in this process."""
+        envs = [RaceEnv("track_2", max_ticks=20), RaceEnv("track_2", max_ticks=30)]
+        actions = np.random.default_rng(0).random((35, 2, 4)) < [0.2, 0.2, 0.8, 0.1]
+
+        results = []
+        for processes in (2, 1):
+            with VectorEnv(envs, processes) as vector_env:
+                steps = [vector_env.reset()]
+                for tick_actions in actions:
+                    steps.append(vector_env.step(tick_actions))
+            results.append(steps)
+
+        parallel, serial = results
+        np.testing.assert_array_equal(parallel[0], serial[0])
+        for parallel_step, serial_step in zip(parallel[1:], serial[1:]):
+            for parallel_array, serial_array in zip(parallel_step, serial_step):
+                np.testing.assert_array_equal(parallel_array, serial_array)
+
+        # each environment finished its race and started the next one
+        dones = np.array([step[2] for step in serial[1:]])
+        self.assertTrue(dones[19, 0] and dones[29, 1], "The races didn't end.")
+        np.testing.assert_array_equal(serial[0][0], serial[20][0][0])
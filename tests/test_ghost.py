@@ -0,0 +1,55 @@
+import shutil
+import tempfile
+
+import pygame
+
+from game import ghost
+from game.ghost import load_ghost, save_ghost
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class TestGhost(BaseTestCase):
+    """Checks record ghost traces are written and read back correctly."""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.addCleanup(setattr, ghost, "GHOST_DIRECTORY", ghost.GHOST_DIRECTORY)
+        ghost.GHOST_DIRECTORY = directory
+        self.addCleanup(ghost.OPEN_TRACES.clear)
+
+    def test_if_ghost_trace_is_read_by_tick(self):
+        """Test that any tick of a ghost trace can be read back directly."""
+        poses = [(100 + tick, 200 - tick / 2, tick * 3) for tick in range(500)]
+        save_ghost("track_1", "blue_car", poses)
+
+        record_ghost = load_ghost("track_1")
+        self.assertEqual("blue_car", record_ghost.trace.car_id, "Wrong ghost car.")
+        self.assertEqual(500, len(record_ghost.trace), "Wrong number of ticks.")
+        for tick in [0, 1, 250, 499]:
+            self.assertEqual(
+                poses[tick],
+                record_ghost.trace.pose(tick),
+                f"The pose at tick {tick} is incorrect.",
+            )
+        self.assertEqual(
+            poses[-1],
+            record_ghost.trace.pose(10000),
+            "The ghost did not stay on its last pose after the race.",
+        )
+
+        surface = pygame.Surface((800, 800))
+        self.assertTrue(record_ghost.draw(surface, 250), "The ghost was not drawn.")
+
+    def test_if_new_record_replaces_ghost(self):
+        """Test that saving a new record replaces a ghost that is already loaded."""
+        self.assertIsNone(load_ghost("track_2"), "A ghost exists before a record.")
+
+        save_ghost("track_2", "red_car", [(1, 2, 3)] * 10)
+        self.assertEqual(10, len(load_ghost("track_2").trace), "Ghost not loaded.")
+
+        save_ghost("track_2", "green_car", [(4, 5, 6)] * 20)
+        new_ghost = load_ghost("track_2")
+        self.assertEqual("green_car", new_ghost.trace.car_id, "Ghost not replaced.")
+        self.assertEqual((4, 5, 6), new_ghost.trace.pose(15), "Ghost not replaced.")
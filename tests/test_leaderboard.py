@@ -0,0 +1,60 @@
+import random
+
+from database import models
+from game.leaderboard import Leaderboard
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class TestLeaderboard(BaseTestCase):
+    """Checks the leaderboard keeps each track's scores in order as they are added."""
+
+    def setUp(self):
+        super().setUp()
+        # small enough that the later pages come from the database rather than memory
+        self.leaderboard = Leaderboard(size=8)
+        self.leaderboard.top_scores("track_1")
+
+        rng = random.Random(0)
+        for i in range(40):
+            self.leaderboard.add(f"racer {i}", rng.randint(20, 40), "track_1")
+
+    def test_if_scores_are_paged_in_order(self):
+        """Test that paging through the scores gives every score on the track once, fastest first."""
+        expected = [
+            (x.time, x.id, x.name)
+            for x in models.HighScore.select()
+            .where(models.HighScore.track_id == "track_1")
+            .order_by(models.HighScore.time, models.HighScore.id)
+        ]
+
+        scores = []
+        after = None
+        while True:
+            page = self.leaderboard.page("track_1", after, 5)
+            if not page:
+                break
+            scores += page
+            after = page[-1][:2]
+        self.assertEqual(scores, expected, "The pages are out of order.")
+
+        # the cached scores match a fresh read of the database
+        self.assertEqual(self.leaderboard.top_scores("track_1"), expected[:8])
+        self.assertEqual(Leaderboard().record("track_1"), expected[0][0])
+
+        indexes = models.HighScore._meta.database.get_indexes("high_scores")
+        self.assertIn(["track_id", "time"], [x.columns for x in indexes])
+
+    def test_if_rank_matches_scores_counted(self):
+        """Test that the rank and percentile of a time match counting the track's scores in the database."""
+        self.leaderboard.rank("track_1", 30)
+        self.leaderboard.add("racer", 30, "track_1")
+
+        scores = models.HighScore.select().where(models.HighScore.track_id == "track_1")
+        total = scores.count()
+        for time in [0, 20, 25, 30, 30.5, 40, 100]:
+            not_slower = scores.where(models.HighScore.time <= time).count()
+            self.assertEqual(self.leaderboard.rank("track_1", time), not_slower + 1)
+            self.assertAlmostEqual(
+                self.leaderboard.percentile("track_1", time),
+                100 * (total - not_slower) / total,
+            )
@@ -0,0 +1,58 @@
+import yaml
+
+from game.path_extraction import extract_path, path_rows
+from game.track import Track
+from game.waypoints import Waypoints
+from tests.base.BaseTestCase import BaseTestCase
+
+
+def track_path(track):
+    """Extracts the computer car path for a track.
+
+    Args:
+        track -- the Track to extract the path of.
+    """
+    finish_rect = track.finish_image.get_rect(topleft=track.finish_position)
+    return extract_path(
+        track.track_image,
+        track.border_mask,
+        finish_rect,
+        track.computer_start_position,
+    )
+
+
+class TestPathExtraction(BaseTestCase):
+    """Checks computer car paths are extracted from track images correctly."""
+
+    def test_if_extracted_path_finishes_race(self):
+        """Test that the computer car finishes a race on an extracted path without touching a wall."""
+        track = Track("track_2")
+        computer_car = track.new_computer_car(Waypoints(track_path(track)))
+
+        for _ in range(2000):
+            computer_car.move()
+            self.assertIsNone(
+                computer_car.collide(track.border_mask), "The car hit a wall."
+            )
+            if computer_car.collide(track.finish_mask, track.finish_x, track.finish_y):
+                break
+        else:
+            self.fail("The car never reached the finish line.")
+
+    def test_if_path_rows_load_in_order(self):
+        """Test that extracted path rows load as path models starting ahead of the computer car."""
+        track = Track("track_1")
+        points = track_path(track)
+        self.assertLessEqual(
+            points[0][1], track.computer_y, "The path starts behind the car."
+        )
+
+        rows = yaml.safe_load(path_rows("track_1", points))
+        self.assertEqual(
+            [
+                {"model": "path", "track_id": "track_1", "path_x": x, "path_y": y}
+                for x, y in points
+            ],
+            rows,
+            "The path rows are not in path.yaml format.",
+        )
@@ -0,0 +1,49 @@
+from game.path_optimiser import RaceEvaluator, optimise_path
+from game.track import Track
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class TestPathOptimiser(BaseTestCase):
+    """Checks computer car paths are optimised by racing them headlessly."""
+
+    def setUp(self):
+        super().setUp()
+        track = Track("track_2")
+        self.evaluator = RaceEvaluator(track, track.new_computer_car())
+        self.points = list(track.computer_path)
+
+    def test_if_optimised_path_is_not_slower(self):
+        """Test that the optimised path scores no worse than the path it started from."""
+        start_score = self.evaluator.score(self.points)
+        points, score = optimise_path(
+            self.evaluator,
+            self.points,
+            generations=2,
+            population=4,
+            processes=1,
+            seed=0,
+        )
+        self.assertLessEqual(score, start_score, "The optimised path is slower.")
+        self.assertEqual(score, self.evaluator.score(points), "The score is wrong.")
+        self.assertEqual(self.points[0], points[0], "The first point moved.")
+        self.assertEqual(self.points[-1], points[-1], "The last point moved.")
+
+    def test_if_worker_processes_match_serial(self):
+        """Test that races run in worker processes score paths the same as races run in this process."""
+        serial = optimise_path(
+            self.evaluator,
+            self.points,
+            generations=1,
+            population=4,
+            processes=1,
+            seed=3,
+        )
+        parallel = optimise_path(
+            self.evaluator,
+            self.points,
+            generations=1,
+            population=4,
+            processes=2,
+            seed=3,
+        )
+        self.assertEqual(serial, parallel, "The worker processes scored differently.")
@@ -0,0 +1,56 @@
+from game.racing_line import RacingLine
+from game.track import Track
+from game.waypoints import Waypoints
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class TestRacingLine(BaseTestCase):
+    """Checks the computer car's spline racing line and its arc length lookups."""
+
+    def test_if_racing_line_meets_waypoints(self):
+        """Test that the racing line passes through every waypoint of a track's path."""
+        track = Track("track_1")
+        racing_line = track.computer_path.racing_line()
+        samples = set(zip(racing_line.x, racing_line.y))
+        for point in track.computer_path:
+            self.assertIn(point, samples, f"The line misses the waypoint {point}.")
+        self.assertEqual(
+            (racing_line.x[-1], racing_line.y[-1]),
+            racing_line.position_at(racing_line.length + 100),
+            "The line does not stop at its last waypoint.",
+        )
+
+    def test_if_arc_length_lookups_are_correct(self):
+        """Test that points are found by distance along a straight line."""
+        racing_line = RacingLine([(100, 400), (100, 300), (100, 100)])
+        self.assertAlmostEqual(300, racing_line.length, 6, "The length is wrong.")
+
+        x, y = racing_line.position_at(150)
+        self.assertAlmostEqual(100, x, 6, "The point is off the line.")
+        self.assertAlmostEqual(250, y, 6, "The point is the wrong distance along.")
+
+        self.assertAlmostEqual(
+            120,
+            racing_line.nearest(110, 280, 100, 50),
+            1,
+            "The nearest point on the line is wrong.",
+        )
+        self.assertEqual(
+            100,
+            racing_line.nearest(110, 380, 100, 50),
+            "The nearest point went back along the line.",
+        )
+
+    def test_if_empty_path_leaves_car_idle(self):
+        """Test that a computer car on a track with no path yet stays at its start instead of crashing."""
+        track = Track("track_1")
+        computer_car = track.new_computer_car(Waypoints([]))
+        self.assertEqual(0, computer_car.racing_line.length, "The line has a length.")
+
+        for _ in range(10):
+            computer_car.move()
+        self.assertEqual(
+            track.computer_start_position,
+            (computer_car.x, computer_car.y),
+            "The car moved without a path.",
+        )
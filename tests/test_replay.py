@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+
+from database import models
+from game.replay import Replay, ReplayWriter, play_replay
+from tests.base.BaseTestCase import BaseTestCase
+from tests.base.races import new_simulation
+
+
+class TestReplay(BaseTestCase):
+    """Checks races are recorded and played back exactly."""
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_if_replay_plays_back_exactly(self):
+        """Test that playing back a recorded race ends in exactly the same state."""
+        simulation = new_simulation("track_1", "green_car")
+
+        path = os.path.join(self.directory, "race.tsr")
+        writer = ReplayWriter()
+        writer.start(path, simulation)
+        for tick in range(600):
+            controls = (tick % 50 < 8, 20 < tick % 70 < 30, tick % 9 != 0, False)
+            writer.record(controls)
+            simulation.step(controls)
+        writer.finish()
+
+        replay = Replay(path)
+        self.assertEqual(600, len(replay), "The replay is not a byte per tick.")
+        self.assertEqual("track_1", replay.track_id, "The track was not recorded.")
+        self.assertEqual(
+            "green_car", replay.player_car_id, "The player car was not recorded."
+        )
+
+        played_back = play_replay(replay)
+        for recorded, replayed in [
+            (simulation.player_car, played_back.player_car),
+            (simulation.computer_car, played_back.computer_car),
+        ]:
+            self.assertEqual(
+                (recorded.x, recorded.y, recorded.angle, recorded.vel),
+                (replayed.x, replayed.y, replayed.angle, replayed.vel),
+                "The replayed race did not match the recorded race.",
+            )
+
+    def test_if_replay_can_be_played_in_steps(self):
+        """Test that a replay can be played back a few ticks at a time."""
+        simulation = new_simulation("track_2")
+        path = os.path.join(self.directory, "race.tsr")
+        writer = ReplayWriter()
+        writer.start(path, simulation)
+        for _ in range(100):
+            writer.record((False, False, True, False))
+        writer.finish()
+
+        replay = Replay(path)
+        played_back = play_replay(replay, ticks=40)
+        self.assertEqual(40, played_back.ticks, "The wrong number of ticks played.")
+        play_replay(replay, played_back)
+        self.assertEqual(100, played_back.ticks, "The replay did not play to the end.")
+
+    def test_if_replay_ignores_track_changes(self):
+        """Test that a replay plays back the same after the track's path and start positions are changed."""
+        simulation = new_simulation("track_2")
+        path = os.path.join(self.directory, "race.tsr")
+        writer = ReplayWriter()
+        writer.start(path, simulation)
+        for tick in range(400):
+            controls = (tick % 30 < 5, False, True, False)
+            writer.record(controls)
+            simulation.step(controls)
+        writer.finish()
+
+        # as if the path tools had rewritten the track after the race
+        models.Path.update(path_x=models.Path.path_x + 20).where(
+            models.Path.track_id == "track_2"
+        ).execute()
+        models.Track.update(
+            player_x=models.Track.player_x + 10, computer_y=models.Track.computer_y - 10
+        ).where(models.Track.track_id == "track_2").execute()
+
+        played_back = play_replay(Replay(path))
+        for recorded, replayed in [
+            (simulation.player_car, played_back.player_car),
+            (simulation.computer_car, played_back.computer_car),
+        ]:
+            self.assertEqual(
+                (recorded.x, recorded.y, recorded.angle, recorded.vel),
+                (replayed.x, replayed.y, replayed.angle, replayed.vel),
+                "The replay was played back on the changed track.",
+            )
@@ -0,0 +1,103 @@
+import sys
+
+import pygame
+
+from game.scenes import Scene, SceneStack
+from game.simulation import init_headless
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class CountingScene(Scene):
+    """Replaces itself with a new scene every frame until it has run a number of times, then pops."""
+
+    def __init__(self, remaining, depths):
+        super().__init__()
+        self.remaining = remaining
+        self.depths = depths
+        self.resumed = 0
+
+    def update(self):
+        self.depths.append(len(self.stack.scenes))
+        if self.remaining == 0:
+            self.stack.pop()
+        else:
+            self.stack.replace(CountingScene(self.remaining - 1, self.depths))
+
+    def resume(self):
+        self.resumed += 1
+
+
+class TimerScene(Scene):
+    """Counts how many times it is drawn, and pops once it receives a timer event."""
+
+    def __init__(self):
+        super().__init__()
+        self.draws = 0
+        self.timer_fired = False
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.USEREVENT:
+                self.timer_fired = True
+                self.stack.pop()
+                return
+
+    def draw(self):
+        self.draws += 1
+
+
+class TestScenes(BaseTestCase):
+    """Checks screens change through the scene stack rather than nested calls."""
+
+    def test_if_scene_transitions_are_correct(self):
+        """Test that push, pop, replace, and pop to root leave the expected scenes, resuming the new top one."""
+        stack = SceneStack()
+        root, first, second, third = (CountingScene(0, []) for _ in range(4))
+
+        stack.push(root)
+        stack.push(first)
+        stack.push(second)
+        self.assertIs(second, stack.top(), "The pushed scene is not on top.")
+        self.assertIs(stack, second.stack, "The pushed scene doesn't know its stack.")
+
+        stack.pop()
+        self.assertIs(first, stack.top(), "Popping didn't return to the scene below.")
+        self.assertEqual(1, first.resumed, "The scene popped back to wasn't resumed.")
+
+        stack.replace(third)
+        self.assertEqual([root, third], stack.scenes, "Replacing didn't swap the top.")
+        self.assertEqual(1, first.resumed, "The replaced scene was resumed.")
+
+        stack.push(second)
+        stack.pop_to_root()
+        self.assertEqual([root], stack.scenes, "Popping to root left other scenes.")
+        self.assertEqual(1, root.resumed, "The root scene wasn't resumed.")
+
+    def test_if_scene_changes_keep_stack_flat(self):
+        """Test that changing scene many more times than the recursion limit runs without growing either stack."""
+        init_headless()
+        changes = sys.getrecursionlimit() * 2
+        depths = []
+
+        stack = SceneStack()
+        stack.push(CountingScene(changes, depths))
+        stack.run(pygame.time.Clock(), 0)
+
+        self.assertEqual(changes + 1, len(depths), "Not every scene was run.")
+        self.assertEqual({1}, set(depths), "The scene stack grew as scenes changed.")
+        self.assertIsNone(stack.top(), "The stack wasn't empty when the loop ended.")
+
+    def test_if_static_scene_waits_for_input(self):
+        """Test that a static scene isn't redrawn while it waits for an event, and is run when a timer fires."""
+        init_headless()
+        scene = TimerScene()
+
+        stack = SceneStack(idle_timeout=10)
+        stack.push(scene)
+        pygame.time.set_timer(pygame.USEREVENT, 200, loops=1)
+        stack.run(pygame.time.Clock(), 0)
+
+        self.assertEqual(1, scene.draws, "The scene was redrawn without any input.")
+        self.assertTrue(scene.timer_fired, "The scene didn't receive the timer event.")
+        self.assertGreater(stack.idle_frames, 0, "The waits for input weren't counted.")
+        self.assertEqual(2, stack.active_frames, "The scene wasn't run once per event.")
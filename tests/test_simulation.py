@@ -0,0 +1,73 @@
+from game.simulation import LOST, NO_CONTROLS, RACING, FixedTimestep
+from tests.base.BaseTestCase import BaseTestCase
+from tests.base.races import new_simulation
+
+
+class TestSimulation(BaseTestCase):
+    """Checks races can be simulated without a display."""
+
+    def test_if_computer_car_wins_against_idle_player(self):
+        """Test that the computer car finishes every track if the player doesn't move."""
+        for track_id in ["track_1", "track_2"]:
+            simulation = new_simulation(track_id)
+            outcome = simulation.run(lambda sim: NO_CONTROLS, 5000)
+            self.assertEqual(
+                LOST, outcome, f"The computer car did not finish {track_id}."
+            )
+
+    def test_if_simulation_is_deterministic(self):
+        """Test that two races given the same controls end in exactly the same state."""
+        controls = [(tick % 40 < 10, False, True, False) for tick in range(300)]
+
+        positions = []
+        for _ in range(2):
+            simulation = new_simulation("track_1")
+            for tick_controls in controls:
+                simulation.step(tick_controls)
+            car = simulation.player_car
+            positions.append((car.x, car.y, car.angle, car.vel, simulation.outcome))
+
+        self.assertEqual(
+            positions[0], positions[1], "The simulation is not repeatable."
+        )
+        self.assertEqual(RACING, positions[0][4], "The race ended unexpectedly.")
+
+    def test_if_player_cannot_leave_track(self):
+        """Test that a player accelerating straight ahead is kept inside the track walls."""
+        simulation = new_simulation("track_1")
+        for _ in range(200):
+            simulation.step((False, False, True, False))
+            car = simulation.player_car
+            self.assertGreater(
+                simulation.track.distance_field.distance(car.x + 10, car.y + 19),
+                0,
+                "The player car drove through a wall.",
+            )
+
+
+class TestFixedTimestep(BaseTestCase):
+    """Checks physics ticks are independent of the frame rate."""
+
+    def test_if_ticks_accumulate_between_frames(self):
+        """Test that short frames accumulate into ticks and long stalls are capped."""
+        timestep = FixedTimestep(30)
+        self.assertEqual(0, timestep.advance(1 / 60), "A tick ran too early.")
+        self.assertAlmostEqual(0.5, timestep.alpha(), msg="Interpolation is incorrect.")
+        self.assertEqual(1, timestep.advance(1 / 60), "A due tick did not run.")
+        self.assertEqual(7, timestep.advance(5), "A long stall was not capped.")
+
+    def test_if_race_time_ignores_frame_rate(self):
+        """Test that a race takes the same number of ticks at different frame rates."""
+        results = []
+        for fps in [12, 30, 144]:
+            simulation = new_simulation("track_2")
+            timestep = FixedTimestep(30)
+            while simulation.outcome == RACING:
+                for _ in range(timestep.advance(1 / fps)):
+                    if simulation.step(NO_CONTROLS) != RACING:
+                        break
+            results.append(simulation.race_time())
+
+        self.assertEqual(
+            1, len(set(results)), "The race time changed with the frame rate."
+        )
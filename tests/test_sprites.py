@@ -0,0 +1,57 @@
+import pygame
+
+from game.cars import PlayerCar
+from game.sprites import RotationAtlas
+from game.track import Track
+from game.utilities import blit_rotate_center
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class TestRotationAtlas(BaseTestCase):
+    """Checks pre-rotated car sprites are drawn and shared correctly."""
+
+    def test_if_atlas_matches_rotation(self):
+        """Test that drawing from the atlas matches rotating the image when drawn."""
+        image = pygame.image.load("assets/images/cars/red-car.png")
+        atlas = RotationAtlas(image, 2)
+
+        for angle in [0, 36, 90, -124, 270]:
+            rotated = pygame.Surface((100, 100))
+            blit_rotate_center(rotated, image, (30, 30), angle)
+            looked_up = pygame.Surface((100, 100))
+            atlas.draw(looked_up, (30, 30), angle)
+            self.assertEqual(
+                pygame.image.tostring(rotated, "RGB"),
+                pygame.image.tostring(looked_up, "RGB"),
+                f"The atlas sprite for {angle} degrees does not match the rotated image.",
+            )
+
+    def test_if_atlas_is_shared_between_cars(self):
+        """Test that cars with the same id share one rotation atlas."""
+        track = Track("track_1")
+        first = track.new_computer_car()
+        second = track.new_computer_car()
+        other = PlayerCar("red_car", track.player_start_position)
+        self.assertIs(
+            first.rotation_atlas,
+            second.rotation_atlas,
+            "Cars with the same id built separate atlases.",
+        )
+        self.assertIsNot(
+            first.rotation_atlas,
+            other.rotation_atlas,
+            "Cars with different ids shared an atlas.",
+        )
+
+    def test_if_collision_follows_rotation(self):
+        """Test that car collisions use the mask of the rotated car rather than the upright image."""
+        car = PlayerCar("red_car", (100, 100))
+        wall = pygame.mask.Mask((200, 200))
+        # a single pixel just to the right of the upright car
+        wall.set_at((125, 119))
+
+        self.assertIsNone(car.collide(wall), "The upright car collided with the wall.")
+        car.angle = 90
+        self.assertIsNotNone(
+            car.collide(wall), "The turned car did not collide with the wall."
+        )
@@ -0,0 +1,44 @@
+import pygame
+
+from game.text import GlyphAtlas, TextCache
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class TestTextCache(BaseTestCase):
+    """Checks rendered text is cached and reused."""
+
+    def setUp(self):
+        super().setUp()
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 24)
+
+    def test_if_text_is_only_rendered_once(self):
+        """Test that rendering the same label twice returns the cached surface."""
+        cache = TextCache()
+        first = cache.render(self.font, "PROFILE: DEFAULT", (0, 0, 0))
+        second = cache.render(self.font, "PROFILE: DEFAULT", (0, 0, 0))
+        self.assertIs(first, second, "The cached text surface was not reused.")
+        self.assertEqual(1, cache.misses, "The text was rasterised more than once.")
+
+        cache.render(self.font, "PROFILE: DEFAULT", (255, 0, 0))
+        self.assertEqual(2, cache.misses, "Different colours shared a cache entry.")
+
+    def test_if_text_cache_stays_within_size(self):
+        """Test that the text cache evicts old text to stay within its memory limit."""
+        cache = TextCache(max_bytes=20000)
+        for number in range(50):
+            cache.render(self.font, f"Record: {number}s", (0, 0, 0))
+        self.assertLessEqual(
+            cache.size, 20000, "The text cache grew beyond its memory limit."
+        )
+        self.assertLess(len(cache.surfaces), 50, "No text was evicted.")
+
+    def test_if_glyph_atlas_draws_text(self):
+        """Test that the glyph atlas covers the same width as the glyphs it draws."""
+        atlas = GlyphAtlas(self.font, (0, 0, 0))
+        surface = pygame.Surface((300, 50))
+        rect = atlas.draw(surface, "Time: 12.34s", (10, 5))
+        self.assertEqual(
+            atlas.size("Time: 12.34s"), rect.size, "Drawn text size is incorrect."
+        )
+        self.assertEqual((10, 5), rect.topleft, "Text was drawn in the wrong place.")
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+import pygame
+
+from database import models, seeder
+from game.track import Track, TrackLoader
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class TestTrack(BaseTestCase):
+    """Checks tracks are loaded and drawn correctly."""
+
+    def test_if_baked_track_matches_layers(self):
+        """Test that the pre-composited track looks the same as drawing each layer in turn."""
+        track = Track("track_1")
+
+        layered = pygame.Surface(track.background_image.get_size())
+        layered.blit(track.background_image, (0, 0))
+        layered.blit(track.track_image, (0, 0))
+        layered.blit(track.finish_image, track.finish_position)
+        layered.blit(track.border_image, (0, 0))
+
+        baked = pygame.Surface(track.background_image.get_size())
+        track.draw_track(baked)
+
+        self.assertEqual(
+            pygame.image.tostring(layered, "RGB"),
+            pygame.image.tostring(baked, "RGB"),
+            "The baked track does not match its individual layers.",
+        )
+
+
+class TestTrackLoader(unittest.TestCase):
+    """Checks tracks are loaded ahead of time on the loader thread when the database is a file"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # the other tests bind the models to their own databases
+        models.db.bind(seeder.MODELS)
+        seeder.open_database(os.path.join(self.directory.name, "track_surf.db"))
+
+    def tearDown(self):
+        models.db.close()
+        self.directory.cleanup()
+
+    def test_if_prefetched_track_is_reused(self):
+        """Test that a prefetched track is loaded on the loader thread and reused, until it is evicted."""
+        loader = TrackLoader(max_size=1)
+        future = loader.prefetch("track_1")
+        track = loader.load("track_1")
+        self.assertIs(track, future.result())
+        self.assertEqual(track.track_id, "track_1")
+        self.assertTrue(
+            loader.thread.is_alive(), "The track was not loaded on the thread."
+        )
+        self.assertIs(loader.load("track_1"), track, "The loaded track was not reused.")
+
+        # only one track fits, so loading another evicts the first
+        self.assertEqual(loader.load("track_2").track_id, "track_2")
+        self.assertIsNot(loader.load("track_1"), track, "The evicted track was reused.")
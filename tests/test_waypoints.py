@@ -0,0 +1,18 @@
+from database.models import Path
+from game.track import Track
+from tests.base.BaseTestCase import BaseTestCase
+
+
+class TestWaypoints(BaseTestCase):
+    """Checks the computer car's path is loaded into arrays correctly."""
+
+    def test_if_track_path_is_loaded_in_order(self):
+        """Test that a track's waypoints match its path rows in order."""
+        track = Track("track_1")
+        rows = [
+            (row.path_x, row.path_y)
+            for row in Path.select()
+            .where(Path.track_id == "track_1")
+            .order_by(Path.path_order)
+        ]
+        self.assertEqual(rows, list(track.computer_path), "The path is out of order.")